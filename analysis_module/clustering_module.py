@@ -1,25 +1,50 @@
-import base64
-import io
 import os
 from abc import abstractmethod, ABCMeta
 
 import numpy
 import numpy as np
 import pandas as pd
-from sklearn.datasets import make_blobs
-from sklearn.cluster import KMeans
-import matplotlib.pyplot as plt
-from sklearn.metrics import silhouette_score
 import uuid
 import pickle
 
-from sklearn.mixture import GaussianMixture
-import dataframe_image as dfi
-
+# sklearn, joblib은 import가 느리므로 모델을 학습하는 함수 안에서 import 한다
+from core.config import settings
 from utils.logging_module import logger
+from utils.process_pool import is_worker_process
+from analysis_module.plotting import create_figure, figure_to_base64, save_figure, RenderConfig
 
 BASE_PATH = "./output/clustering/"
 
+# GMM 학습에 사용하는 joblib worker 수. 분석 process pool의 worker 안에서는 worker끼리 코어를 나눠 쓰므로 1개만 사용한다
+CLUSTERING_N_JOBS = getattr(settings, "CLUSTERING_N_JOBS", 2)
+
+
+def _fit_gaussian_mixture(data, n_components: int, n_init: int, max_iter: int, random_state: int):
+    from sklearn.mixture import GaussianMixture
+
+    return GaussianMixture(
+        n_components=n_components,
+        n_init=n_init,
+        max_iter=max_iter,
+        random_state=random_state
+    ).fit(data)
+
+
+def _score_gaussian_mixture(data, n_components: int, random_state: int) -> tuple:
+    from sklearn.mixture import GaussianMixture
+
+    gmm = GaussianMixture(n_components=n_components, random_state=random_state).fit(data)
+    return gmm.bic(data), gmm.aic(data)
+
+
+def _is_rising(scores: list, patience: int) -> bool:
+    """
+    최솟값 이후로 patience번 이상 연속으로 점수가 커졌는지 확인한다
+    """
+    best_index = int(np.argmin(scores))
+    tail = scores[best_index:]
+    return len(tail) > patience and all(a < b for a, b in zip(tail, tail[1:patience + 1]))
+
 
 class BaseModule(metaclass=ABCMeta):
     def __init__(self, data: pd.DataFrame, dat_no_dat_nm_dict: dict):
@@ -86,8 +111,9 @@ class BaseClusteringModule(BaseModule):
 class GMMModule(BaseClusteringModule):
     optimal_k_methods = {"BIC", "AIC"}
 
-    def __init__(self, data: pd.DataFrame, dat_no_dat_nm_dict: dict):
+    def __init__(self, data: pd.DataFrame, dat_no_dat_nm_dict: dict, render_config: RenderConfig = None):
         super().__init__(data, dat_no_dat_nm_dict)
+        self.render_config: RenderConfig = render_config or RenderConfig()
 
         self.labels = []
         self.optimal_k: int = 2
@@ -95,6 +121,8 @@ class GMMModule(BaseClusteringModule):
         self.k_range: range = range(2, 10)
         self.bic_scores = []
         self.aic_scores = []
+        self.n_jobs: int = 1 if is_worker_process() else CLUSTERING_N_JOBS
+        self.random_state = None
 
     def __str__(self):
         return """
@@ -109,8 +137,12 @@ class GMMModule(BaseClusteringModule):
             raise ValueError("start must be larger than 1")
         self.k_range = range(start, end)
 
-    def set_optimal_k(self, method: str = "AIC", fixed_size=2) -> None:
-
+    def set_optimal_k(self, method: str = "AIC", fixed_size=2, patience: int = 2) -> None:
+        """
+        k_range의 각 k로 GMM을 학습해 BIC/AIC가 가장 작은 k를 optimal_k로 설정한다.
+        후보 k들은 n_jobs개씩 병렬로 학습하며, 최솟값 이후 patience번 연속으로 점수가 커지면 나머지 k는 학습하지 않는다.
+        한 번에 학습하는 k는 patience + 1개를 넘지 않으므로, 멈출 수 있는 시점을 지나 학습하는 k는 많아야 patience개이다.
+        """
         if method == "fixed":
             self.optimal_k = fixed_size
             return
@@ -118,11 +150,31 @@ class GMMModule(BaseClusteringModule):
         if method and method not in self.optimal_k_methods:
             raise ValueError("not supported method")
 
-        for n in self.k_range:
-            gmm = GaussianMixture(n_components=n)
-            gmm.fit(self.data)
-            self.bic_scores.append(gmm.bic(self.data))
-            self.aic_scores.append(gmm.aic(self.data))
+        from joblib import Parallel, delayed, effective_n_jobs
+        from sklearn.utils import check_random_state
+
+        data = self.data.dropna().iloc[:, 3:]
+        k_list = [k for k in self.k_range if k <= len(data)]
+        if not k_list:
+            raise AttributeError("data must be larger than the smallest k")
+        batch_size = min(effective_n_jobs(self.n_jobs), patience + 1)
+        seeds = check_random_state(self.random_state).randint(np.iinfo(np.int32).max, size=len(k_list))
+
+        self.bic_scores, self.aic_scores = [], []
+        with Parallel(n_jobs=self.n_jobs) as parallel:
+            for start in range(0, len(k_list), batch_size):
+                scores = parallel(
+                    delayed(_score_gaussian_mixture)(data, k, seed)
+                    for k, seed in zip(k_list[start:start + batch_size], seeds[start:start + batch_size])
+                )
+                self.bic_scores += [bic for bic, aic in scores]
+                self.aic_scores += [aic for bic, aic in scores]
+
+                if _is_rising(self.bic_scores if method == "BIC" else self.aic_scores, patience):
+                    break
+
+        self.k_range = range(k_list[0], k_list[0] + len(self.bic_scores))
+        self.k_method = method
 
         if method == "BIC":
             self.optimal_k = list(self.k_range)[np.argmin(self.bic_scores)]
@@ -132,17 +184,29 @@ class GMMModule(BaseClusteringModule):
         logger.info("optimal k is set as : " + str(self.optimal_k))
 
     def fit(self, n_init=100, max_iter=300) -> None:
+        """
+        n_init번의 초기화를 n_jobs개의 worker로 나눠 병렬로 학습하고, log-likelihood 하한이 가장 큰 모델을 사용한다.
+        (GaussianMixture(n_init=n_init)와 같은 기준으로 모델을 선택한다)
+        """
+        from joblib import Parallel, delayed, effective_n_jobs
+        from sklearn.utils import check_random_state
 
         if not len(self.data):
             raise AttributeError("data must be initialized")
         self.data = self.data.dropna()
-        self.model = GaussianMixture(
-            n_components=self.optimal_k,
-            n_init=n_init,
-            max_iter=max_iter
-        ).fit(self.data.iloc[:, 3:])
+        data = self.data.iloc[:, 3:]
+
+        n_chunks = min(effective_n_jobs(self.n_jobs), n_init)
+        n_init_list = [len(chunk) for chunk in np.array_split(np.arange(n_init), n_chunks)]
+        seeds = check_random_state(self.random_state).randint(np.iinfo(np.int32).max, size=n_chunks)
+
+        models = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_gaussian_mixture)(data, self.optimal_k, chunk_n_init, max_iter, seed)
+            for chunk_n_init, seed in zip(n_init_list, seeds)
+        )
+        self.model = max(models, key=lambda model: model.lower_bound_)
 
-        self.labels = self.model.predict(self.data.iloc[:, 3:])  # Get cluster labels
+        self.labels = self.model.predict(data)  # Get cluster labels
         self.data["labels"] = self.labels
 
         logger.info("model is successfully fitted")
@@ -152,29 +216,29 @@ class GMMModule(BaseClusteringModule):
 
     def save_k_method_output_plot(self) -> None:
 
-        plt.clf()
         self._mkdir()
         if not self.data.any():
             raise AttributeError("data must be initialized")
 
-        plt.figure(figsize=(10, 6))
-        plt.plot(self.k_range, self.bic_scores, label='BIC')
-        plt.plot(self.k_range, self.aic_scores, label='AIC')
-        plt.xlabel('Number of Clusters')
-        plt.ylabel('Score')
-        plt.title('BIC and AIC Scores for GMM')
-        plt.legend()
+        fig = create_figure(figsize=(10, 6))
+        ax = fig.subplots()
+        ax.plot(self.k_range, self.bic_scores, label='BIC')
+        ax.plot(self.k_range, self.aic_scores, label='AIC')
+        ax.set_xlabel('Number of Clusters')
+        ax.set_ylabel('Score')
+        ax.set_title('BIC and AIC Scores for GMM')
+        ax.legend()
 
         # Find the index of minimum BIC and AIC scores
         min_bic_idx = np.argmin(self.bic_scores)
         min_aic_idx = np.argmin(self.aic_scores)
 
         # Add markers for minimum scores
-        plt.scatter(list(self.k_range)[np.argmin(self.bic_scores)], self.bic_scores[min_bic_idx], color='blue',
-                    marker='o', label='Min BIC')
-        plt.scatter(list(self.k_range)[np.argmin(self.aic_scores)], self.aic_scores[min_aic_idx], color='red',
-                    marker='o', label='Min AIC')
-        plt.savefig(self.directory + '/aic_bic_scores.jpg')
+        ax.scatter(list(self.k_range)[np.argmin(self.bic_scores)], self.bic_scores[min_bic_idx], color='blue',
+                   marker='o', label='Min BIC')
+        ax.scatter(list(self.k_range)[np.argmin(self.aic_scores)], self.aic_scores[min_aic_idx], color='red',
+                   marker='o', label='Min AIC')
+        save_figure(fig, self.directory + '/aic_bic_scores.jpg')
 
     def get_cluster_output_plot(self) -> None:
 
@@ -184,39 +248,58 @@ class GMMModule(BaseClusteringModule):
         if not len(self.data):
             raise AttributeError("data must be initialized")
 
+        fig = create_figure(render_config=self.render_config)
+        ax = fig.subplots()
         for label in range(self.optimal_k):
-            plt.scatter(self.data.iloc[self.labels == label, 3], self.data.iloc[self.labels == label, 4], label=f'Cluster {label + 1}')
+            ax.scatter(self.data.iloc[self.labels == label, 3], self.data.iloc[self.labels == label, 4], label=f'Cluster {label + 1}')
 
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format="png", dpi=300)
-        buffer.seek(0)
-        base64_image = base64.b64encode(buffer.read()).decode()
+        base64_image = figure_to_base64(fig, self.render_config)
         logger.info("clustering output plot saved successfully")
         return base64_image
 
     def save_data_scatter_plot(self) -> None:
-        plt.clf()
         if not len(self.data):
             raise AttributeError("data must be initialized")
 
         self._mkdir()
-        plt.scatter(self.data[:, 0], self.data[:, 1])
-        plt.savefig(self.directory + '/data_scatter_plot.jpg')
+        fig = create_figure()
+        ax = fig.subplots()
+        ax.scatter(self.data.iloc[:, 3], self.data.iloc[:, 4])
+        save_figure(fig, self.directory + '/data_scatter_plot.jpg')
         logger.info("data scatter plot saved successfully")
 
     def get_clustering_result(self):
         """
         clustering 된 결과를 반환한다
-        index(지역코드), label(클러스터링 레이블)의 헤더로 구성
+        yr(연도), stdg_nm(지역명), variable(기간), labels(클러스터링 레이블)의 헤더로 구성
         """
 
-        columns = ["stdg_nm", "labels"]
+        columns = ["yr", "stdg_nm", "variable", "labels"]
         selected_data = self.data[columns]
         json_dict = selected_data.to_dict(orient='records')
 
         logger.info("clustering result table saved successfully")
         return json_dict
 
+    def get_cluster_output_data(self):
+        """
+        군집분석 산점도를 프론트엔드에서 그릴 수 있도록 산점도의 x, y 좌표와 레이블을 반환한다
+        """
+        if not self.model:
+            raise AttributeError("model is not fitted yet")
+
+        x_column, y_column = self.data.columns[3], self.data.columns[4]
+        return {
+            "x_axis": self.name_dict.get(x_column, x_column),
+            "y_axis": self.name_dict.get(y_column, y_column),
+            "data": [
+                {"yr": yr, "stdg_nm": stdg_nm, "variable": variable, "x": x, "y": y, "labels": int(label)}
+                for yr, stdg_nm, variable, x, y, label in zip(self.data["yr"], self.data["stdg_nm"],
+                                                              self.data["variable"], self.data[x_column],
+                                                              self.data[y_column], self.labels)
+            ]
+        }
+
 
 
 
@@ -247,6 +330,8 @@ class KMeansModule(BaseClusteringModule):
         self.k_range = range(start, end)
 
     def set_optimal_k(self, method: str = "silhouette", fixed_size=2) -> None:
+        from sklearn.cluster import KMeans
+        from sklearn.metrics import silhouette_score
 
         if method and method not in self.optimal_k_methods:
             raise ValueError("not supported method")
@@ -273,6 +358,7 @@ class KMeansModule(BaseClusteringModule):
         logger.info("optimal k is set as : " + str(self.optimal_k))
 
     def fit(self, n_init=100, max_iter=300) -> None:
+        from sklearn.cluster import KMeans
 
         if not self.data.any():
             raise AttributeError("data must be initialized")
@@ -290,36 +376,37 @@ class KMeansModule(BaseClusteringModule):
 
     def save_k_method_output_plot(self) -> None:
 
-        plt.clf()
         self._mkdir()
         if not self.data.any():
             raise AttributeError("data must be initialized")
 
+        fig = create_figure()
+        ax = fig.subplots()
+
         if self.k_method == "silhouette":
-            plt.bar(self.k_range, self.silhouette_scores)
-            plt.xlabel('Number of clusters (k)')
-            plt.ylabel('Silhouette Score')
-            plt.title('Silhouette Scores for Different Number of Clusters')
+            ax.bar(self.k_range, self.silhouette_scores)
+            ax.set_xlabel('Number of clusters (k)')
+            ax.set_ylabel('Silhouette Score')
+            ax.set_title('Silhouette Scores for Different Number of Clusters')
             max_index = np.argmax(self.silhouette_scores)
-            plt.bar(self.k_range[max_index], self.silhouette_scores[max_index], color='red')
-            plt.savefig(self.directory + "/silhouette_scores.jpg")
+            ax.bar(self.k_range[max_index], self.silhouette_scores[max_index], color='red')
+            save_figure(fig, self.directory + "/silhouette_scores.jpg")
             logger.info("silhouette scores plot saved successfully")
 
         elif self.k_method == "wcss":
-            plt.plot(self.k_range, self.wcss, marker='o')
-            plt.xlabel('Number of Clusters (k)')
-            plt.ylabel('WCSS')
-            plt.title('Elbow Point Plot')
-            plt.axvline(x=self.optimal_k, color='r', linestyle='--', label='Elbow Point')
-            plt.legend()
-            plt.savefig(self.directory + "/wcss.jpg")
+            ax.plot(self.k_range, self.wcss, marker='o')
+            ax.set_xlabel('Number of Clusters (k)')
+            ax.set_ylabel('WCSS')
+            ax.set_title('Elbow Point Plot')
+            ax.axvline(x=self.optimal_k, color='r', linestyle='--', label='Elbow Point')
+            ax.legend()
+            save_figure(fig, self.directory + "/wcss.jpg")
             logger.info("elbow point plot saved successfully")
 
         else:
             logger.warning("no screenshot to save")
 
     def get_cluster_output_plot(self) -> None:
-        plt.clf()
         if not self.model:
             raise AttributeError("model is not fitted yet")
 
@@ -328,23 +415,26 @@ class KMeansModule(BaseClusteringModule):
 
         labels = self.model.labels_
 
+        fig = create_figure()
+        ax = fig.subplots()
         for label in range(self.optimal_k):
-            plt.scatter(self.data[labels == label, 0], self.data[labels == label, 1], label=f'Cluster {label + 1}')
+            ax.scatter(self.data[labels == label, 0], self.data[labels == label, 1], label=f'Cluster {label + 1}')
 
-        plt.legend()
+        ax.legend()
 
         self._mkdir()
-        plt.savefig(self.directory + '/cluster_output.jpg')
+        save_figure(fig, self.directory + '/cluster_output.jpg')
         logger.info("clustering output plot saved successfully")
 
     def save_data_scatter_plot(self) -> None:
-        plt.clf()
         if not self.data.any():
             raise AttributeError("data must be initialized")
 
         self._mkdir()
-        plt.scatter(self.data[:, 0], self.data[:, 1])
-        plt.savefig(self.directory + '/data_scatter_plot.jpg')
+        fig = create_figure()
+        ax = fig.subplots()
+        ax.scatter(self.data[:, 0], self.data[:, 1])
+        save_figure(fig, self.directory + '/data_scatter_plot.jpg')
         logger.info("data scatter plot saved successfully")
 
 
@@ -354,6 +444,8 @@ if __name__ == '__main__':
     # centers : 군집 수
     # x : 데이터
     # y : 레이블
+    from sklearn.datasets import make_blobs
+
     x, y = make_blobs(n_samples=5000, cluster_std=1.0, centers=5)
     data = pd.DataFrame({'Feature 1': x[:, 0], 'Feature 2': x[:, 1], 'Cluster': y})
 
@@ -1,36 +1,31 @@
-import matplotlib
-
-matplotlib.use('Agg')  # Set the backend to 'Agg'
-
-import base64
-import io
 import os
 import uuid
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
-from typing_extensions import Union, List, Literal
+from typing_extensions import Union, List, Literal, Tuple
 from utils.logging_module import logger
-import seaborn as sns
-import dataframe_image as dfi
-from scipy.stats import pearsonr
-from matplotlib import font_manager
-
+from analysis_module.table_renderer import render_table
+from analysis_module.plotting import create_figure, figure_to_base64, save_figure, RenderConfig
 
+# seaborn, scipy는 import가 느리므로 처음 사용하는 함수 안에서 import 한다
+# (seaborn이 pyplot을 불러오기 전에 create_figure에서 Agg backend와 글꼴이 설정된다)
 
 BASE_PATH = "./output/regression/"
-import matplotlib.font_manager
-font_list = matplotlib.font_manager.findSystemFonts(fontpaths=None, fontext='ttf')
-[matplotlib.font_manager.FontProperties(fname=font).get_name() for font in font_list if 'Nanum' in font]
-import matplotlib.pyplot as plt
-plt.rc('font', family='NanumGothicCoding')
-import matplotlib as mpl
-mpl.rcParams['axes.unicode_minus'] = False
+
+# 유의확률 기준별 히트맵 강조 표시
+SIGNIFICANCE_LEVELS = ((0.001, "***"), (0.01, "**"), (0.05, "*"))
+
+# 상관행렬을 한 번에 계산하는 변수 수 (중간 결과 메모리는 블록 크기 x 변수 수에 비례)
+CORRELATION_BLOCK_SIZE = 256
+# 군집 정렬 히트맵에 변수명을 표시하는 최대 변수 수 (넘으면 축 라벨 없이 그린다)
+HEATMAP_MAX_LABELS = 50
 
 
 class CorrelationModule:
 
-    def __init__(self, data: Union[np.ndarray, pd.DataFrame], dat_no_dat_nm_dict: dict) -> object:
+    def __init__(self, data: Union[np.ndarray, pd.DataFrame], dat_no_dat_nm_dict: dict,
+                 table_engine: Literal["matplotlib", "chromium"] = "matplotlib",
+                 render_config: RenderConfig = None) -> object:
         self.uuid = uuid.uuid4()
         logger.info("class uuid : " + str(self.uuid))
 
@@ -40,27 +35,62 @@ class CorrelationModule:
         self.selected_columns: List[str] = self.X.columns
         self.directory: str = None
         self.name_dict: dict = dat_no_dat_nm_dict
+        self.table_engine: str = table_engine
+        self.render_config: RenderConfig = render_config or RenderConfig()
 
     @property
     def columns(self) -> List[str]:
         return self.X.columns
 
-    def get_pvalue_of_correlation(self):
-        num_variables = data.shape[1]
-        X = self.X.values
+    def get_pvalue_of_correlation(self, testing_side: Literal["both", "greater", "less"] = "both",
+                                  method: Literal["pearson", "spearman"] = "pearson") -> pd.DataFrame:
+        """
+        상관계수 행렬과 변수쌍별 표본 수로 모든 변수쌍의 유의확률을 한 번에 계산한다.
+        결측값은 변수쌍마다 제외하며(pairwise), t = r * sqrt((n - 2) / (1 - r^2))가 자유도 n - 2인 t분포를 따르는 것으로 검정한다.
+        :param testing_side: both - 양측검정, greater - 양의 상관 단측검정, less - 음의 상관 단측검정
+        :param method: 상관계수 종류 (spearman은 scipy.stats.spearmanr과 같은 t 근사)
+        :return: 변수명을 index, column으로 하는 유의확률 행렬 (대각 원소와 표본이 3개 미만인 쌍은 NaN)
+        """
+        if testing_side not in ("both", "greater", "less"):
+            raise ValueError("not supported testing side")
+        if method not in ("pearson", "spearman"):
+            raise ValueError("not supported correlation method for significance test")
+
+        r = self.get_correlation_matrix(method)
+
+        observed = self.X.notna().to_numpy(dtype="float64")
+        p_values = get_correlation_pvalue(r.to_numpy(dtype="float64"), observed.T @ observed, testing_side)
+
+        np.fill_diagonal(p_values, np.nan)
+        return pd.DataFrame(p_values, index=r.index, columns=r.columns)
+
+    def get_top_correlation_pairs(self, k: int = 20,
+                                  testing_side: Literal["both", "greater", "less"] = "both") -> pd.DataFrame:
+        """
+        상관계수의 절댓값이 큰 변수쌍 k개를 반환한다 (변수가 많아 산점도행렬을 그릴 수 없을 때 사용)
+        :return: 변수1, 변수2, 상관계수, 유의확률, 표본수 컬럼의 DataFrame
+        """
+        if self.X.empty:
+            raise AttributeError("data must be initialized")
+
+        corr, counts = pairwise_correlation(self.X.to_numpy(dtype="float64", na_value=np.nan))
+        first, second = np.triu_indices(len(corr), k=1)
+        r, n = corr[first, second], counts[first, second]
 
-        p_values = np.zeros((num_variables, num_variables))
+        valid = np.flatnonzero(~np.isnan(r))
+        top = valid[np.argsort(-np.abs(r[valid]), kind="stable")[:k]]
 
-        for i in range(num_variables):
-            for j in range(num_variables):
-                if i != j:
-                    corr, p_value = pearsonr(X[i], X[j])
-                    p_values[i, j] = p_value
-        return p_values
+        names = np.array([self.name_dict.get(column, column) for column in self.columns], dtype=object)
+        return pd.DataFrame({
+            "변수1": names[first[top]],
+            "변수2": names[second[top]],
+            "상관계수": r[top],
+            "유의확률": get_correlation_pvalue(r[top], n[top], testing_side),
+            "표본수": n[top].astype("int64")
+        })
 
     def save_correlation_matrix(self):
 
-        plt.clf()
         if self.X.empty:
             raise AttributeError("data must be initialized")
         self._mkdir()
@@ -77,40 +107,93 @@ class CorrelationModule:
         # print(p_value_matrix)
         #
         # Plot the correlation matrix
-        plt.figure(figsize=(10, 8))
-        sns.set(font_scale=0.5)
-        sns.heatmap(correlation_matrix, annot=True, cmap="RdYlBu")
-        plt.title("Correlation Matrix")
+        fig = create_figure(figsize=(10, 8))
+        import seaborn as sns
+        ax = fig.subplots()
+        sns.heatmap(correlation_matrix, annot=True, cmap="RdYlBu", ax=ax, annot_kws={"fontsize": 5})
+        ax.tick_params(labelsize=5)
+        ax.set_title("Correlation Matrix", fontsize=6)
 
         # Save the plot as a PNG file
-        plt.savefig(self.directory + "/correlation_matrix.png", format="png", dpi=300)
-
-    def save_heatmap_plot(self, method: Literal["pearson", "kendall", "spearman"] = "pearson") -> str:
+        save_figure(fig, self.directory + "/correlation_matrix.png", format="png", dpi=300)
 
+    def get_correlation_matrix(self, method: Literal["pearson", "kendall", "spearman"] = "pearson") -> pd.DataFrame:
         if self.X.empty:
             raise AttributeError("data must be initialized")
+
         data = self.X.rename(columns=self.name_dict)
-        corr = data.corr(method=method)
-        # sns.set(font_scale=0.5)
-        sns.heatmap(corr, annot=True, cmap="coolwarm", square=True)
+        if method != "pearson":
+            return data.corr(method=method)
+
+        corr, _ = pairwise_correlation(data.to_numpy(dtype="float64", na_value=np.nan))
+        return pd.DataFrame(corr, index=data.columns, columns=data.columns)
+
+    def get_clustered_correlation_matrix(self) -> pd.DataFrame:
+        """
+        비슷한 변수끼리 모이도록 계층적 군집 순서로 행/열을 정렬한 피어슨 상관계수 행렬
+        """
+        corr = self.get_correlation_matrix()
+        order = get_cluster_order(corr.to_numpy())
+        return corr.iloc[order, order]
+
+    def save_heatmap_plot(self, method: Literal["pearson", "kendall", "spearman"] = "pearson",
+                          testing_side: Literal["both", "greater", "less"] = "both",
+                          valid_pvalue_accent: bool = False) -> str:
+        """
+        상관계수 히트맵을 그린다.
+        valid_pvalue_accent이면 유의한 상관계수에 유의수준별 별표(*: 0.05, **: 0.01, ***: 0.001)를 붙인다.
+        """
+        corr = self.get_correlation_matrix(method)
+        annot = corr.applymap(lambda x: "{:.2f}".format(x) if pd.notna(x) else "")
+        if valid_pvalue_accent:
+            p_values = self.get_pvalue_of_correlation(testing_side, method)
+            annot = annot + p_values.applymap(get_significance_mark)
+
+        fig = create_figure(render_config=self.render_config)
+        import seaborn as sns
+        ax = fig.subplots()
+        sns.heatmap(corr, annot=annot.to_numpy(), fmt="", cmap="coolwarm", square=True, ax=ax)
+
+        ax.tick_params(labelsize=4, labelrotation=20)
+
+        base64_image = figure_to_base64(fig, self.render_config)
+        logger.info("heatmap plot saved successfully")
 
-        plt.xticks(fontsize=4, rotation=20)
-        plt.yticks(fontsize=4, rotation=20)
+        return base64_image
 
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format="png", dpi=300)
-        buffer.seek(0)
-        base64_image = base64.b64encode(buffer.read()).decode()
-        logger.info("heatmap plot saved successfully")
+    def save_clustered_heatmap_plot(self) -> str:
+        """
+        변수가 많을 때 사용하는 군집 정렬 히트맵
+        값 표시 없이 이미지로 그리므로 변수 수와 관계없이 render_config의 크기로 그려지고,
+        HEATMAP_MAX_LABELS개 이하일 때만 변수명을 표시한다.
+        """
+        corr = self.get_clustered_correlation_matrix()
+
+        fig = create_figure(figsize=(8, 8), render_config=self.render_config)
+        ax = fig.subplots()
+        image = ax.imshow(corr.to_numpy(), cmap="coolwarm", vmin=-1, vmax=1, interpolation="nearest")
+        fig.colorbar(image, ax=ax, shrink=0.8)
+
+        if len(corr) <= HEATMAP_MAX_LABELS:
+            ticks = np.arange(len(corr))
+            ax.set_xticks(ticks, labels=corr.columns, fontsize=4, rotation=90)
+            ax.set_yticks(ticks, labels=corr.index, fontsize=4)
+        else:
+            ax.set_xticks([])
+            ax.set_yticks([])
+
+        base64_image = figure_to_base64(fig, self.render_config)
+        logger.info("clustered heatmap plot saved successfully")
 
         return base64_image
 
     def save_pair_plot(self, method: Literal["pearson", "kendall", "spearman"] = "pearson") -> str:
-        # plt.clf()
         if self.X.empty:
             raise AttributeError("data must be initialized")
 
-        scatter_matrix = pd.plotting.scatter_matrix(self.X)
+        fig = create_figure(render_config=self.render_config)
+        axes = fig.subplots(self.X.shape[1], self.X.shape[1], squeeze=False)
+        scatter_matrix = pd.plotting.scatter_matrix(self.X, ax=axes)
 
         for subaxis in scatter_matrix:
             for ax in subaxis:
@@ -119,28 +202,33 @@ class CorrelationModule:
                 ax.set_xlabel(self.name_dict[ax.get_xlabel()], fontsize=4, rotation=20, labelpad=10)
                 ax.set_ylabel(self.name_dict[ax.get_ylabel()], fontsize=4, rotation=20, labelpad=30)
 
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format="png", dpi=300)
-        buffer.seek(0)
-        base64_image = base64.b64encode(buffer.read()).decode()
-        plt.close()
+        base64_image = figure_to_base64(fig, self.render_config)
 
         logger.info("pair plot saved successfully")
 
         return base64_image
 
-    def save_descriptive_statistics_table(self):
+    def get_pair_plot_data(self) -> pd.DataFrame:
+        """
+        산점도행렬을 프론트엔드에서 그릴 수 있도록 변수명을 컬럼으로 하는 원본 데이터를 반환한다
+        """
+        if self.X.empty:
+            raise AttributeError("data must be initialized")
+
+        return self.X.rename(columns=self.name_dict)
+
+    def get_descriptive_statistics(self) -> pd.DataFrame:
         if self.X.empty:
             raise AttributeError("data must be initialized")
 
         statistics = self.X.describe()
         statistics = statistics.rename(columns=self.name_dict)
-        statistics = statistics.T
+        return statistics.T
+
+    def save_descriptive_statistics_table(self):
+        statistics = self.get_descriptive_statistics()
         formatted_df = statistics.applymap(lambda x: "{:.0f}".format(x) if isinstance(x, (int, float)) else x)
-        buffer = io.BytesIO()
-        dfi.export(formatted_df, buffer)
-        buffer.seek(0)
-        base64_table = base64.b64encode(buffer.read()).decode()
+        base64_table = render_table(formatted_df, self.table_engine, self.render_config)
 
         logger.info("descriptive statistics table converted to base64 successfully")
         return base64_table
@@ -154,6 +242,87 @@ class CorrelationModule:
             os.mkdir(self.directory)
 
 
+def pairwise_correlation(values: np.ndarray, block_size: int = CORRELATION_BLOCK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    결측값을 변수쌍마다 제외하는(pairwise) 피어슨 상관계수 행렬과 변수쌍별 표본 수를 행렬곱으로 계산한다.
+    DataFrame.corr()와 같은 결과이며, 변수를 block_size개씩 나누어 계산하므로
+    변수가 수백 개여도 중간 결과의 메모리는 (block_size x 변수 수)에 비례한다.
+    :return: (상관계수 행렬, 표본 수 행렬) 표본이 2개 미만이거나 분산이 0인 쌍은 NaN
+    """
+    values = np.asarray(values, dtype="float64")
+    observed = ~np.isnan(values)
+    mask = observed.astype("float64")
+    # 열 평균을 빼 두어 합의 차로 분산을 구할 때의 수치 오차를 줄인다
+    with np.errstate(invalid="ignore"):
+        column_mean = np.where(observed.any(axis=0), np.nansum(values, axis=0) / np.maximum(observed.sum(axis=0), 1), 0)
+    centered = np.where(observed, values - column_mean, 0.0)
+    squared = centered ** 2
+
+    n_columns = values.shape[1]
+    corr = np.empty((n_columns, n_columns))
+    counts = np.empty((n_columns, n_columns))
+    for start in range(0, n_columns, block_size):
+        block = slice(start, start + block_size)
+        n = mask[:, block].T @ mask
+        sum_x, sum_y = centered[:, block].T @ mask, mask[:, block].T @ centered
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covariance = centered[:, block].T @ centered - sum_x * sum_y / n
+            variance = (squared[:, block].T @ mask - sum_x ** 2 / n) * (mask[:, block].T @ squared - sum_y ** 2 / n)
+            r = covariance / np.sqrt(variance)
+        corr[block] = np.where((n >= 2) & (variance > 0), np.clip(r, -1, 1), np.nan)
+        counts[block] = n
+
+    diagonal = np.diag(corr)
+    np.fill_diagonal(corr, np.where(np.isnan(diagonal), np.nan, 1.0))
+    return corr, counts
+
+
+def get_correlation_pvalue(r: np.ndarray, n: np.ndarray,
+                           testing_side: Literal["both", "greater", "less"] = "both") -> np.ndarray:
+    """
+    t = r * sqrt((n - 2) / (1 - r^2))가 자유도 n - 2인 t분포를 따르는 것으로 상관계수의 유의확률을 계산한다
+    """
+    from scipy import stats
+
+    dof = np.asarray(n, dtype="float64") - 2
+    r = np.asarray(r, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = r * np.sqrt(dof / ((1 - r) * (1 + r)))
+        dof = np.where(dof > 0, dof, np.nan)
+
+        if testing_side == "both":
+            p_values = 2 * stats.t.sf(np.abs(t), dof)
+        elif testing_side == "greater":
+            p_values = stats.t.sf(t, dof)
+        else:
+            p_values = stats.t.cdf(t, dof)
+
+    return np.minimum(p_values, 1)
+
+
+def get_cluster_order(corr: np.ndarray) -> np.ndarray:
+    """
+    1 - |r|을 거리로 하는 평균 연결 계층적 군집의 잎 순서 (상관계수가 NaN인 쌍은 상관이 없는 것으로 본다)
+    """
+    from scipy.cluster import hierarchy
+    from scipy.spatial.distance import squareform
+
+    if len(corr) < 3:
+        return np.arange(len(corr))
+
+    distance = 1 - np.abs(np.nan_to_num(corr, nan=0.0))
+    distance = np.clip((distance + distance.T) / 2, 0, None)
+    np.fill_diagonal(distance, 0)
+    return hierarchy.leaves_list(hierarchy.linkage(squareform(distance, checks=False), method="average"))
+
+
+def get_significance_mark(p_value: float) -> str:
+    for level, mark in SIGNIFICANCE_LEVELS:
+        if p_value < level:
+            return mark
+    return ""
+
+
 if __name__ == '__main__':
     data = pd.read_csv('./dataset/pivoted_2021.csv')
     correlation_module = CorrelationModule(data.iloc[:, 2:])
@@ -0,0 +1,49 @@
+import os
+import threading
+
+FONT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "static", "font", "NanumBarunGothic.ttf")
+
+_font_lock = threading.Lock()
+_font_name: str = None
+
+
+def register_font() -> str:
+    """
+    matplotlib을 Agg backend로 설정하고 static/font의 나눔바른고딕을 기본 글꼴로 등록한다. (처음 그림을 그릴 때 한 번만)
+    시스템 글꼴을 검색하지 않고 이 파일 하나만 현재 프로세스에 등록한다.
+    (matplotlib의 사용자 공용 글꼴 캐시(fontlist json)는 다른 프로그램과 함께 쓰므로 수정하지 않는다)
+    :return: 등록된 글꼴 이름
+    """
+    global _font_name
+    if _font_name is not None:
+        return _font_name
+
+    with _font_lock:
+        if _font_name is None:
+            import matplotlib
+            from matplotlib import font_manager, rcParams
+
+            matplotlib.use("Agg")
+            font_name = _find_registered_font(font_manager.fontManager)
+            if font_name is None:
+                font_manager.fontManager.addfont(FONT_PATH)
+                font_name = _find_registered_font(font_manager.fontManager)
+            # 글꼴 캐시에 다른 경로(다른 checkout 등)의 같은 글꼴이 있으면 그 파일이 선택되지 않도록 이 프로세스의 목록에서 뺀다
+            font_manager.fontManager.ttflist = [
+                font for font in font_manager.fontManager.ttflist
+                if font.name != font_name or os.path.abspath(font.fname) == FONT_PATH
+            ]
+
+            rcParams["font.family"] = font_name
+            rcParams["axes.unicode_minus"] = False
+            _font_name = font_name
+
+    return _font_name
+
+
+def _find_registered_font(font_manager) -> str:
+    for font in font_manager.ttflist:
+        if os.path.abspath(font.fname) == FONT_PATH:
+            return font.name
+    return None
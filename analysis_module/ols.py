@@ -0,0 +1,164 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+INTERCEPT = "Intercept"
+
+
+class OLSResult:
+    """
+    최소제곱 회귀 결과
+    속성 이름은 statsmodels의 RegressionResults와 같게 맞춰 기존 코드에서 그대로 사용할 수 있다.
+    """
+
+    def __init__(self, endog_name: str, exog_names: List[str], params: np.ndarray, normalized_cov: np.ndarray,
+                 effects: np.ndarray, ssr: float, centered_tss: float, nobs: int, rank: int):
+        self.endog_name: str = endog_name
+        self.exog_names: List[str] = exog_names
+        self.effects: np.ndarray = effects
+        self.nobs: int = nobs
+        # numpy 실수로 두어, 관측치 수가 모수 개수와 같아 잔차 자유도가 0이면
+        # statsmodels와 같이 ZeroDivisionError 대신 nan/inf 통계량이 된다
+        self.df_model: np.float64 = np.float64(rank - 1)
+        self.df_resid: np.float64 = np.float64(nobs - rank)
+
+        self.ssr: np.float64 = np.float64(ssr)
+        self.centered_tss: np.float64 = np.float64(centered_tss)
+        self.ess: np.float64 = self.centered_tss - self.ssr
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.scale: np.float64 = self.ssr / self.df_resid
+
+        self.params = pd.Series(params, index=exog_names)
+        self.bse = pd.Series(np.sqrt(np.diag(normalized_cov) * self.scale), index=exog_names)
+
+    @property
+    def tvalues(self) -> pd.Series:
+        return self.params / self.bse
+
+    @property
+    def pvalues(self) -> pd.Series:
+        from scipy import stats
+        return pd.Series(2 * stats.t.sf(np.abs(self.tvalues), self.df_resid), index=self.exog_names)
+
+    @property
+    def rsquared(self) -> float:
+        return 1 - self.ssr / self.centered_tss
+
+    @property
+    def rsquared_adj(self) -> float:
+        return 1 - (self.nobs - 1) / self.df_resid * (1 - self.rsquared)
+
+    @property
+    def fvalue(self) -> float:
+        return (self.ess / self.df_model) / (self.ssr / self.df_resid)
+
+    @property
+    def f_pvalue(self) -> float:
+        from scipy import stats
+        return float(stats.f.sf(self.fvalue, self.df_model, self.df_resid))
+
+    @property
+    def llf(self) -> float:
+        return -self.nobs / 2 * (np.log(2 * np.pi) + np.log(self.ssr / self.nobs) + 1)
+
+    @property
+    def aic(self) -> float:
+        return -2 * self.llf + 2 * (self.df_model + 1)
+
+    @property
+    def bic(self) -> float:
+        return -2 * self.llf + np.log(self.nobs) * (self.df_model + 1)
+
+    def conf_int(self, alpha: float = 0.05) -> pd.DataFrame:
+        from scipy import stats
+        q = stats.t.ppf(1 - alpha / 2, self.df_resid)
+        return pd.DataFrame({0: self.params - q * self.bse, 1: self.params + q * self.bse})
+
+    def anova_table(self) -> pd.DataFrame:
+        """
+        statsmodels의 anova_lm(typ=1)과 같은 순차(Type I) 분산분석표
+        각 변수의 제곱합은 QR 분해로 얻은 Q^T y의 해당 성분 제곱이다.
+        """
+        sum_sq = np.append(self.effects[1:len(self.exog_names)] ** 2, self.ssr)
+        df = np.append(np.ones(len(self.exog_names) - 1), self.df_resid)
+        mean_sq = sum_sq / df
+
+        anova_table = pd.DataFrame({"df": df, "sum_sq": sum_sq, "mean_sq": mean_sq},
+                                   index=self.exog_names[1:] + ["Residual"])
+        anova_table["F"] = mean_sq / self.scale
+        from scipy import stats
+        anova_table["PR(>F)"] = stats.f.sf(anova_table["F"], df, self.df_resid)
+        anova_table.iloc[-1, -2:] = np.nan
+        return anova_table
+
+
+def fit_ols(endog: pd.Series, exog: pd.DataFrame) -> OLSResult:
+    """
+    상수항을 포함한 최소제곱 회귀를 QR 분해로 적합한다.
+    formula(patsy)를 거치지 않으며, statsmodels의 ols와 같이 결측값이 있는 행은 제외한다.
+    :param endog: 종속변수
+    :param exog: 상수항을 제외한 독립변수
+    """
+    return fit_ols_many(endog.to_frame(), exog)[endog.name]
+
+
+def fit_ols_many(endog: pd.DataFrame, exog: pd.DataFrame) -> Dict[str, OLSResult]:
+    """
+    같은 독립변수로 여러 종속변수의 회귀를 한 번에 적합한다.
+    결측 위치가 같은 종속변수끼리 묶어 설계행렬의 QR 분해를 한 번만 수행하므로
+    종속변수가 N개여도 비용은 회귀 한 번과 크게 다르지 않다.
+    :param endog: 종속변수들 (컬럼별로 하나의 회귀)
+    :param exog: 상수항을 제외한 독립변수
+    :return: 종속변수 컬럼명별 회귀 결과
+    """
+    complete_rows = exog.notna().all(axis=1).to_numpy()
+    endog, exog = endog[complete_rows], exog[complete_rows]
+    if (endog.notna().sum() == 0).any():
+        raise ValueError("no complete observations")
+
+    # 종속변수의 결측 위치가 같으면 같은 행으로 적합하므로 분해 결과를 공유한다
+    row_groups = {}
+    for column in endog.columns:
+        observed = endog[column].notna().to_numpy()
+        row_groups.setdefault(observed.tobytes(), (observed, []))[1].append(column)
+
+    results = {}
+    for observed, columns in row_groups.values():
+        results.update(_fit_design(endog.loc[observed, columns], exog[observed]))
+
+    return {column: results[column] for column in endog.columns}
+
+
+def _fit_design(endog: pd.DataFrame, exog: pd.DataFrame) -> Dict[str, OLSResult]:
+    # scipy는 import가 느리므로 처음 모델을 학습할 때 import 한다
+    from scipy import linalg
+
+    y = endog.to_numpy(dtype="float64")
+    x = np.column_stack([np.ones(len(exog)), exog.to_numpy(dtype="float64")])
+    nobs, k = x.shape
+
+    q, r = np.linalg.qr(x)
+    effects = q.T @ y
+    rank = np.linalg.matrix_rank(x)
+
+    if rank == k:
+        params = linalg.solve_triangular(r, effects)
+        r_inv = linalg.solve_triangular(r, np.eye(k))
+        normalized_cov = r_inv @ r_inv.T
+    else:
+        # 독립변수 간 완전한 공선성이 있으면 statsmodels와 같이 pseudo-inverse로 푼다
+        x_pinv = np.linalg.pinv(x)
+        params = x_pinv @ y
+        normalized_cov = x_pinv @ x_pinv.T
+
+    resid = y - x @ params
+    ssr = (resid ** 2).sum(axis=0)
+    centered_tss = ((y - y.mean(axis=0)) ** 2).sum(axis=0)
+
+    exog_names = [INTERCEPT] + exog.columns.to_list()
+    return {
+        column: OLSResult(column, exog_names, params[:, i], normalized_cov, effects[:, i], float(ssr[i]),
+                          float(centered_tss[i]), nobs, rank)
+        for i, column in enumerate(endog.columns)
+    }
@@ -0,0 +1,85 @@
+import base64
+import io
+from typing import TYPE_CHECKING
+
+from typing_extensions import Literal
+
+from analysis_module.fonts import register_font
+
+if TYPE_CHECKING:
+    # matplotlib은 처음 그림을 그릴 때 import 한다
+    from matplotlib.figure import Figure
+
+# 서버에서 허용하는 렌더링 옵션 범위
+MAX_DPI = 300
+MIN_DPI = 36
+PREVIEW_DPI = 72
+MAX_FIGURE_INCH = 20
+MIN_FIGURE_INCH = 1
+
+IMAGE_MEDIA_TYPES = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "svg": "image/svg+xml"
+}
+
+
+class RenderConfig:
+    """
+    요청별 이미지 렌더링 옵션
+    dpi와 크기(inch)는 서버 허용 범위로 잘라내고, preview이면 썸네일 품질(PREVIEW_DPI)로 그린다.
+    """
+
+    def __init__(self, dpi: int = MAX_DPI, width: float = None, height: float = None,
+                 image_format: Literal["png", "jpeg", "webp", "svg"] = "png", preview: bool = False):
+        if image_format not in IMAGE_MEDIA_TYPES:
+            raise ValueError("not supported image format")
+
+        dpi = min(max(dpi, MIN_DPI), MAX_DPI)
+        self.dpi: int = min(dpi, PREVIEW_DPI) if preview else dpi
+        self.width: float = self._clip_inch(width)
+        self.height: float = self._clip_inch(height)
+        self.image_format: str = image_format
+        self.preview: bool = preview
+
+    @staticmethod
+    def _clip_inch(value: float):
+        if value is None:
+            return None
+        return min(max(value, MIN_FIGURE_INCH), MAX_FIGURE_INCH)
+
+    @property
+    def media_type(self) -> str:
+        return IMAGE_MEDIA_TYPES[self.image_format]
+
+    def figsize(self, default=(6.4, 4.8)) -> tuple:
+        return self.width or default[0], self.height or default[1]
+
+
+def create_figure(figsize=(6.4, 4.8), render_config: RenderConfig = None) -> "Figure":
+    """
+    pyplot의 전역 figure를 사용하지 않는 독립된 Figure를 생성한다.
+    Figure는 생성한 요청에서만 참조되므로 여러 요청이 동시에 그려도 서로 섞이지 않고,
+    참조가 사라지면 메모리에서 해제된다 (plt.close 불필요).
+    render_config에 크기가 지정되어 있으면 figsize 대신 사용한다.
+    """
+    from matplotlib.figure import Figure
+
+    register_font()
+    if render_config is not None:
+        figsize = render_config.figsize(figsize)
+    return Figure(figsize=figsize)
+
+
+def figure_to_base64(fig: "Figure", render_config: RenderConfig = None, **kwargs) -> str:
+    render_config = render_config or RenderConfig()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=render_config.image_format, dpi=render_config.dpi, **kwargs)
+    buffer.seek(0)
+    return base64.b64encode(buffer.read()).decode()
+
+
+def save_figure(fig: "Figure", path: str, **kwargs) -> None:
+    fig.savefig(path, **kwargs)
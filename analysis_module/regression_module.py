@@ -1,65 +1,75 @@
-import base64
-import io
 import os
+import time
 import uuid
-from typing import List
+from typing import List, Literal
 
 import pandas as pd
-from statsmodels.stats.anova import anova_lm
 
 from utils.logging_module import logger
-import statsmodels.api as sm
-from statsmodels.formula.api import ols
-import dataframe_image as dfi
+from analysis_module.ols import OLSResult, fit_ols, fit_ols_many
+from analysis_module.table_renderer import render_table
+from analysis_module.plotting import RenderConfig
 
 BASE_PATH = "./output/regression/"
 
 
 class RegressionModule:
 
-    def __init__(self, data: pd.DataFrame, target_column_id: str, dat_no_dat_nm_dict: dict) -> object:
+    def __init__(self, data: pd.DataFrame, target_column_id: str, dat_no_dat_nm_dict: dict,
+                 table_engine: Literal["matplotlib", "chromium"] = "matplotlib",
+                 render_config: RenderConfig = None, independent_column_id_list: List[str] = None) -> object:
         self.uuid = uuid.uuid4()
         logger.info("class uuid : " + str(self.uuid))
         self.data = data
 
         self.y_column_id: str = target_column_id
-        self.X_column_id_list: List[str] = self.data.iloc[:, 3:].columns.to_list()
-
-        self.X_column_id_list.remove(self.y_column_id)
+        if independent_column_id_list is None:
+            self.X_column_id_list: List[str] = self.data.iloc[:, 3:].columns.to_list()
+            self.X_column_id_list.remove(self.y_column_id)
+        else:
+            self.X_column_id_list: List[str] = list(independent_column_id_list)
         self.directory: str = None
-        self.model: sm.OLS = None
+        self.model: OLSResult = None
         self.name_dict: dict = dat_no_dat_nm_dict
+        self.table_engine: str = table_engine
+        self.render_config: RenderConfig = render_config or RenderConfig()
 
-    def save_descriptive_statistics_table(self):
+    def get_descriptive_statistics(self) -> pd.DataFrame:
         if self.data.empty:
             raise AttributeError("data must be initialized")
 
         statistics = self.data.describe()
         statistics = statistics.rename(columns=self.name_dict)
-        statistics = statistics.T
+        return statistics.T
+
+    def save_descriptive_statistics_table(self):
+        statistics = self.get_descriptive_statistics()
         formatted_df = statistics.applymap(lambda x: "{:.0f}".format(x) if isinstance(x, (int, float)) else x)
-        buffer = io.BytesIO()
-        dfi.export(formatted_df, buffer)
-        buffer.seek(0)
-        base64_table = base64.b64encode(buffer.read()).decode()
+        base64_table = render_table(formatted_df, self.table_engine, self.render_config)
 
         logger.info("descriptive statistics table converted to base64 successfully")
         return base64_table
 
     def fit(self):
-        formula = self.y_column_id + " ~ " + " + ".join(self.X_column_id_list)
-        model = ols(formula, data=self.data.iloc[:, 3:])
-        self.model = model.fit()
+        self.model = fit_ols(self.data[self.y_column_id], self.data[self.X_column_id_list])
 
     def get_result_summary(self) -> str:
         if not self.model:
             raise AttributeError("A model hasn't been fitted yet")
-        # return self.model.summary()._repr_html_()
 
-        summary_df = pd.read_html(self.model.summary().tables[0].as_html())[0]
-        summary_df.iat[7, 2] = summary_df.iat[8, 0]
-        summary_df.iat[7, 3] = summary_df.iat[8, 1]
-        summary_df = summary_df.drop(8)
+        # statsmodels summary의 모형요약표와 같은 항목, 같은 숫자 형식
+        now = time.localtime()
+        summary_df = pd.DataFrame([
+            ["Dep. Variable:", self.y_column_id, "R-squared:", "%#6.3f" % self.model.rsquared],
+            ["Model:", "OLS", "Adj. R-squared:", "%#6.3f" % self.model.rsquared_adj],
+            ["Method:", "Least Squares", "F-statistic:", "%#8.4g" % self.model.fvalue],
+            ["Date:", time.strftime("%a, %d %b %Y", now), "Prob (F-statistic):", "%#6.3g" % self.model.f_pvalue],
+            ["Time:", time.strftime("%H:%M:%S", now), "Log-Likelihood:", "%#8.5g" % self.model.llf],
+            ["No. Observations:", str(self.model.nobs), "AIC:", "%#8.4g" % self.model.aic],
+            ["Df Residuals:", "%.0f" % self.model.df_resid, "BIC:", "%#8.4g" % self.model.bic],
+            ["Df Model:", "%.0f" % self.model.df_model, "Covariance Type:", "nonrobust"]
+        ])
+        summary_df = summary_df.applymap(str.strip)
 
         # Custom index and header lists
         custom_index = ['', '', '', '', '', '', '', '']
@@ -68,30 +78,62 @@ class RegressionModule:
         # Set the custom index and header
         summary_df.index = custom_index
         summary_df.columns = custom_header
-        
 
-        buffer = io.BytesIO()
-        dfi.export(summary_df, buffer)
-        buffer.seek(0)
-        base64_table = base64.b64encode(buffer.read()).decode()
+        base64_table = render_table(summary_df, self.table_engine, self.render_config)
 
         logger.info("summary table converted to base64 successfully")
 
         return base64_table
 
-    def get_anova_lm(self):
+    def get_summary_statistics(self) -> dict:
+        """
+        모형요약표의 수치를 dict로 반환한다
+        """
+        if not self.model:
+            raise AttributeError("A model hasn't been fitted yet")
+
+        return {
+            "dependent_variable": self.name_dict.get(self.y_column_id, self.y_column_id),
+            "nobs": int(self.model.nobs),
+            "df_model": float(self.model.df_model),
+            "df_resid": float(self.model.df_resid),
+            "rsquared": float(self.model.rsquared),
+            "rsquared_adj": float(self.model.rsquared_adj),
+            "fvalue": float(self.model.fvalue),
+            "f_pvalue": float(self.model.f_pvalue),
+            "llf": float(self.model.llf),
+            "aic": float(self.model.aic),
+            "bic": float(self.model.bic)
+        }
+
+    def get_coefficient_table(self) -> pd.DataFrame:
         if not self.model:
             raise AttributeError("A model hasn't been fitted yet")
 
-        anova_table = anova_lm(self.model)
-        anova_table = anova_table.rename(
+        conf_int = self.model.conf_int()
+        coefficient_table = pd.DataFrame({
+            "coef": self.model.params,
+            "std_err": self.model.bse,
+            "t": self.model.tvalues,
+            "p_value": self.model.pvalues,
+            "ci_lower": conf_int.iloc[:, 0],
+            "ci_upper": conf_int.iloc[:, 1]
+        })
+        return coefficient_table.rename(index=self.name_dict)
+
+    def get_anova_table(self) -> pd.DataFrame:
+        if not self.model:
+            raise AttributeError("A model hasn't been fitted yet")
+
+        anova_table = self.model.anova_table()
+        return anova_table.rename(
             columns={"df": "자유도", "sum_sq": "제곱합", "mean_sq": "평균제곱", "F": "F-통계량"},
             index=self.name_dict
         )
-        buffer = io.BytesIO()
-        dfi.export(anova_table, buffer)
-        buffer.seek(0)
-        base64_table = base64.b64encode(buffer.read()).decode()
+
+    def get_anova_lm(self):
+        anova_table = self.get_anova_table()
+        base64_table = render_table(anova_table, self.table_engine, self.render_config)
 
         return base64_table
 
@@ -107,6 +149,26 @@ class RegressionModule:
             os.mkdir(self.directory)
 
 
+def fit_regression_modules(data: pd.DataFrame, target_column_id_list: List[str],
+                           independent_column_id_list: List[str], dat_no_dat_nm_dict: dict,
+                           table_engine: Literal["matplotlib", "chromium"] = "matplotlib",
+                           render_config: RenderConfig = None) -> List[RegressionModule]:
+    """
+    같은 독립변수로 여러 종속변수의 회귀분석을 한 번에 적합한다. (설계행렬 분해를 공유)
+    :return: 종속변수 순서대로 적합이 끝난 RegressionModule
+    """
+    models = fit_ols_many(data[target_column_id_list], data[independent_column_id_list])
+
+    regression_modules = []
+    for target_column_id in target_column_id_list:
+        regression_module = RegressionModule(data, target_column_id, dat_no_dat_nm_dict, table_engine, render_config,
+                                             independent_column_id_list)
+        regression_module.model = models[target_column_id]
+        regression_modules.append(regression_module)
+
+    return regression_modules
+
+
 if __name__ == '__main__':
     data = pd.read_csv('./dataset/pivoted_2021.csv')
     data.dropna()
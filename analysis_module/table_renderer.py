@@ -0,0 +1,128 @@
+import base64
+import io
+import json
+from typing import List, TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+from typing_extensions import Literal
+
+from analysis_module.fonts import FONT_PATH
+from analysis_module.plotting import IMAGE_MEDIA_TYPES, RenderConfig, create_figure, figure_to_base64
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+TABLE_ENGINES = ("matplotlib", "chromium")
+
+# dataframe_image(jupyter 기본 테이블 스타일)와 비슷하게 보이도록 맞춘 값
+FONT_SIZE = 10
+CHAR_WIDTH_INCH = 0.085
+ROW_HEIGHT_INCH = 0.3
+CELL_PADDING_INCH = 0.3
+STRIPE_COLOR = "#f5f5f5"
+TABLE_DPI = 200
+
+
+def render_table(df: pd.DataFrame, engine: Literal["matplotlib", "chromium"] = "matplotlib",
+                 render_config: RenderConfig = None) -> str:
+    """
+    DataFrame을 테이블 이미지로 그려 base64 문자열로 반환한다.
+    :param df: 테이블로 그릴 DataFrame
+    :param engine: matplotlib - 프로세스 내에서 바로 그림, chromium - dataframe_image(headless chromium) 사용
+    :param render_config: matplotlib 엔진의 dpi, 이미지 포맷 (chromium 엔진은 항상 png). dpi는 TABLE_DPI를 넘지 않는다
+    :return: base64형 이미지 (mime type은 get_table_media_type)
+    """
+    if engine not in TABLE_ENGINES:
+        raise ValueError("not supported table engine")
+
+    if engine == "chromium":
+        import dataframe_image as dfi
+        buffer = io.BytesIO()
+        dfi.export(df, buffer)
+        buffer.seek(0)
+        return base64.b64encode(buffer.read()).decode()
+
+    table_config = RenderConfig(dpi=TABLE_DPI)
+    if render_config is not None:
+        table_config = RenderConfig(dpi=min(render_config.dpi, TABLE_DPI), image_format=render_config.image_format,
+                                    preview=render_config.preview)
+    return figure_to_base64(_draw_table(df), table_config, bbox_inches="tight", pad_inches=0.05)
+
+
+def get_table_media_type(engine: Literal["matplotlib", "chromium"] = "matplotlib",
+                         render_config: RenderConfig = None) -> str:
+    """
+    render_table이 반환하는 이미지의 mime type
+    """
+    if engine == "chromium":
+        return IMAGE_MEDIA_TYPES["png"]
+    return (render_config or RenderConfig()).media_type
+
+
+def table_to_json(df: pd.DataFrame) -> dict:
+    """
+    DataFrame을 프론트엔드에서 테이블로 그릴 수 있는 compact한 json(columns, index, data)으로 변환한다.
+    NaN은 null로 변환된다.
+    """
+    return json.loads(df.to_json(orient="split", force_ascii=False))
+
+
+def _draw_table(df: pd.DataFrame) -> "Figure":
+    from matplotlib.font_manager import FontProperties
+    from matplotlib.table import Table
+
+    font = FontProperties(fname=FONT_PATH, size=FONT_SIZE)
+    bold_font = FontProperties(fname=FONT_PATH, size=FONT_SIZE, weight="bold")
+
+    show_index = any(str(label) for label in df.index)
+    header = [str(column) for column in df.columns]
+    body = [_format_column(df.iloc[:, i]) for i in range(df.shape[1])]
+    rows = [list(row) for row in zip(*body)] if body else [[] for _ in range(len(df))]
+
+    if show_index:
+        header = [""] + header
+        rows = [[str(label)] + row for label, row in zip(df.index, rows)]
+
+    column_widths = [
+        max([len(header[i])] + [len(row[i]) for row in rows]) * CHAR_WIDTH_INCH + CELL_PADDING_INCH
+        for i in range(len(header))
+    ]
+    width = sum(column_widths)
+    height = (len(rows) + 1) * ROW_HEIGHT_INCH
+
+    fig = create_figure(figsize=(width, height))
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.axis("off")
+
+    table = Table(ax, bbox=[0, 0, 1, 1])
+    table.auto_set_font_size(False)
+    cell_height = 1 / (len(rows) + 1)
+
+    for row, values in enumerate([header] + rows):
+        for col, value in enumerate(values):
+            is_label = row == 0 or (show_index and col == 0)
+            cell = table.add_cell(row, col, width=column_widths[col] / width, height=cell_height, text=value,
+                                  loc="left" if show_index and col == 0 else "right",
+                                  facecolor=STRIPE_COLOR if row % 2 == 1 else "white",
+                                  edgecolor="black")
+            cell.visible_edges = "B" if row == 0 else ""
+            cell.set_linewidth(0.8)
+            cell.get_text().set_fontproperties(bold_font if is_label else font)
+
+    ax.add_table(table)
+    return fig
+
+
+def _format_column(column: pd.Series) -> List[str]:
+    """
+    pandas의 to_html과 같이 실수 컬럼은 컬럼 내에서 공통 소수점 자리수로 맞춰 문자열로 변환한다.
+    """
+    if not pd.api.types.is_float_dtype(column.dtype):
+        return [str(value) for value in column]
+
+    values = column.to_numpy(dtype="float64")
+    decimals = max([1] + [len("{:.6f}".format(value).rstrip("0").split(".")[1])
+                          for value in values[np.isfinite(values)]])
+
+    return [str(value) if not np.isfinite(value) else "{:.{}f}".format(value, decimals) for value in values]
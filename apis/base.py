@@ -4,6 +4,9 @@ from apis.v1 import route_analysis
 
 from apis.v1 import route_data
 
+from apis.v1 import route_metrics
+
 api_router = APIRouter()
 api_router.include_router(route_data.router, prefix="/data", tags=["data"])
-api_router.include_router(route_analysis.router, prefix="/analysis", tags=["analysis"])
\ No newline at end of file
+api_router.include_router(route_analysis.router, prefix="/analysis", tags=["analysis"])
+api_router.include_router(route_metrics.router, prefix="/metrics", tags=["metrics"])
\ No newline at end of file
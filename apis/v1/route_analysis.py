@@ -1,25 +1,84 @@
-from fastapi import APIRouter, Depends, status
+from typing import Union
+
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.orm import Session
 from schemas.analysis import *
 from db.session import get_db
-from db.repository.analysis import create_correlation_analysis, create_regression_analysis, create_clustering_analysis
+from db.repository.analysis import create_correlation_analysis, create_regression_analysis, create_clustering_analysis, \
+    create_regression_batch_analysis, analysis_cache, submit_analysis_job, get_analysis_job, get_analysis_job_result
 
 router = APIRouter()
 
 
-@router.post("/correlation", response_model=ShowAnalysis, status_code=status.HTTP_201_CREATED)
-def create_correlation(analysis_data: CreateCorrelation, db: Session = Depends(get_db)):
+@router.post("/correlation", response_model=Union[ShowAnalysis, ShowJob], status_code=status.HTTP_201_CREATED)
+def create_correlation(analysis_data: CreateCorrelation, response: Response, run_async: bool = False,
+                       db: Session = Depends(get_db)):
+    if run_async:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return submit_analysis_job("correlation", analysis_data)
+
     analysis_result = create_correlation_analysis(analysis_data=analysis_data, db=db)
     return analysis_result
 
 
-@router.post("/regression", response_model=ShowAnalysis, status_code=status.HTTP_201_CREATED)
-def create_regression(analysis_data: CreateRegression, db: Session = Depends(get_db)):
+@router.post("/regression", response_model=Union[ShowAnalysis, ShowJob], status_code=status.HTTP_201_CREATED)
+def create_regression(analysis_data: CreateRegression, response: Response, run_async: bool = False,
+                      db: Session = Depends(get_db)):
+    if run_async:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return submit_analysis_job("regression", analysis_data)
+
     analysis_result = create_regression_analysis(analysis_data=analysis_data, db=db)
     return analysis_result
 
 
-@router.post("/clustering", response_model=ShowAnalysis, status_code=status.HTTP_201_CREATED)
-def create_clustering(analysis_data: CreateClustering, db: Session = Depends(get_db)):
+@router.post("/regression/batch", response_model=Union[ShowAnalysis, ShowJob], status_code=status.HTTP_201_CREATED)
+def create_regression_batch(analysis_data: CreateRegressionBatch, response: Response, run_async: bool = False,
+                            db: Session = Depends(get_db)):
+    """
+    같은 독립변수로 여러 종속변수의 회귀분석을 한 번에 수행한다.
+    데이터 조회와 설계행렬 분해를 공유하며, 결과는 종속변수별 모형요약표와 분산분석표, 공통 기술통계 순이다.
+    """
+    if run_async:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return submit_analysis_job("regression_batch", analysis_data)
+
+    analysis_result = create_regression_batch_analysis(analysis_data=analysis_data, db=db)
+    return analysis_result
+
+
+@router.post("/clustering", response_model=Union[ShowAnalysis, ShowJob], status_code=status.HTTP_201_CREATED)
+def create_clustering(analysis_data: CreateClustering, response: Response, run_async: bool = False,
+                      db: Session = Depends(get_db)):
+    if run_async:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return submit_analysis_job("clustering", analysis_data)
+
     analysis_result = create_clustering_analysis(analysis_data=analysis_data, db=db)
     return analysis_result
+
+
+@router.get("/jobs/{id}", response_model=ShowJob, status_code=status.HTTP_200_OK)
+def get_job(id: str):
+    """
+    run_async=true로 요청한 분석 작업의 상태를 반환한다.
+    :param id: 분석 요청 시 반환된 job_id
+    """
+    return get_analysis_job(id)
+
+
+@router.get("/jobs/{id}/result", response_model=ShowAnalysis, status_code=status.HTTP_200_OK)
+def get_job_result(id: str):
+    """
+    완료된 분석 작업의 결과를 반환한다. 아직 완료되지 않았으면 409를 반환한다.
+    :param id: 분석 요청 시 반환된 job_id
+    """
+    return get_analysis_job_result(id)
+
+
+@router.get("/cache", response_model=ShowCacheStats, status_code=status.HTTP_200_OK)
+def get_cache_stats():
+    """
+    분석 결과 캐시의 backend, 저장된 결과 수, hit/miss 횟수를 반환한다.
+    """
+    return analysis_cache.stats()
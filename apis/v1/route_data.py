@@ -1,9 +1,10 @@
 from enum import Enum
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from schemas.data import *
 from db.repository.data import *
-from db.session import get_db
+from db.repository import data_async
+from db.session import get_data_db
 
 router = APIRouter()
 
@@ -15,28 +16,33 @@ class ChartType(str, Enum):
 
 
 @router.get("/variable", status_code=status.HTTP_200_OK)
-def get_variable_list(year: str, region: Literal["all", "gsbd"],
-                      period_unit: Literal["year", "month", "quarter", "half"],
-                      detail_period: Literal["all", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12"],
-                      db: Session = Depends(get_db)):
+async def get_variable_list(year: str, region: Literal["all", "gsbd"],
+                            period_unit: Literal["year", "month", "quarter", "half"],
+                            detail_period: Literal["all", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12"],
+                            request: Request, response: Response, db: Session = Depends(get_data_db())):
     """
     통계업무지원 특화서비스 데이터 카탈로그 목록을 반환한다.
+    목록은 메모리의 카탈로그 인덱스에서 반환하며, If-None-Match가 현재 ETag와 같으면 304를 반환한다.
     :param db: db session
     :return: 1,2 depth 형태의 카테고리명 string value json
     """
-    variable_list = retrieve_variable_list(year, region, period_unit, detail_period, db)
+    etag, variable_list = await data_async.retrieve_variable_list(year, region, period_unit, detail_period, db)
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
     return variable_list
 
 
 @router.get("/variable/{id}", response_model=ShowVariableDetail, status_code=status.HTTP_200_OK)
-def get_variable_detail(id: str, db: Session = Depends(get_db)):
+async def get_variable_detail(id: str, db: Session = Depends(get_data_db())):
     """
     통계업무지원 특화서비스에서 2depth의 상세보기 아이콘을 클릭할 시 데이터 성질에 대한 결과를 반환한다.
     :param id: variable의 아이디 ex) M010001
     :param db: db session
     :return: json 데이터
     """
-    variable_detail = retrieve_variable_detail(id, db)
+    variable_detail = await data_async.retrieve_variable_detail(id, db)
 
     if not variable_detail:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"variable with ID {id} does not exist")
@@ -53,8 +59,11 @@ def get_variable_detail(id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/filter-list", response_model=ShowFilterData, status_code=status.HTTP_200_OK)
-def get_filter_list(db: Session = Depends(get_db)):
-    filter_list = retrieve_filter_list(db)
+async def get_filter_list(db: Session = Depends(get_data_db())):
+    """
+    분석 조건 필터 목록을 메모리의 카탈로그 인덱스에서 반환한다.
+    """
+    filter_list = await data_async.retrieve_filter_list(db)
     return filter_list
 
 
@@ -62,17 +71,24 @@ def get_filter_list(db: Session = Depends(get_db)):
 
 
 @router.get("/variable/{id}/chart-data", response_model=ShowVariableChartData, status_code=status.HTTP_200_OK)
-def get_variable_chart_data(id: str,
-                            year: str,
-                            period_unit: str,
-                            detail_period: str,
-                            chart_type: ChartType = Query(...),
-                            db: Session = Depends(get_db)):
-    variable_chart_data = retrieve_variable_chart_data(id, year, period_unit, detail_period, chart_type, db)
+async def get_variable_chart_data(id: str,
+                                  year: str,
+                                  period_unit: str,
+                                  detail_period: str,
+                                  chart_type: ChartType = Query(...),
+                                  bins: Literal["fixed", "sturges", "fd"] = "fixed",
+                                  num_bins: int = Query(100, ge=1, le=1000),
+                                  db: Session = Depends(get_data_db())):
+    """
+    변수의 기초 차트 데이터를 반환한다.
+    :param bins: histogram 구간 설정 (fixed - num_bins개, sturges, fd - Freedman–Diaconis)
+    :param num_bins: bins가 fixed일 때의 구간 개수
+    """
+    variable_chart_data = await data_async.retrieve_variable_chart_data(id, year, period_unit, detail_period,
+                                                                        chart_type, db, bins, num_bins)
 
     if not variable_chart_data:
         raise HTTPException(detail=f"variable with ID {id} does not exist")
-    print(variable_chart_data)
     return variable_chart_data
 
 # @router.delete("/variable/{id}")
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, status
+
+from db.session import get_pool_metrics
+from schemas.metrics import ShowPoolMetrics
+
+router = APIRouter()
+
+
+@router.get("/db-pool", response_model=ShowPoolMetrics, status_code=status.HTTP_200_OK)
+def get_db_pool_metrics():
+    """
+    DB 커넥션 pool의 사용 중인 커넥션 수와 checkout 대기 시간을 반환한다.
+    """
+    return get_pool_metrics()
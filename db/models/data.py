@@ -61,25 +61,26 @@ class GgsStatis(Base):
     yr = Column(String(4), primary_key=True)
     stdg_cd = Column(String(10), primary_key=True)
     dat_no = Column(String(7), primary_key=True)
-    jan = Column(Numeric(15))
-    feb = Column(Numeric(15))
-    mar = Column(Numeric(15))
-    apr = Column(Numeric(15))
-    may = Column(Numeric(15))
-    jun = Column(Numeric(15))
-    july = Column(Numeric(15))
-    aug = Column(Numeric(15))
-    sep = Column(Numeric(15))
-    oct = Column(Numeric(15))
-    nov = Column(Numeric(15))
-    dec = Column(Numeric(15))
-    qu_1 = Column(Numeric(15))
-    qu_2 = Column(Numeric(15))
-    qu_3 = Column(Numeric(15))
-    qu_4 = Column(Numeric(15))
-    ht_1 = Column(Numeric(15))
-    ht_2 = Column(Numeric(15))
-    yr_vl = Column(Numeric(15))
+    # 기간 값은 Decimal 객체 대신 float로 읽는다
+    jan = Column(Numeric(15, asdecimal=False))
+    feb = Column(Numeric(15, asdecimal=False))
+    mar = Column(Numeric(15, asdecimal=False))
+    apr = Column(Numeric(15, asdecimal=False))
+    may = Column(Numeric(15, asdecimal=False))
+    jun = Column(Numeric(15, asdecimal=False))
+    july = Column(Numeric(15, asdecimal=False))
+    aug = Column(Numeric(15, asdecimal=False))
+    sep = Column(Numeric(15, asdecimal=False))
+    oct = Column(Numeric(15, asdecimal=False))
+    nov = Column(Numeric(15, asdecimal=False))
+    dec = Column(Numeric(15, asdecimal=False))
+    qu_1 = Column(Numeric(15, asdecimal=False))
+    qu_2 = Column(Numeric(15, asdecimal=False))
+    qu_3 = Column(Numeric(15, asdecimal=False))
+    qu_4 = Column(Numeric(15, asdecimal=False))
+    ht_1 = Column(Numeric(15, asdecimal=False))
+    ht_2 = Column(Numeric(15, asdecimal=False))
+    yr_vl = Column(Numeric(15, asdecimal=False))
     # pd_se = Column(String(7))
     frst_reg_dt = Column(TIMESTAMP)
     last_mdfcn_dt = Column(TIMESTAMP)
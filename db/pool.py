@@ -0,0 +1,68 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """
+    커넥션 pool의 checkout 대기 시간과 사용 중인 커넥션 수를 기록한다.
+    pool 크기를 uvicorn worker 수에 맞추는 근거로 사용한다. (값은 프로세스별)
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.checkouts: int = 0
+        self.timeouts: int = 0
+        self.wait_total: float = 0.0
+        self.wait_max: float = 0.0
+        self.peak_checked_out: int = 0
+
+    def record_checkout(self, wait: float, checked_out: int) -> None:
+        with self.lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def record_timeout(self) -> None:
+        with self.lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool) -> dict:
+        with self.lock:
+            return {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "peak_checked_out": self.peak_checked_out,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": self.wait_total / self.checkouts * 1000 if self.checkouts else 0.0,
+                "wait_max_ms": self.wait_max * 1000
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    checkout에 걸린 시간(대기 + 새 커넥션 생성)과 사용 중인 커넥션 수를 PoolMetrics에 기록하는 QueuePool
+    engine.dispose()로 pool이 다시 만들어져도 같은 metrics에 이어서 기록한다.
+    """
+
+    metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+
+        self.metrics.record_checkout(time.perf_counter() - start, self.checkedout())
+        return connection
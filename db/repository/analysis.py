@@ -1,6 +1,6 @@
 import os
 import uuid
-from typing import List, Literal
+from typing import Callable, List, Literal
 
 import pandas as pd
 from fastapi import Depends, HTTPException
@@ -8,81 +8,486 @@ from sqlalchemy import or_, inspect, text
 from sqlalchemy.orm import Session
 from starlette import status
 
-from db.session import get_db
-from schemas.analysis import CreateCorrelation, CreateRegression, ShowAnalysis, CreateClustering, AnalysisResult
-from analysis_module.regression_module import RegressionModule
+from db.session import get_db, SessionLocal, engine
+from schemas.analysis import CreateCorrelation, CreateRegression, ShowAnalysis, CreateClustering, AnalysisResult, \
+    ShowJob, CreateRegressionBatch
+from analysis_module.regression_module import RegressionModule, fit_regression_modules
 from analysis_module.correlation_module import CorrelationModule
 from analysis_module.clustering_module import GMMModule
+from analysis_module.table_renderer import table_to_json, render_table, get_table_media_type
+from analysis_module.plotting import RenderConfig
 from db.models.data import GgsStatis
-from db.repository.data import get_pivoted_df
+from db.repository.data import get_pivoted_df, get_data_version, ANALYSIS_MAX_VARIABLES
+from core.config import settings
+from utils.cache import ResultCache, create_cache_backend, make_cache_key
+from utils.job_queue import JobQueue, JobNotFoundError, JOB_SUCCESS, JOB_FAILURE
+from utils.process_pool import ProcessPool, SharedFrame, TaskTimeoutError, TaskQueueTimeoutError, mark_worker_process, \
+    is_worker_process
+from utils.logging_module import logger
+
+analysis_cache = ResultCache(create_cache_backend(
+    getattr(settings, "ANALYSIS_CACHE_BACKEND", "memory"),
+    max_entries=getattr(settings, "ANALYSIS_CACHE_MAX_ENTRIES", 128),
+    ttl=getattr(settings, "ANALYSIS_CACHE_TTL", 60 * 60),
+    directory=getattr(settings, "ANALYSIS_CACHE_DIR", "./output/cache/")
+))
+
+# 상관행렬 모드(mode=matrix)의 변수 수 상한과 계산 비용(행 수 x 변수 수^2) 상한
+CORRELATION_MAX_VARIABLES = getattr(settings, "CORRELATION_MAX_VARIABLES", 1000)
+CORRELATION_MAX_COST = getattr(settings, "CORRELATION_MAX_COST", 2 * 10 ** 9)
+
+
+# 분석 계산 위치 (inline: 요청을 처리하는 프로세스, process: 미리 띄워 둔 process pool)
+ANALYSIS_EXECUTION_BACKEND = getattr(settings, "ANALYSIS_EXECUTION_BACKEND", "inline")
+
+
+def _init_job_worker():
+    # fork된 worker가 부모 프로세스의 DB 커넥션을 공유하지 않도록 pool을 비운다
+    engine.dispose(close=False)
+    mark_worker_process()
+
+
+def _init_analysis_worker():
+    # 요청마다 import, 글꼴 등록 시간이 들지 않도록 worker를 띄울 때 분석 라이브러리를 미리 불러온다
+    _init_job_worker()
+    import scipy.stats  # noqa: F401
+    import seaborn  # noqa: F401
+    import sklearn.mixture  # noqa: F401
+    from analysis_module.fonts import register_font
+    register_font()
+
+
+analysis_job_queue = JobQueue(
+    backend=getattr(settings, "ANALYSIS_JOB_BACKEND", "process"),
+    max_workers=getattr(settings, "ANALYSIS_JOB_WORKERS", 2),
+    max_retained_jobs=getattr(settings, "ANALYSIS_JOB_MAX_RETAINED", 1000),
+    initializer=_init_job_worker
+)
+
+analysis_process_pool = ProcessPool(
+    processes=getattr(settings, "ANALYSIS_PROCESS_WORKERS", None),
+    max_tasks_per_child=getattr(settings, "ANALYSIS_PROCESS_MAX_TASKS_PER_CHILD", 100),
+    timeout=getattr(settings, "ANALYSIS_TIMEOUT", 120),
+    queue_timeout=getattr(settings, "ANALYSIS_QUEUE_TIMEOUT", 30),
+    initializer=_init_analysis_worker,
+    start_method=getattr(settings, "ANALYSIS_PROCESS_START_METHOD", None)
+)
+
+
+def get_render_config(analysis_data) -> RenderConfig:
+    return RenderConfig(**analysis_data.render_options.model_dump())
+
+
+def get_analysis_data_version(analysis_data, variable_list: List[str], db: Session) -> str:
+    return get_data_version(variable_list, analysis_data.year, db, year_end=analysis_data.year_end)
+
+
+def get_analysis_cache_key(analysis_type: str, analysis_data, data_version: str) -> str:
+    """
+    분석 종류, 입력 파라미터, 대상 데이터의 버전으로 분석 결과 캐시 키를 만든다
+    """
+    return make_cache_key(analysis_type, analysis_data.model_dump(), data_version)
+
+
+def get_analysis_pivoted_df(analysis_data, variable_list: List[str], db: Session, max_variables: int = None,
+                            data_version: str = None):
+    """
+    분석 입력의 연도 범위(year~year_end)와 기간 목록으로 패널 데이터를 조회한다
+    data_version을 넘기면 다른 분석에서 같은 조건으로 조회한 pivot 결과를 재사용한다
+    """
+    return get_pivoted_df(variable_list,
+                          analysis_data.year,
+                          analysis_data.period_unit,
+                          analysis_data.detail_period,
+                          db,
+                          year_end=analysis_data.year_end,
+                          detail_period_list=analysis_data.detail_period_list,
+                          max_variables=max_variables,
+                          data_version=data_version)
+
+
+def run_analysis(compute: Callable, analysis_data, pivoted_df: pd.DataFrame, dat_no_dat_nm_dict: dict) -> ShowAnalysis:
+    """
+    조회한 데이터로 분석 결과를 계산한다.
+    ANALYSIS_EXECUTION_BACKEND가 process이면 process pool에서 계산하며, 데이터는 shared memory로 넘긴다.
+    (job queue의 worker처럼 이미 별도 프로세스에서 실행 중이면 그 프로세스에서 계산한다)
+    """
+    if ANALYSIS_EXECUTION_BACKEND != "process" or is_worker_process():
+        return compute(analysis_data, pivoted_df, dat_no_dat_nm_dict)
+
+    shared_frame = SharedFrame(pivoted_df)
+    try:
+        return analysis_process_pool.run(_compute_in_worker, compute, analysis_data, shared_frame, dat_no_dat_nm_dict)
+    except TaskTimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="분석 시간이 초과되었습니다.")
+    except TaskQueueTimeoutError:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail="분석 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요.")
+    except AnalysisJobError as e:
+        if e.status_code < 500:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="분석 중 오류가 발생했습니다.")
+    finally:
+        shared_frame.release()
+
+
+def _compute_in_worker(compute: Callable, analysis_data, pivoted_df: pd.DataFrame,
+                       dat_no_dat_nm_dict: dict) -> ShowAnalysis:
+    try:
+        return compute(analysis_data, pivoted_df, dat_no_dat_nm_dict)
+    except HTTPException as e:
+        raise AnalysisJobError(e.status_code, e.detail) from None
+    except TaskTimeoutError:
+        raise
+    except Exception as e:
+        logger.exception("analysis failed")
+        raise AnalysisJobError(status.HTTP_500_INTERNAL_SERVER_ERROR, repr(e)) from None
+
+
+def check_correlation_cost(n_rows: int, n_variables: int) -> None:
+    if n_rows * n_variables ** 2 > CORRELATION_MAX_COST:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="분석 데이터가 너무 큽니다. 변수 수나 기간을 줄여주세요.")
+
+
+def check_analysis_variables(pivoted_df: pd.DataFrame, variable_list: List[str]) -> None:
+    """
+    조회 기간에 값이 하나도 없어 pivot 결과에 컬럼이 없는 변수가 있으면 400을 반환한다
+    """
+    if not set(variable_list) <= set(pivoted_df.columns):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="조회된 데이터가 없는 변수가 있습니다. 다른 데이터를 선택해주세요.")
+
+
+def check_regression_observations(pivoted_df: pd.DataFrame, dependent_variable_list: List[str],
+                                  independent_variable_list: List[str]) -> None:
+    """
+    결측값을 제외하면 적합할 행이 없는 종속변수가 있으면 400을 반환한다
+    """
+    complete_rows = pivoted_df[independent_variable_list].notna().all(axis=1)
+    if (pivoted_df.loc[complete_rows, dependent_variable_list].notna().sum() == 0).any():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="결측값을 제외한 데이터가 없습니다. 다른 데이터를 선택해주세요.")
 
 
 def create_correlation_analysis(analysis_data: CreateCorrelation, db: Session):
-    pivoted_df, dat_no_dat_nm_dict = get_pivoted_df(analysis_data.variable_list,
-                                                    analysis_data.year,
-                                                    analysis_data.period_unit,
-                                                    analysis_data.detail_period,
-                                                    db)
+    data_version = get_analysis_data_version(analysis_data, analysis_data.variable_list, db)
+    cache_key = get_analysis_cache_key("correlation", analysis_data, data_version)
+    cached_result = analysis_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+
+    max_variables = CORRELATION_MAX_VARIABLES if analysis_data.mode == "matrix" else None
+    pivoted_df, dat_no_dat_nm_dict = get_analysis_pivoted_df(analysis_data, analysis_data.variable_list, db,
+                                                             max_variables=max_variables, data_version=data_version)
 
     if len(pivoted_df) == 0:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="데이터가 크기가 0입니다. 다른 데이터를 선택해주세요.")
+    if analysis_data.mode == "matrix":
+        check_correlation_cost(len(pivoted_df), pivoted_df.shape[1] - 3)
+
+    corr_result = run_analysis(compute_correlation_result, analysis_data, pivoted_df, dat_no_dat_nm_dict)
+
+    analysis_cache.set(cache_key, corr_result)
+    return corr_result
+
+
+def compute_correlation_result(analysis_data: CreateCorrelation, pivoted_df: pd.DataFrame,
+                               dat_no_dat_nm_dict: dict) -> ShowAnalysis:
+    render_config = get_render_config(analysis_data)
+    correlation_module = CorrelationModule(pivoted_df.iloc[:, 3:], dat_no_dat_nm_dict, analysis_data.table_engine,
+                                           render_config)
+    if analysis_data.mode == "matrix":
+        return get_correlation_matrix_result(correlation_module, analysis_data, render_config)
 
-    correlation_module = CorrelationModule(pivoted_df.iloc[:, 3:], dat_no_dat_nm_dict)
     corr_result = ShowAnalysis(data=[])
 
-    pair_plot = correlation_module.save_pair_plot(),
-    heatmap_plot = correlation_module.save_heatmap_plot(),
-    descriptive_statistics_table = correlation_module.save_descriptive_statistics_table()
+    if analysis_data.format == "json":
+        pair_plot = table_to_json(correlation_module.get_pair_plot_data())
+        heatmap_plot = table_to_json(correlation_module.get_correlation_matrix())
+        pvalue_table = table_to_json(correlation_module.get_pvalue_of_correlation(analysis_data.testing_side))
+        descriptive_statistics_table = table_to_json(correlation_module.get_descriptive_statistics())
+    else:
+        pair_plot = correlation_module.save_pair_plot()
+        heatmap_plot = correlation_module.save_heatmap_plot(testing_side=analysis_data.testing_side,
+                                                            valid_pvalue_accent=analysis_data.valid_pvalue_accent)
+        descriptive_statistics_table = correlation_module.save_descriptive_statistics_table()
 
-    corr_result.data.append(AnalysisResult(title="산점도행렬", result=pair_plot[0], format="base64"))
-    corr_result.data.append(AnalysisResult(title="상관계수 히트맵", result=heatmap_plot[0], format="base64"))
-    corr_result.data.append(AnalysisResult(title="기술통계", result=descriptive_statistics_table, format="base64"))
+    media_type = render_config.media_type if analysis_data.format == "base64" else None
+    table_media_type = get_table_media_type(analysis_data.table_engine, render_config) \
+        if analysis_data.format == "base64" else None
+    corr_result.data.append(
+        AnalysisResult(title="산점도행렬", result=pair_plot, format=analysis_data.format, media_type=media_type))
+    corr_result.data.append(
+        AnalysisResult(title="상관계수 히트맵", result=heatmap_plot, format=analysis_data.format, media_type=media_type))
+    if analysis_data.format == "json":
+        corr_result.data.append(AnalysisResult(title="상관계수 유의확률", result=pvalue_table, format=analysis_data.format))
+    corr_result.data.append(AnalysisResult(title="기술통계", result=descriptive_statistics_table,
+                                           format=analysis_data.format, media_type=table_media_type))
     return corr_result
 
 
+def get_correlation_matrix_result(correlation_module: CorrelationModule, analysis_data: CreateCorrelation,
+                                  render_config: RenderConfig) -> ShowAnalysis:
+    """
+    변수가 많을 때의 상관분석 결과 (산점도행렬 대신 군집 정렬 히트맵과 상관계수 상위 변수쌍)
+    기술통계 표는 변수 수가 ANALYSIS_MAX_VARIABLES를 넘으면 이미지 대신 json으로 반환한다.
+    """
+    top_pairs = correlation_module.get_top_correlation_pairs(analysis_data.top_k, analysis_data.testing_side)
+    descriptive_statistics = correlation_module.get_descriptive_statistics()
+    statistics_format = analysis_data.format
+    if analysis_data.format == "json":
+        heatmap_plot = table_to_json(correlation_module.get_clustered_correlation_matrix())
+        top_pairs_table = table_to_json(top_pairs)
+        descriptive_statistics_table = table_to_json(descriptive_statistics)
+    else:
+        heatmap_plot = correlation_module.save_clustered_heatmap_plot()
+        top_pairs_table = render_table(top_pairs, analysis_data.table_engine, render_config)
+        if len(descriptive_statistics) > ANALYSIS_MAX_VARIABLES:
+            statistics_format = "json"
+            descriptive_statistics_table = table_to_json(descriptive_statistics)
+        else:
+            descriptive_statistics_table = correlation_module.save_descriptive_statistics_table()
+
+    media_type = render_config.media_type if analysis_data.format == "base64" else None
+    table_media_type = get_table_media_type(analysis_data.table_engine, render_config) \
+        if analysis_data.format == "base64" else None
+    return ShowAnalysis(data=[
+        AnalysisResult(title="상관계수 히트맵", result=heatmap_plot, format=analysis_data.format, media_type=media_type),
+        AnalysisResult(title="상관계수 상위 변수쌍", result=top_pairs_table, format=analysis_data.format,
+                       media_type=table_media_type),
+        AnalysisResult(title="기술통계", result=descriptive_statistics_table, format=statistics_format,
+                       media_type=table_media_type if statistics_format == "base64" else None)
+    ])
+
+
 def create_regression_analysis(analysis_data: CreateRegression, db: Session):
-    pivoted_df, dat_no_dat_nm_dict = get_pivoted_df(
-        analysis_data.independent_variable_list + [analysis_data.dependent_variable],
-        analysis_data.year,
-        analysis_data.period_unit,
-        analysis_data.detail_period,
-        db)
+    variable_list = analysis_data.independent_variable_list + [analysis_data.dependent_variable]
+    data_version = get_analysis_data_version(analysis_data, variable_list, db)
+    cache_key = get_analysis_cache_key("regression", analysis_data, data_version)
+    cached_result = analysis_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+
+    pivoted_df, dat_no_dat_nm_dict = get_analysis_pivoted_df(analysis_data, variable_list, db,
+                                                             data_version=data_version)
 
     if len(pivoted_df) == 0:
         raise HTTPException(status_code=404, detail="데이터가 크기가 0입니다. 다른 데이터를 선택해주세요.")
+    check_analysis_variables(pivoted_df, variable_list)
+
+    regression_result = run_analysis(compute_regression_result, analysis_data, pivoted_df, dat_no_dat_nm_dict)
+
+    analysis_cache.set(cache_key, regression_result)
+    return regression_result
 
-    regression_module = RegressionModule(pivoted_df, analysis_data.dependent_variable, dat_no_dat_nm_dict)
+
+def compute_regression_result(analysis_data: CreateRegression, pivoted_df: pd.DataFrame,
+                              dat_no_dat_nm_dict: dict) -> ShowAnalysis:
+    render_config = get_render_config(analysis_data)
+    regression_module = RegressionModule(pivoted_df, analysis_data.dependent_variable, dat_no_dat_nm_dict,
+                                         analysis_data.table_engine, render_config)
+    check_regression_observations(pivoted_df, [regression_module.y_column_id], regression_module.X_column_id_list)
     regression_module.fit()
-    regression_summary_table = regression_module.get_result_summary()
-    anova_table = regression_module.get_anova_lm()
-    descriptive_statistics_table = regression_module.save_descriptive_statistics_table()
 
+    if analysis_data.format == "json":
+        regression_summary_table = {
+            "statistics": regression_module.get_summary_statistics(),
+            "coefficients": table_to_json(regression_module.get_coefficient_table())
+        }
+        anova_table = table_to_json(regression_module.get_anova_table())
+        descriptive_statistics_table = table_to_json(regression_module.get_descriptive_statistics())
+    else:
+        regression_summary_table = regression_module.get_result_summary()
+        anova_table = regression_module.get_anova_lm()
+        descriptive_statistics_table = regression_module.save_descriptive_statistics_table()
+
+    # 회귀분석 결과는 모두 표 이미지
+    media_type = get_table_media_type(analysis_data.table_engine, render_config) \
+        if analysis_data.format == "base64" else None
     regression_result = ShowAnalysis(data=[])
-    regression_result.data.append(AnalysisResult(title="모형요약표", result=regression_summary_table, format="base64"))
-    regression_result.data.append(AnalysisResult(title="분산분석표", result=anova_table, format="base64"))
-    regression_result.data.append(AnalysisResult(title="기술통계", result=descriptive_statistics_table, format="base64"))
+    regression_result.data.append(AnalysisResult(title="모형요약표", result=regression_summary_table,
+                                                 format=analysis_data.format, media_type=media_type))
+    regression_result.data.append(
+        AnalysisResult(title="분산분석표", result=anova_table, format=analysis_data.format, media_type=media_type))
+    regression_result.data.append(AnalysisResult(title="기술통계", result=descriptive_statistics_table,
+                                                 format=analysis_data.format, media_type=media_type))
+    return regression_result
+
+
+def create_regression_batch_analysis(analysis_data: CreateRegressionBatch, db: Session):
+    """
+    종속변수별 회귀분석을 데이터 조회 한 번, 설계행렬 분해 한 번으로 수행한다
+    """
+    dependent_variable_list = list(dict.fromkeys(analysis_data.dependent_variable_list))
+    if not dependent_variable_list or set(dependent_variable_list) & set(analysis_data.independent_variable_list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="종속변수는 1개 이상이며 독립변수와 겹칠 수 없습니다.")
+
+    variable_list = analysis_data.independent_variable_list + dependent_variable_list
+    data_version = get_analysis_data_version(analysis_data, variable_list, db)
+    cache_key = get_analysis_cache_key("regression_batch", analysis_data, data_version)
+    cached_result = analysis_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+
+    pivoted_df, dat_no_dat_nm_dict = get_analysis_pivoted_df(analysis_data, variable_list, db,
+                                                             data_version=data_version)
+
+    if len(pivoted_df) == 0:
+        raise HTTPException(status_code=404, detail="데이터가 크기가 0입니다. 다른 데이터를 선택해주세요.")
+    check_analysis_variables(pivoted_df, variable_list)
+
+    regression_result = run_analysis(compute_regression_batch_result, analysis_data, pivoted_df, dat_no_dat_nm_dict)
+
+    analysis_cache.set(cache_key, regression_result)
+    return regression_result
+
+
+def compute_regression_batch_result(analysis_data: CreateRegressionBatch, pivoted_df: pd.DataFrame,
+                                    dat_no_dat_nm_dict: dict) -> ShowAnalysis:
+    dependent_variable_list = list(dict.fromkeys(analysis_data.dependent_variable_list))
+    render_config = get_render_config(analysis_data)
+    check_regression_observations(pivoted_df, dependent_variable_list, analysis_data.independent_variable_list)
+    regression_modules = fit_regression_modules(pivoted_df, dependent_variable_list,
+                                                analysis_data.independent_variable_list, dat_no_dat_nm_dict,
+                                                analysis_data.table_engine, render_config)
+
+    # 회귀분석 결과는 모두 표 이미지
+    media_type = get_table_media_type(analysis_data.table_engine, render_config) \
+        if analysis_data.format == "base64" else None
+    regression_result = ShowAnalysis(data=[])
+    for regression_module in regression_modules:
+        if analysis_data.format == "json":
+            regression_summary_table = {
+                "statistics": regression_module.get_summary_statistics(),
+                "coefficients": table_to_json(regression_module.get_coefficient_table())
+            }
+            anova_table = table_to_json(regression_module.get_anova_table())
+        else:
+            regression_summary_table = regression_module.get_result_summary()
+            anova_table = regression_module.get_anova_lm()
+
+        dependent_variable_name = dat_no_dat_nm_dict.get(regression_module.y_column_id, regression_module.y_column_id)
+        regression_result.data.append(AnalysisResult(title="모형요약표 ({})".format(dependent_variable_name),
+                                                     result=regression_summary_table, format=analysis_data.format,
+                                                     media_type=media_type))
+        regression_result.data.append(AnalysisResult(title="분산분석표 ({})".format(dependent_variable_name),
+                                                     result=anova_table, format=analysis_data.format,
+                                                     media_type=media_type))
+
+    if analysis_data.format == "json":
+        descriptive_statistics_table = table_to_json(regression_modules[0].get_descriptive_statistics())
+    else:
+        descriptive_statistics_table = regression_modules[0].save_descriptive_statistics_table()
+    regression_result.data.append(AnalysisResult(title="기술통계", result=descriptive_statistics_table,
+                                                 format=analysis_data.format, media_type=media_type))
     return regression_result
 
 
 def create_clustering_analysis(analysis_data: CreateClustering, db: Session):
-    pivoted_df, dat_no_dat_nm_dict = get_pivoted_df(analysis_data.variable_list,
-                                                    analysis_data.year,
-                                                    analysis_data.period_unit,
-                                                    analysis_data.detail_period,
-                                                    db)
-    gmm_module = GMMModule(pivoted_df, dat_no_dat_nm_dict)
-    gmm_module.optimal_k = analysis_data.n_point
+    data_version = get_analysis_data_version(analysis_data, analysis_data.variable_list, db)
+    cache_key = get_analysis_cache_key("clustering", analysis_data, data_version)
+    cached_result = analysis_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+
+    pivoted_df, dat_no_dat_nm_dict = get_analysis_pivoted_df(analysis_data, analysis_data.variable_list, db,
+                                                             data_version=data_version)
+    clustering_result = run_analysis(compute_clustering_result, analysis_data, pivoted_df, dat_no_dat_nm_dict)
+
+    analysis_cache.set(cache_key, clustering_result)
+    return clustering_result
+
+
+def compute_clustering_result(analysis_data: CreateClustering, pivoted_df: pd.DataFrame,
+                              dat_no_dat_nm_dict: dict) -> ShowAnalysis:
+    render_config = get_render_config(analysis_data)
+    gmm_module = GMMModule(pivoted_df, dat_no_dat_nm_dict, render_config)
+    if analysis_data.n_point == "auto":
+        gmm_module.set_optimal_k(analysis_data.k_method)
+    else:
+        gmm_module.optimal_k = analysis_data.n_point
     gmm_module.fit()
 
     clustering_result = ShowAnalysis(data=[])
     clustering_result.data.append(
         AnalysisResult(title="GMM Clustering Table", result=gmm_module.get_clustering_result(), format="json"))
-    clustering_result.data.append(
-        AnalysisResult(title="GMM Plot", result=gmm_module.get_cluster_output_plot(), format="base64"))
-
+    if analysis_data.format == "json":
+        clustering_result.data.append(
+            AnalysisResult(title="GMM Plot", result=gmm_module.get_cluster_output_data(), format="json"))
+    else:
+        clustering_result.data.append(AnalysisResult(title="GMM Plot", result=gmm_module.get_cluster_output_plot(),
+                                                     format="base64", media_type=render_config.media_type))
     return clustering_result
 
 
+class AnalysisJobError(Exception):
+    """
+    worker 프로세스에서 발생한 오류를 pickle 가능한 형태로 전달하기 위한 예외
+    """
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def run_analysis_job(analysis_type: Literal["correlation", "regression", "regression_batch", "clustering"], analysis_data):
+    """
+    job queue의 worker에서 실행되는 분석 함수
+    worker에서 별도의 db session을 열어 분석을 수행한다
+    """
+    create_analysis = {
+        "correlation": create_correlation_analysis,
+        "regression": create_regression_analysis,
+        "regression_batch": create_regression_batch_analysis,
+        "clustering": create_clustering_analysis
+    }[analysis_type]
+
+    db = SessionLocal()
+    try:
+        return create_analysis(analysis_data=analysis_data, db=db)
+    except HTTPException as e:
+        raise AnalysisJobError(e.status_code, e.detail) from None
+    except Exception as e:
+        logger.exception("analysis job failed")
+        raise AnalysisJobError(status.HTTP_500_INTERNAL_SERVER_ERROR, repr(e)) from None
+    finally:
+        db.close()
+
+
+def submit_analysis_job(analysis_type: Literal["correlation", "regression", "regression_batch", "clustering"], analysis_data) -> ShowJob:
+    job_id = analysis_job_queue.submit(analysis_type, run_analysis_job, analysis_type, analysis_data)
+    return get_analysis_job(job_id)
+
+
+def get_analysis_job(job_id: str) -> ShowJob:
+    try:
+        job = analysis_job_queue.get(job_id)
+    except JobNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="해당 ID의 작업이 없습니다.")
+
+    return ShowJob(job_id=job.job_id, analysis_type=job.name, status=job.status, error=job.error)
+
+
+def get_analysis_job_result(job_id: str) -> ShowAnalysis:
+    try:
+        job = analysis_job_queue.get(job_id)
+    except JobNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="해당 ID의 작업이 없습니다.")
+
+    if job.status == JOB_FAILURE:
+        error = job.future.exception()
+        if isinstance(error, AnalysisJobError) and error.status_code < 500:
+            raise HTTPException(status_code=error.status_code, detail=error.detail)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="분석 중 오류가 발생했습니다.")
+
+    if job.status != JOB_SUCCESS:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="아직 완료되지 않은 작업입니다.")
+
+    return job.result()
+
+
 if __name__ == '__main__':
     # create_correlation = CreateCorrelation(
     #     variable_list=["M0002001" + str(i) for i in range(0, 10)],
@@ -0,0 +1,223 @@
+import threading
+import time
+from typing import Callable, Dict, List, Literal, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from db.models.data import GgsCmmn
+from db.repository import queries
+from db.repository.data import STATIS_VALUE_COLUMNS, PERIOD_UNIT_LIST, DETAIL_PERIOD_DICT, \
+    get_detail_filter_condition, get_period_unit_list, get_value_period_list
+from utils.cache import make_cache_key
+from utils.logging_module import logger
+
+GB_DATA_SOURCE = "경상북도"
+
+
+def fetch_info_version(db: Session) -> str:
+    """
+    카테고리(ggs_cmmn)와 변수 정보(ggs_data_info)의 버전 토큰
+    """
+    row = db.execute(text("""
+        SELECT
+            (SELECT max(last_mdfcn_dt) FROM ggs_data_info),
+            (SELECT count(*) FROM ggs_data_info),
+            (SELECT max(last_mdfcn_dt) FROM ggs_cmmn),
+            (SELECT count(*) FROM ggs_cmmn)
+    """)).first()
+    return "/".join(str(value) for value in row)
+
+
+def fetch_year_versions(db: Session) -> Dict[str, str]:
+    """
+    ggs_statis의 연도별 버전 토큰 (최종 수정일시, 행 수)
+    """
+    rows = db.execute(text("""
+        SELECT yr, max(last_mdfcn_dt), count(*)
+        FROM ggs_statis
+        GROUP BY yr
+    """))
+    return {row[0]: "{}/{}".format(row[1], row[2]) for row in rows}
+
+
+def fetch_categories(db: Session) -> List[dict]:
+    rows = db.query(GgsCmmn).filter(
+        GgsCmmn.cmmn_cd.like('M01%'),
+        GgsCmmn.use_yn == "Y"
+    ).order_by(GgsCmmn.indct_orr).all()
+
+    return [{"id": row.cmmn_cd, "name": row.cmmn_cd_nm, "order_index": int(row.indct_orr)} for row in rows]
+
+
+def fetch_variables(db: Session) -> List[dict]:
+    rows = db.execute(text("""
+        SELECT
+            gdi.dat_no, gdi.dat_nm, gdi.clsf_cd, gdi.indct_orr, gdi.pd_se, gdi.dat_src, gc.cmmn_cd_nm rgn_se_nm
+        FROM ggs_data_info gdi
+        LEFT JOIN ggs_cmmn gc ON gdi.rgn_se = gc.cmmn_cd
+        ORDER BY gdi.indct_orr, gdi.dat_no
+    """))
+    return [dict(row._mapping) for row in rows]
+
+
+def fetch_availability(years: List[str], db: Session) -> Dict[str, Dict[str, set]]:
+    """
+    연도별, 변수별로 값이 하나라도 있는 기간 컬럼 집합
+    """
+    availability = {year: {} for year in years}
+    for row in db.execute(queries.STATIS_AVAILABILITY, {'years': list(years)}):
+        row = row._mapping
+        availability[row["yr"]][row["dat_no"]] = {column for column in STATIS_VALUE_COLUMNS if row[column]}
+    return availability
+
+
+def match_region(dat_src: str, region: str) -> bool:
+    if dat_src is None:
+        return False
+    return (dat_src == GB_DATA_SOURCE) == (region != "all")
+
+
+class VariableCatalog:
+    """
+    데이터 카탈로그(/data/variable)와 필터 목록(/data/filter-list)을 메모리에 두고 제공하는 인덱스
+    refresh_interval마다 버전 토큰만 조회하여, 변수 정보가 바뀌면 정보를 다시 읽고
+    ggs_statis는 버전이 바뀐 연도만 다시 집계한다.
+    조건(year, region, period_unit, detail_period)별 목록은 처음 요청될 때 만들어 버전이 바뀔 때까지 재사용한다.
+    """
+
+    def __init__(self, refresh_interval: float = 60, clock: Callable[[], float] = time.time):
+        self.refresh_interval: float = refresh_interval
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.load_lock = threading.Lock()
+        self.checked_at: float = None
+
+        self.info_version: str = None
+        self.year_versions: Dict[str, str] = {}
+        self.categories: List[dict] = []
+        self.variables: List[dict] = []
+        self.availability: Dict[str, Dict[str, set]] = {}
+
+        self.version: str = None
+        self.views: Dict[tuple, dict] = {}
+        self.filter_list: dict = None
+
+    def refresh(self, db: Session, force: bool = False) -> None:
+        if self.version is None:
+            # 처음 읽는 중에 들어온 요청은 빈 카탈로그를 만들지 않도록 읽기가 끝날 때까지 기다린다
+            # (AsyncSession은 event loop thread에서 이 lock을 기다리면 안 되므로 data_async.load_catalog에서 먼저 읽는다)
+            with self.load_lock:
+                if self.version is None:
+                    self._refresh(db, force=True)
+                    return
+        self._refresh(db, force)
+
+    def _refresh(self, db: Session, force: bool) -> None:
+        # 조회는 lock 밖에서 하고 반영만 lock 안에서 한다 (async session의 run_sync 안에서도 event loop를 막지 않도록)
+        with self.lock:
+            if not force and self.checked_at is not None and self.clock() - self.checked_at < self.refresh_interval:
+                return
+            checked_at, self.checked_at = self.checked_at, self.clock()
+            current_info_version, current_year_versions = self.info_version, dict(self.year_versions)
+
+        try:
+            info_version = fetch_info_version(db)
+            info = (fetch_categories(db), fetch_variables(db)) if info_version != current_info_version else None
+
+            year_versions = fetch_year_versions(db)
+            stale_years = [year for year, version in year_versions.items()
+                           if current_year_versions.get(year) != version]
+            availability = fetch_availability(stale_years, db) if stale_years else {}
+        except Exception:
+            # 조회에 실패하면 다음 요청에서 다시 시도한다
+            with self.lock:
+                self.checked_at = checked_at
+            raise
+
+        with self.lock:
+            changed = False
+            if info is not None:
+                self.categories, self.variables = info
+                self.info_version = info_version
+                changed = True
+
+            removed_years = set(self.year_versions) - set(year_versions)
+            self.availability.update(availability)
+            for year in removed_years:
+                self.availability.pop(year, None)
+            if stale_years or removed_years:
+                logger.info("variable catalog refreshed : {}".format(sorted(stale_years)))
+                changed = True
+            self.year_versions = year_versions
+
+            if changed:
+                self.version = make_cache_key(self.info_version, self.year_versions)
+                self.views = {}
+                self.filter_list = None
+
+    def get_variable_list(self, year: str, region: Literal["all", "gsbd"],
+                          period_unit: Literal["year", "month", "quarter", "half"],
+                          detail_period: Literal["all", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12"],
+                          db: Session) -> Tuple[str, dict]:
+        """
+        :return: (ETag, 1,2 depth 형태의 카탈로그 목록)
+        """
+        column = get_detail_filter_condition(period_unit, detail_period)
+        period_unit_list = get_period_unit_list(period_unit)
+        self.refresh(db)
+
+        key = (year, region, period_unit, detail_period)
+        with self.lock:
+            if key not in self.views:
+                self.views[key] = self._build_view(year, region, period_unit_list, column)
+            return '"{}"'.format(make_cache_key(self.version, key)), self.views[key]
+
+    def get_filter_list(self, db: Session) -> dict:
+        """
+        연도 목록과 기간 메타데이터, 연도별로 값이 있는 기간 단위(available_period_unit)를 반환한다
+        """
+        self.refresh(db)
+
+        with self.lock:
+            if self.filter_list is None:
+                years = sorted(self.year_versions)
+                self.filter_list = {
+                    "year": years,
+                    "period_unit": PERIOD_UNIT_LIST,
+                    "detail_period": DETAIL_PERIOD_DICT,
+                    "available_period_unit": {year: self._get_available_period_units(year) for year in years}
+                }
+            return self.filter_list
+
+    def _get_available_period_units(self, year: str) -> List[str]:
+        columns = set().union(*self.availability.get(year, {}).values())
+        return [period_unit for period_unit in PERIOD_UNIT_LIST
+                if columns.intersection(get_value_period_list(period_unit))]
+
+    def _build_view(self, year: str, region: str, period_unit_list: List[str], column: str) -> dict:
+        result = {
+            category["id"]: {"name": category["name"], "order_index": category["order_index"], "children": []}
+            for category in self.categories
+        }
+        available = self.availability.get(year, {})
+
+        for variable in self.variables:
+            if variable["clsf_cd"] not in result or variable["pd_se"] not in period_unit_list:
+                continue
+            if not match_region(variable["dat_src"], region) or column not in available.get(variable["dat_no"], ()):
+                continue
+
+            result[variable["clsf_cd"]]["children"].append({
+                variable["dat_no"]: {
+                    "name": variable["dat_nm"],
+                    "order_index": variable["indct_orr"],
+                    "region_unit": variable["rgn_se_nm"]
+                }
+            })
+
+        return result
+
+
+variable_catalog = VariableCatalog(refresh_interval=getattr(settings, "CATALOG_REFRESH_INTERVAL", 60))
@@ -1,20 +1,46 @@
 import datetime
-import os
-import uuid
 
 from fastapi import HTTPException
-from typing import Literal, List
+from typing import Literal, List, Union
 
 from numpy import select
 from sqlalchemy.orm import Session, aliased
-from sqlalchemy import create_engine, text, func, and_, Integer, or_, bindparam, distinct
+from sqlalchemy import create_engine, text, func, and_, Integer, or_, bindparam
+import numpy as np
 import pandas as pd
 from starlette import status
 
+from core.config import settings
 from core.hashing import Hasher
 
-from db.models.data import GgsStatis, GgsCmmn, GgsDataInfo
+from db.models.data import GgsDataInfo
+from db.repository import queries
+from db.repository.queries import STATIS_VALUE_COLUMNS, PERIOD_UNIT_COLUMNS, get_statis_query
+from db.repository.replica import statis_replica
 from schemas.data import ShowVariableDetail
+from utils.cache import make_cache_key
+from utils.frame_cache import FrameCache
+
+
+# histogram 구간 집계 위치 (numpy: 원본 행을 조회해 서버에서 계산, sql: postgresql의 width_bucket으로 DB에서 집계)
+HISTOGRAM_BINNING_ENGINE = getattr(settings, "HISTOGRAM_BINNING_ENGINE", "numpy")
+
+# histogram 구간 수 상한 (chart-data의 num_bins 상한과 같음). sturges, fd도 이 값을 넘지 않는다
+HISTOGRAM_MAX_BINS = 1000
+
+# 분석 변수 수 상한. 산점도행렬, 표 이미지처럼 변수 수에 따라 결과물이 커지는 분석에 적용한다
+ANALYSIS_MAX_VARIABLES = getattr(settings, "ANALYSIS_MAX_VARIABLES", 10)
+
+# 분석 종류와 관계없이 같은 조건의 pivot 결과를 재사용하는 캐시의 메모리 상한 (0이면 사용하지 않음)
+pivot_frame_cache = FrameCache(max_bytes=getattr(settings, "PIVOT_CACHE_MAX_BYTES", 256 * 1024 ** 2))
+
+PERIOD_UNIT_LIST = ["year", "half", "quarter", "month"]
+DETAIL_PERIOD_DICT = {
+    "year": ["all"],
+    "half": ["1", "2"],
+    "quarter": ["1", "2", "3", "4"],
+    "month": ["1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12"]
+}
 
 
 def get_period_unit_list(period_unit):
@@ -62,266 +88,267 @@ def get_region_unit_id(region_unit):
 
 
 def get_value_period_list(period_unit: str) -> List[str]:
-    if period_unit == "year":
-        return ["yr_vl"]
-    elif period_unit == "month":
-        return ["jan", "feb", "mar", "apr", "may", "jun", "july", "aug", "sep", "oct", "nov", "dec"]
-    elif period_unit == "quarter":
-        return ["qu_1", "qu_2", "qu_3", "qu_4"]
-    elif period_unit == "half":
-        return ["ht_1", "ht_2"]
-
-
-def retrieve_variable_list(year: str,
-                           region: Literal["all", "gsbd"],
-                           period_unit: Literal["year", "month", "quarter", "half"],
-                           detail_period: Literal["all", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12"],
-                           db: Session):
-    result = {}
-
-    depth1_result = db.query(GgsCmmn).filter(
-        GgsCmmn.cmmn_cd.like('M01%'),
-        GgsCmmn.use_yn == "Y"
-    ).order_by(GgsCmmn.indct_orr).all()
-
-    for row in depth1_result:
-        result[row.cmmn_cd] = {
-            "name": row.cmmn_cd_nm,
-            "order_index": int(row.indct_orr),
-            "children": []
-        }
-
-    period_unit_list = get_period_unit_list(period_unit)
-
-    depth2_query_template = """
-        select 
-            distinct gdi.dat_no, gdi.dat_nm, gdi.clsf_cd, gdi.indct_orr, gc.cmmn_cd_nm rgn_se_nm        
-        from 
-            ggs_data_info gdi
-        left join 
-            ggs_statis gs
-        on 
-            gdi.dat_no = gs.dat_no
-        left join 
-            ggs_cmmn gc
-        on 
-            gdi.rgn_se = gc.cmmn_cd 
-        where yr=:year
-        AND (
-            (dat_src != '경상북도' AND :region = 'all')
-            OR (dat_src = '경상북도' AND :region = 'gb')
-        )
-        and pd_se in :period_unit_list
-        and :detail_period is not null
-    """
-    depth2_query = text(depth2_query_template)
-
-    depth2_query = depth2_query.bindparams(bindparam('region', expanding=False))
-    depth2_query = depth2_query.bindparams(bindparam('period_unit_list', expanding=True))
-
-    depth2_result = db.execute(depth2_query, {'year': year,
-                                              'region': region,
-                                              'period_unit_list': period_unit_list,
-                                              'detail_period': get_detail_filter_condition(period_unit, detail_period)
-                                              })
-
-    for row in depth2_result:
-        result[row.clsf_cd]["children"].append(
-            {
-                row.dat_no: {
-                    "name": row.dat_nm,
-                    "order_index": row.indct_orr,
-                    "region_unit": row.rgn_se_nm
-                }
-            }
-        )
-
-    return result
+    return PERIOD_UNIT_COLUMNS.get(period_unit)
 
 
 def retrieve_variable_detail(id: str, db: Session):
-    query_template = """
-        select
-            a.dat_no,
-            (select  a1.cmmn_cd_nm from ggs_cmmn a1 where a.CLSF_CD = a1.cmmn_cd) as clsf_nm,
-            a.dat_nm,
-            (select  a1.cmmn_cd_nm from ggs_cmmn a1 where a.RGN_SE = a1.cmmn_cd) as rgn_nm,
-            (select  a1.cmmn_cd_nm from ggs_cmmn a1 where a.PD_SE = a1.cmmn_cd) as pd_nm,
-            a.REL_DAT_LIST_NM,
-            a.REL_TBL_NM,   
-            a.REL_FILD_NM,
-            a.DAT_SRC,
-            a.UPDT_CYLE,
-            a.DAT_SCOP_BGNG,
-            a.DAT_SCOP_END,
-            a.last_mdfcn_dt
-        from GGS_DATA_INFO a
-        where
-            USE_YN = 'Y'
-            and dat_no='{id}'
-        order by a.dat_no;
-    """.format(id=id)
-
-    query = db.execute(text(query_template))
+    query = db.execute(queries.VARIABLE_DETAIL, {"id": id})
     return query.first()
 
 
-def retrieve_variable_chart_data(id: str, year: str, period_unit: str, detail_period, chart_type, db: Session):
+def retrieve_variable_chart_data(id: str, year: str, period_unit: str, detail_period, chart_type, db: Session,
+                                 bins: Literal["fixed", "sturges", "fd"] = "fixed", num_bins: int = 100):
     column = get_detail_filter_condition(period_unit, detail_period)
+    statis_replica.refresh(db)
 
-    query_template = """
-        select 
-            stat.{column}::integer,
-            stdg.stdg_nm 
-        from 
-            ggs_statis stat
-        left join 
-            ggs_stdg stdg
-        on 
-            stat.stdg_cd = stdg.stdg_cd 
-        where 
-            dat_no=:id
-        and
-            stat.yr=:year
-        and stat.{column}::integer is not null
-    """.format(column=column)
-
-    params = {
-        "year": year,
-        "id": id
-    }
+    if chart_type == "histogram" and HISTOGRAM_BINNING_ENGINE == "sql" and not statis_replica.ready:
+        # 원본 행을 가져오지 않고 DB에서 구간별 개수만 집계한다
+        chart_data = retrieve_histogram_data_by_sql(id, year, column, bins, num_bins, db)
+    else:
+        db_result = fetch_chart_rows(id, year, column, db)
 
-    query = text(query_template)
-    db_result = db.execute(query, params).fetchall()
+        if chart_type == "histogram":
+            chart_data = get_histogram_data([row[0] for row in db_result], bins, num_bins) if db_result else []
+        else:
+            chart_data = [{"value": ele[0], "name": ele[1]} for ele in db_result]
 
-    if len(db_result) == 0:
+    if len(chart_data) == 0:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="해당 ID의 데이터가 없습니다.")
 
-    dat_nm = db.execute(text("select dat_nm from ggs_data_info gdi where dat_no=:id"), {"id": id}).first()[0]
+    dat_nm = statis_replica.get_data_name(id) if statis_replica.ready else \
+        db.execute(queries.DATA_NAME, {"id": id}).first()[0]
 
     if chart_type == "pie":
         return {
             "name": '{}년 {} 파이차트'.format(year, dat_nm),
             "type": 'pie',
-            "data": [{"value": ele[0], "name": ele[1]} for ele in db_result]
+            "data": chart_data
         }
 
     elif chart_type == "bar":
         return {
             "name": '{}년 {} 바 차트'.format(year, dat_nm),
             "type": 'bar',
-            "data": [{"value": ele[0], "name": ele[1]} for ele in db_result]
+            "data": chart_data
         }
 
     elif chart_type == "histogram":
-        histogram_data = get_histogram_data([db_result[i][0] for i in range(len(db_result))])
         return {
             "name": '{}년 {} 히스토그램'.format(year, dat_nm),
             "type": 'bar',
-            "data": histogram_data
+            "data": chart_data
         }
 
 
-def get_histogram_data(data):
-    data = sorted(data)
+def fetch_chart_rows(id: str, year: str, column: str, db: Session) -> list:
+    """
+    변수 하나의 (정수 값, 지역명) 목록. 로컬 복제본이 있으면 DB 대신 복제본에서 읽는다
+    """
+    if statis_replica.ready:
+        return statis_replica.get_chart_rows(id, year, column)
+    return db.execute(get_statis_query(queries.CHART_DATA, column), {"year": year, "id": id}).fetchall()
+
+
+def get_histogram_bin_edges(bins: Literal["fixed", "sturges", "fd"], num_bins: int, count: int,
+                            data_min: float, data_max: float, iqr: float = None) -> np.ndarray:
+    """
+    numpy.histogram_bin_edges와 같은 규칙으로 구간 경계를 계산한다.
+    원본 데이터 없이 개수, 최솟값, 최댓값, 사분위범위만으로 계산하므로 DB에서 집계한 값으로도 사용할 수 있다.
+    :param bins: fixed - num_bins개, sturges - log2(n) + 1개, fd - 폭 2 * IQR / n^(1/3) (Freedman–Diaconis)
+    구간 수는 HISTOGRAM_MAX_BINS개를 넘지 않는다. (사분위범위가 매우 좁고 이상치가 있으면 fd의 구간 수가 끝없이 커진다)
+    """
+    if data_min == data_max:
+        data_min, data_max = data_min - 0.5, data_max + 0.5
+    data_range = data_max - data_min
 
-    num_bins = 100
-    data_min = min(data)
-    data_max = max(data)
-    bin_width = (data_max - data_min) // num_bins
+    if bins == "fixed":
+        n_bins = num_bins
+    elif bins == "sturges":
+        n_bins = int(np.ceil(np.log2(count) + 1))
+    elif bins == "fd":
+        width = 2.0 * iqr * count ** (-1.0 / 3.0)
+        n_bins = int(np.ceil(data_range / width)) if width > 0 else 1
+    else:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="지원하지 않는 구간 설정입니다.")
 
-    bins = [0] * num_bins
+    return np.linspace(data_min, data_max, min(n_bins, HISTOGRAM_MAX_BINS) + 1)
 
-    for d in data:
-        bin_index = min(int((d - data_min) // bin_width), num_bins - 1)
-        bins[bin_index] += 1
 
-    histogram_data = []
-    for i in range(num_bins):
-        x_position = data_min + (bin_width * i) + int(bin_width / 2)  # Use the midpoint of the bin
-        histogram_data.append({
-            "x_axis": x_position,
-            "count": bins[i]
-        })
-    return histogram_data
+def get_histogram_data(data, bins: Literal["fixed", "sturges", "fd"] = "fixed", num_bins: int = 100) -> List[dict]:
+    data = np.asarray(data, dtype="float64")
+    q1, q3 = np.percentile(data, [25, 75]) if bins == "fd" else (None, None)
+    edges = get_histogram_bin_edges(bins, num_bins, len(data), data.min(), data.max(),
+                                    q3 - q1 if bins == "fd" else None)
+    counts, _ = np.histogram(data, bins=edges)
 
+    return format_histogram_data(edges, counts)
 
-def retrieve_filter_list(db: Session):
-    distinct_years = db.query(distinct(GgsStatis.yr)).order_by(GgsStatis.yr).all()
-    years = [year[0] for year in distinct_years]
 
-    return {
-        "year": years,
-        "period_unit": ["year", "half", "quarter", "month"],
-        "detail_period": {
-            "year": ["all"],
-            "half": ["1", "2"],
-            "quarter": ["1", "2", "3", "4"],
-            "month": ["1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12"]
-        }
-    }
+def format_histogram_data(edges: np.ndarray, counts: np.ndarray) -> List[dict]:
+    midpoints = (edges[:-1] + edges[1:]) / 2
+    return [
+        {"x_axis": float(x_position), "bin_start": float(start), "bin_end": float(end), "count": int(count)}
+        for x_position, start, end, count in zip(midpoints, edges[:-1], edges[1:], counts)
+    ]
+
+
+def retrieve_histogram_data_by_sql(id: str, year: str, column: str, bins: Literal["fixed", "sturges", "fd"],
+                                   num_bins: int, db: Session) -> List[dict]:
+    """
+    구간 경계 계산에 필요한 통계량과 구간별 개수(width_bucket)를 DB에서 집계한다 (postgresql 전용)
+    """
+    params = {"id": id, "year": year}
+    statistics = db.execute(get_statis_query(queries.HISTOGRAM_STATISTICS, column), params).first()
+
+    count, data_min, data_max, iqr = statistics
+    if count == 0:
+        return []
+
+    edges = get_histogram_bin_edges(bins, num_bins, count, data_min, data_max, iqr)
+    bucket_params = {**params, "low": float(edges[0]), "high": float(edges[-1]), "n_bins": len(edges) - 1}
+    buckets = db.execute(get_statis_query(queries.HISTOGRAM_BUCKETS, column), bucket_params).fetchall()
+
+    # width_bucket은 최댓값을 n_bins + 1번 구간에 넣으므로 numpy와 같이 마지막 구간에 포함시킨다
+    counts = np.zeros(len(edges) - 1, dtype="int64")
+    for bucket, bucket_count in buckets:
+        counts[min(max(bucket, 1), len(counts)) - 1] += bucket_count
+
+    return format_histogram_data(edges, counts)
+
+
+def check_year_range(year: str, year_end: str = None) -> str:
+    if year_end is None:
+        return year
+    if year_end < year:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="종료 연도는 시작 연도보다 빠를 수 없습니다.")
+    return year_end
+
+
+def get_panel_period_list(period_unit, detail_period, detail_period_list: List[str] = None) -> List[str]:
+    """
+    detail_period_list가 있으면 그 기간들, 없으면 detail_period의 기간 컬럼 목록 (중복 제거, 순서 유지)
+    """
+    detail_period_list = detail_period_list or [detail_period]
+    return list(dict.fromkeys(get_detail_filter_condition(period_unit, period) for period in detail_period_list))
 
 
 def get_pivoted_df(variable_list: List[str],
                    year: str,
                    period_unit: Literal["year", "month", "quarter", "half"],
                    detail_period: Literal["all", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12"],
-                   db: Session
+                   db: Session,
+                   year_end: str = None,
+                   detail_period_list: List[str] = None,
+                   max_variables: int = None,
+                   data_version: str = None
                    ):
-    if len(variable_list) > 10:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="variable list의 최대 개수는 10개입니다.")
-
-    value_period_list = get_detail_filter_condition(period_unit, detail_period)
-
-    query_template = """
-        SELECT
-            stat.stdg_cd,
-            stat.yr,
-            stat.dat_no,
-            info.dat_nm,
-            stdg.stdg_nm,
-            stat.jan,
-            stat.feb,
-            stat.mar,
-            stat.apr,
-            stat.may,
-            stat.jun,
-            stat.july,
-            stat.aug,
-            stat.sep,
-            stat.oct,
-            stat.nov,
-            stat.dec,
-            stat.qu_1,
-            stat.qu_2,
-            stat.qu_3,
-            stat.qu_4,
-            stat.ht_1,
-            stat.ht_2,
-            stat.yr_vl
-        FROM ggs_statis stat
-        JOIN ggs_data_info info ON stat.dat_no = info.dat_no
-        JOIN ggs_stdg stdg ON stat.stdg_cd = stdg.stdg_cd 
-        WHERE stat.dat_no IN ({})
-        AND yr='{}'
     """
-    placeholders = ', '.join([':param{}'.format(i) for i in range(len(variable_list))])
-    query = text(query_template.format(placeholders, year))
-    params = {f'param{i}': value for i, value in enumerate(variable_list)}
-    result = db.execute(query, params)
-
-    df = pd.DataFrame(result.fetchall(), columns=result.keys())
-    melted_df = pd.melt(df, id_vars=['yr', 'stdg_nm', 'dat_no', 'dat_nm'], value_vars=value_period_list)
-    pivoted_df = pd.pivot_table(melted_df, values='value', index=['yr', 'stdg_nm', 'variable'], columns='dat_no')
+    year_end나 detail_period_list를 지정하면 year~year_end 연도, 여러 기간의 데이터를 한 번에 조회하여
+    (yr, stdg_nm, variable) 행으로 이루어진 패널을 만든다.
+    STATIS_REPLICA_DIR로 로컬 복제본을 사용하면 DB 대신 복제본에서 읽는다.
+    :param max_variables: 변수 수 상한 (기본값 ANALYSIS_MAX_VARIABLES)
+    :param data_version: get_data_version의 값. 지정하면 pivot 결과를 pivot_frame_cache에 저장하고 재사용한다
+    """
+    max_variables = max_variables or ANALYSIS_MAX_VARIABLES
+    if len(variable_list) > max_variables:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="variable list의 최대 개수는 {}개입니다.".format(max_variables))
+
+    year_end = check_year_range(year, year_end)
+    value_period_list = get_panel_period_list(period_unit, detail_period, detail_period_list)
+    params = {'variable_list': list(variable_list), 'year': year, 'year_end': year_end}
+
+    # pivot 결과는 변수와 기간의 순서와 관계없으므로 정렬한 값으로 키를 만든다
+    frame_key = make_cache_key(sorted(set(variable_list)), year, year_end, period_unit, sorted(value_period_list))
+    if data_version is not None:
+        cached_frame = pivot_frame_cache.get(frame_key, data_version)
+        if cached_frame is not None:
+            pivoted_df, dat_no_dat_nm_dict = cached_frame
+            return pivoted_df, dict(dat_no_dat_nm_dict)
+
+    statis_replica.refresh(db)
+    if statis_replica.ready:
+        df = statis_replica.get_pivot_source(variable_list, year, year_end, value_period_list)
+    else:
+        # 요청한 기간 컬럼만 조회하고, 값이 없는 행은 어차피 pivot 결과에서 제외되므로 DB에서 거른다
+        if len(value_period_list) == 1:
+            result = db.execute(get_statis_query(queries.PIVOT_SOURCE, value_period_list[0]), params)
+        else:
+            result = db.execute(queries.PANEL_SOURCE[period_unit], params)
+        df = queries.fetch_statis_frame(result)
+
+    pivoted_df = pivot_statis_df(df, value_period_list)
 
     dat_no_dat_nm_dict = df.set_index('dat_no')['dat_nm'].to_dict()
+    if data_version is not None:
+        pivot_frame_cache.set(frame_key, data_version, pivoted_df, dict(dat_no_dat_nm_dict))
 
-    # pivoted_df.to_csv("analysis_module/dataset/data.csv")
-    # pivoted_df = pd.read_csv("analysis_module/dataset/data.csv")
+    return pivoted_df, dat_no_dat_nm_dict
 
-    _uuid = uuid.uuid4()
 
-    pivoted_df.to_csv("./data{}.csv".format(_uuid))
-    pivoted_df = pd.read_csv("./data{}.csv".format(_uuid))
-    os.remove("./data{}.csv".format(_uuid))
-    return pivoted_df, dat_no_dat_nm_dict
+def get_data_version(variable_list: List[str], year: str, db: Session, year_end: str = None) -> str:
+    """
+    분석 대상 데이터의 버전 토큰을 반환한다.
+    ggs_statis의 해당 변수/연도(year~year_end) 행의 최종 수정일시와 행 수로 만들며, 데이터가 수정되거나 삭제되면 값이 바뀐다.
+    로컬 복제본을 사용하면 복제본에 동기화된 데이터의 버전을 반환한다.
+    """
+    year_end = check_year_range(year, year_end)
+    statis_replica.refresh(db)
+    if statis_replica.ready:
+        return statis_replica.get_data_version(variable_list, year, year_end)
+
+    params = {'variable_list': list(variable_list), 'year': year, 'year_end': year_end}
+    last_mdfcn_dt, row_count = db.execute(queries.DATA_VERSION, params).first()
+    return "{}/{}".format(last_mdfcn_dt, row_count)
+
+
+def pivot_statis_df(df: pd.DataFrame, value_period_list: Union[str, List[str]]) -> pd.DataFrame:
+    """
+    ggs_statis 조회 결과를 분석 모듈이 사용하는 평탄화된 pivot 테이블로 변환한다.
+    pd.melt + pd.pivot_table 대신 NumPy로 long -> wide 변환을 수행하며,
+    기존 csv 왕복 결과와 동일한 행/컬럼 순서와 dtype을 유지한다. (중복 키는 평균, 값이 모두 없는 행/컬럼은 제외)
+    :param df: stat.yr, stat.dat_no, info.dat_nm, stdg.stdg_nm 및 기간 컬럼을 포함한 조회 결과
+    :param value_period_list: pivot 할 기간 컬럼명 또는 그 목록 ex) yr_vl
+    :return: yr, stdg_nm, variable, dat_no별 컬럼 순서의 DataFrame
+    """
+    if isinstance(value_period_list, str):
+        value_period_list = [value_period_list]
+
+    values = np.concatenate([df[column].to_numpy(dtype='float64', na_value=np.nan) for column in value_period_list])
+    yr = np.tile(df['yr'].to_numpy(dtype=object), len(value_period_list))
+    stdg_nm = np.tile(df['stdg_nm'].to_numpy(dtype=object), len(value_period_list))
+    dat_no = np.tile(df['dat_no'].to_numpy(dtype=object), len(value_period_list))
+    variable = np.repeat(np.array(value_period_list, dtype=object), len(df))
+
+    mask = ~np.isnan(values)
+    if not mask.any():
+        return pd.DataFrame(columns=['yr', 'stdg_nm', 'variable'], dtype='object')
+
+    values, yr, stdg_nm, dat_no, variable = values[mask], yr[mask], stdg_nm[mask], dat_no[mask], variable[mask]
+
+    # (yr, stdg_nm, variable) 조합을 pivot_table과 같은 사전순으로 정렬된 행 번호로 변환한다
+    yr_codes, yr_uniques = pd.factorize(yr, sort=True)
+    stdg_nm_codes, stdg_nm_uniques = pd.factorize(stdg_nm, sort=True)
+    variable_codes, variable_uniques = pd.factorize(variable, sort=True)
+    row_keys = (yr_codes * len(stdg_nm_uniques) + stdg_nm_codes) * len(variable_uniques) + variable_codes
+    row_uniques, row_codes = np.unique(row_keys, return_inverse=True)
+    column_codes, column_uniques = pd.factorize(dat_no, sort=True)
+
+    sums = np.zeros((len(row_uniques), len(column_uniques)))
+    counts = np.zeros((len(row_uniques), len(column_uniques)))
+    np.add.at(sums, (row_codes, column_codes), values)
+    np.add.at(counts, (row_codes, column_codes), 1)
+
+    with np.errstate(invalid='ignore'):
+        table = sums / counts
+
+    row_yr, row_rest = np.divmod(row_uniques, len(stdg_nm_uniques) * len(variable_uniques))
+    row_stdg_nm, row_variable = np.divmod(row_rest, len(variable_uniques))
+
+    flat_df = pd.DataFrame(table, columns=list(column_uniques))
+    # csv 왕복 시 read_csv가 추론하던 dtype과 동일하게 맞춘다 (yr: int64, 값 컬럼: float64)
+    flat_df.insert(0, 'yr', pd.to_numeric(yr_uniques[row_yr]))
+    flat_df.insert(1, 'stdg_nm', stdg_nm_uniques[row_stdg_nm])
+    flat_df.insert(2, 'variable', variable_uniques[row_variable])
+
+    return flat_df
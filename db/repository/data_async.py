@@ -0,0 +1,70 @@
+import asyncio
+import weakref
+from typing import Callable, Literal, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from db.repository.catalog import variable_catalog
+from db.repository.data import retrieve_variable_detail as _retrieve_variable_detail, \
+    retrieve_variable_chart_data as _retrieve_variable_chart_data
+
+# event loop별 카탈로그 첫 적재 lock
+_catalog_load_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = \
+    weakref.WeakKeyDictionary()
+
+
+async def run_with_db(fn: Callable, *args, db: Union[AsyncSession, Session], **kwargs):
+    """
+    동기 repository 함수를 event loop를 막지 않고 실행한다.
+    AsyncSession이면 run_sync로 async 드라이버 위에서, Session이면 threadpool에서 실행한다.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(lambda session: fn(*args, db=session, **kwargs))
+    return await run_in_threadpool(fn, *args, db=db, **kwargs)
+
+
+async def load_catalog(db: Union[AsyncSession, Session]) -> None:
+    """
+    카탈로그를 처음 읽을 때 AsyncSession의 요청은 asyncio.Lock으로 한 번에 하나만 읽는다.
+    run_sync는 event loop thread에서 실행되므로, 처음 읽는 요청이 DB 응답을 기다리는 동안 다른 요청이
+    카탈로그의 thread lock을 기다리면 event loop 전체가 멈춘다.
+    """
+    if variable_catalog.version is not None or not isinstance(db, AsyncSession):
+        return
+
+    loop = asyncio.get_running_loop()
+    lock = _catalog_load_locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        if variable_catalog.version is None:
+            await db.run_sync(variable_catalog.refresh)
+
+
+async def retrieve_variable_list(year: str,
+                                 region: Literal["all", "gsbd"],
+                                 period_unit: Literal["year", "month", "quarter", "half"],
+                                 detail_period: Literal["all", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11",
+                                                        "12"],
+                                 db: Union[AsyncSession, Session]):
+    """
+    :return: (ETag, 1,2 depth 형태의 카탈로그 목록)
+    """
+    await load_catalog(db)
+    return await run_with_db(variable_catalog.get_variable_list, year, region, period_unit, detail_period, db=db)
+
+
+async def retrieve_variable_detail(id: str, db: Union[AsyncSession, Session]):
+    return await run_with_db(_retrieve_variable_detail, id, db=db)
+
+
+async def retrieve_variable_chart_data(id: str, year: str, period_unit: str, detail_period, chart_type,
+                                       db: Union[AsyncSession, Session],
+                                       bins: Literal["fixed", "sturges", "fd"] = "fixed", num_bins: int = 100):
+    return await run_with_db(_retrieve_variable_chart_data, id, year, period_unit, detail_period, chart_type, db=db,
+                             bins=bins, num_bins=num_bins)
+
+
+async def retrieve_filter_list(db: Union[AsyncSession, Session]):
+    await load_catalog(db)
+    return await run_with_db(variable_catalog.get_filter_list, db=db)
@@ -0,0 +1,195 @@
+"""
+ggs_statis 조회에 사용하는 SQL 모음
+
+모든 값은 bind parameter로 전달하고, SQL 문자열에 들어가는 기간 컬럼명은 STATIS_VALUE_COLUMNS에 있는 것만 허용한다.
+statement는 import 시점에 한 번만 만들어 두므로 SQL 문자열이 요청마다 같아지고,
+SQLAlchemy의 compiled cache와 드라이버/Postgres의 prepared statement를 재사용할 수 있다.
+"""
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Result
+from sqlalchemy.sql.elements import TextClause
+
+STATIS_VALUE_COLUMNS = ["jan", "feb", "mar", "apr", "may", "jun", "july", "aug", "sep", "oct", "nov", "dec",
+                        "qu_1", "qu_2", "qu_3", "qu_4", "ht_1", "ht_2", "yr_vl"]
+
+PERIOD_UNIT_COLUMNS = {
+    "year": ["yr_vl"],
+    "month": ["jan", "feb", "mar", "apr", "may", "jun", "july", "aug", "sep", "oct", "nov", "dec"],
+    "quarter": ["qu_1", "qu_2", "qu_3", "qu_4"],
+    "half": ["ht_1", "ht_2"]
+}
+
+
+def check_statis_column(column: str) -> str:
+    if column not in STATIS_VALUE_COLUMNS:
+        raise ValueError("not allowed period column : {}".format(column))
+    return column
+
+
+def _build_per_column(build: Callable[[str], TextClause]) -> Dict[str, TextClause]:
+    return {column: build(column) for column in STATIS_VALUE_COLUMNS}
+
+
+def get_statis_query(queries: Dict[str, TextClause], column: str) -> TextClause:
+    return queries[check_statis_column(column)]
+
+
+def select_statis_value(column: str) -> str:
+    # numeric 값은 드라이버가 Decimal 객체로 만들므로 DB에서 float8로 바꿔 가져온다
+    return "CAST(stat.{0} AS double precision) AS {0}".format(check_statis_column(column))
+
+
+def fetch_statis_frame(result: Result) -> pd.DataFrame:
+    """
+    조회 결과를 컬럼 단위로 DataFrame으로 만든다.
+    기간 컬럼(STATIS_VALUE_COLUMNS)은 object 컬럼을 거치지 않고 바로 float64 배열(값이 없으면 NaN)로 만든다.
+    """
+    columns = list(result.keys())
+    rows = result.fetchall()
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+
+    return pd.DataFrame({
+        column: np.array(column_values, dtype="float64" if column in STATIS_VALUE_COLUMNS else object)
+        for column, column_values in zip(columns, values)
+    }, columns=columns)
+
+
+VARIABLE_DETAIL = text("""
+    select
+        a.dat_no,
+        (select  a1.cmmn_cd_nm from ggs_cmmn a1 where a.CLSF_CD = a1.cmmn_cd) as clsf_nm,
+        a.dat_nm,
+        (select  a1.cmmn_cd_nm from ggs_cmmn a1 where a.RGN_SE = a1.cmmn_cd) as rgn_nm,
+        (select  a1.cmmn_cd_nm from ggs_cmmn a1 where a.PD_SE = a1.cmmn_cd) as pd_nm,
+        a.REL_DAT_LIST_NM,
+        a.REL_TBL_NM,
+        a.REL_FILD_NM,
+        a.DAT_SRC,
+        a.UPDT_CYLE,
+        a.DAT_SCOP_BGNG,
+        a.DAT_SCOP_END,
+        a.last_mdfcn_dt
+    from GGS_DATA_INFO a
+    where
+        USE_YN = 'Y'
+        and dat_no=:id
+    order by a.dat_no
+""")
+
+DATA_NAME = text("select dat_nm from ggs_data_info gdi where dat_no=:id")
+
+CHART_DATA = _build_per_column(lambda column: text("""
+    select
+        CAST(stat.{column} AS integer),
+        stdg.stdg_nm
+    from
+        ggs_statis stat
+    left join
+        ggs_stdg stdg
+    on
+        stat.stdg_cd = stdg.stdg_cd
+    where
+        dat_no=:id
+    and
+        stat.yr=:year
+    and stat.{column} is not null
+""".format(column=column)))
+
+HISTOGRAM_STATISTICS = _build_per_column(lambda column: text("""
+    SELECT
+        count(stat.{column}),
+        min(stat.{column})::float8,
+        max(stat.{column})::float8,
+        (percentile_cont(0.75) WITHIN GROUP (ORDER BY stat.{column}::float8)
+         - percentile_cont(0.25) WITHIN GROUP (ORDER BY stat.{column}::float8))
+    FROM ggs_statis stat
+    WHERE stat.dat_no = :id
+    AND stat.yr = :year
+    AND stat.{column} IS NOT NULL
+""".format(column=column)))
+
+HISTOGRAM_BUCKETS = _build_per_column(lambda column: text("""
+    SELECT width_bucket(stat.{column}::float8, :low, :high, :n_bins) AS bucket, count(*)
+    FROM ggs_statis stat
+    WHERE stat.dat_no = :id
+    AND stat.yr = :year
+    AND stat.{column} IS NOT NULL
+    GROUP BY bucket
+""".format(column=column)))
+
+PIVOT_SOURCE = _build_per_column(lambda column: text("""
+    SELECT
+        stat.yr,
+        stat.dat_no,
+        info.dat_nm,
+        stdg.stdg_nm,
+        {value}
+    FROM ggs_statis stat
+    JOIN ggs_data_info info ON stat.dat_no = info.dat_no
+    JOIN ggs_stdg stdg ON stat.stdg_cd = stdg.stdg_cd
+    WHERE stat.dat_no IN :variable_list
+    AND stat.yr BETWEEN :year AND :year_end
+    AND stat.{column} IS NOT NULL
+""".format(column=column, value=select_statis_value(column))).bindparams(bindparam('variable_list', expanding=True)))
+
+# 여러 기간을 한 번에 pivot 할 때 사용하는 기간 단위별 조회 (기간 컬럼 중 하나라도 값이 있는 행)
+PANEL_SOURCE = {period_unit: text("""
+    SELECT
+        stat.yr,
+        stat.dat_no,
+        info.dat_nm,
+        stdg.stdg_nm,
+        {columns}
+    FROM ggs_statis stat
+    JOIN ggs_data_info info ON stat.dat_no = info.dat_no
+    JOIN ggs_stdg stdg ON stat.stdg_cd = stdg.stdg_cd
+    WHERE stat.dat_no IN :variable_list
+    AND stat.yr BETWEEN :year AND :year_end
+    AND ({not_null})
+""".format(columns=", ".join(select_statis_value(column) for column in columns),
+           not_null=" OR ".join("stat.{} IS NOT NULL".format(column) for column in columns))
+).bindparams(bindparam('variable_list', expanding=True)) for period_unit, columns in PERIOD_UNIT_COLUMNS.items()}
+
+DATA_VERSION = text("""
+    SELECT max(last_mdfcn_dt), count(*)
+    FROM ggs_statis
+    WHERE dat_no IN :variable_list
+    AND yr BETWEEN :year AND :year_end
+""").bindparams(bindparam('variable_list', expanding=True))
+
+STATIS_AVAILABILITY = text("""
+    SELECT yr, dat_no, {counts}
+    FROM ggs_statis
+    WHERE yr IN :years
+    GROUP BY yr, dat_no
+""".format(counts=", ".join('count("{0}") AS "{0}"'.format(column) for column in STATIS_VALUE_COLUMNS))
+).bindparams(bindparam('years', expanding=True))
+
+# 로컬 복제본(db.repository.replica)의 동기화에 사용하는 조회 (전체, 수정일시 이후 변경분, 한 연도)
+_REPLICA_COLUMNS = ", ".join(["stat.yr", "stat.stdg_cd", "stat.dat_no"]
+                             + [select_statis_value(column) for column in STATIS_VALUE_COLUMNS]
+                             + ["stat.last_mdfcn_dt"])
+
+REPLICA_ROWS = text("SELECT {columns} FROM ggs_statis stat".format(columns=_REPLICA_COLUMNS))
+
+REPLICA_CHANGED_ROWS = text("""
+    SELECT {columns}
+    FROM ggs_statis stat
+    WHERE stat.last_mdfcn_dt >= :since
+""".format(columns=_REPLICA_COLUMNS))
+
+REPLICA_YEAR_ROWS = text("""
+    SELECT {columns}
+    FROM ggs_statis stat
+    WHERE stat.yr = :year
+""".format(columns=_REPLICA_COLUMNS))
+
+REPLICA_YEAR_COUNTS = text("SELECT yr, count(*) FROM ggs_statis GROUP BY yr")
+
+REPLICA_STDG_NAMES = text("SELECT stdg_cd, stdg_nm FROM ggs_stdg")
+
+REPLICA_DATA_NAMES = text("SELECT dat_no, dat_nm FROM ggs_data_info")
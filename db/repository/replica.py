@@ -0,0 +1,352 @@
+import contextlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from db.repository import queries
+from db.repository.queries import STATIS_VALUE_COLUMNS
+from utils.logging_module import logger
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = ".lock"
+PARTITION_COLUMNS = ["stdg_cd", "dat_no"] + STATIS_VALUE_COLUMNS + ["last_mdfcn_dt"]
+
+
+def to_partition_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    ggs_statis 조회 결과를 복제본에 저장하는 dtype으로 바꾼다
+    (yr, stdg_cd, dat_no: 고정 길이 문자열, 기간 컬럼: float64(값이 없으면 NaN), last_mdfcn_dt: datetime64)
+    """
+    data = {column: np.array(df[column].astype(str).to_list(), dtype=str) for column in ["yr", "stdg_cd", "dat_no"]}
+    for column in STATIS_VALUE_COLUMNS:
+        data[column] = df[column].to_numpy(dtype="float64", na_value=np.nan)
+    data["last_mdfcn_dt"] = pd.to_datetime(df["last_mdfcn_dt"], format="ISO8601").to_numpy(dtype="datetime64[us]")
+    return pd.DataFrame(data)
+
+
+def fetch_statis_rows(db: Session, since: str = None, year: str = None) -> pd.DataFrame:
+    """
+    :param since: 지정하면 최종 수정일시가 since 이후인 행만 조회한다
+    :param year: 지정하면 해당 연도의 행만 조회한다
+    """
+    if year is not None:
+        result = db.execute(queries.REPLICA_YEAR_ROWS, {"year": year})
+    elif since is not None:
+        result = db.execute(queries.REPLICA_CHANGED_ROWS, {"since": pd.Timestamp(since).to_pydatetime()})
+    else:
+        result = db.execute(queries.REPLICA_ROWS)
+    return to_partition_frame(queries.fetch_statis_frame(result))
+
+
+def fetch_year_counts(db: Session) -> Dict[str, int]:
+    return {str(row[0]): row[1] for row in db.execute(queries.REPLICA_YEAR_COUNTS)}
+
+
+def fetch_names(db: Session) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    :return: (stdg_cd별 stdg_nm, dat_no별 dat_nm)
+    """
+    stdg_nm = {row[0]: row[1] for row in db.execute(queries.REPLICA_STDG_NAMES)}
+    dat_nm = {row[0]: row[1] for row in db.execute(queries.REPLICA_DATA_NAMES)}
+    return stdg_nm, dat_nm
+
+
+def get_last_modified(df: pd.DataFrame) -> Optional[str]:
+    last_mdfcn_dt = df["last_mdfcn_dt"].max() if len(df) else pd.NaT
+    return None if pd.isna(last_mdfcn_dt) else str(last_mdfcn_dt)
+
+
+class StatisPartition:
+    """
+    복제본의 한 연도(yr) 파티션. 컬럼마다 .npy 파일 하나를 memory-map으로 연다.
+    행은 (dat_no, stdg_cd) 순으로 정렬되어 있어 한 변수의 행은 연속된 구간이고, 구간을 잘라도 복사되지 않는다.
+    """
+
+    def __init__(self, path: str, variables: Dict[str, list]):
+        self.path: str = path
+        # dat_no별 [시작 행, 끝 행, 최종 수정일시]
+        self.variables: Dict[str, list] = variables
+        self.columns: Dict[str, np.ndarray] = {
+            column: np.load(os.path.join(path, column + ".npy"), mmap_mode="r") for column in PARTITION_COLUMNS
+        }
+
+    @property
+    def rows(self) -> int:
+        return len(self.columns["dat_no"])
+
+    @classmethod
+    def write(cls, path: str, df: pd.DataFrame) -> "StatisPartition":
+        df = df.sort_values(["dat_no", "stdg_cd"], ignore_index=True)
+        os.makedirs(path)
+        for column in PARTITION_COLUMNS:
+            values = df[column].to_numpy()
+            # object 배열은 memory-map으로 열 수 없으므로 고정 길이 문자열로 저장한다
+            np.save(os.path.join(path, column + ".npy"), values.astype(str) if values.dtype == object else values)
+
+        dat_no_list, starts, counts = np.unique(df["dat_no"].to_numpy(dtype=str), return_index=True,
+                                                return_counts=True)
+        last_mdfcn_dt = df.groupby("dat_no", sort=True)["last_mdfcn_dt"].max()
+        variables = {
+            dat_no: [int(start), int(start + count), None if pd.isna(last) else str(last)]
+            for dat_no, start, count, last in zip(dat_no_list.tolist(), starts, counts, last_mdfcn_dt)
+        }
+        return cls(path, variables)
+
+    def get_slice(self, dat_no: str) -> Optional[slice]:
+        entry = self.variables.get(dat_no)
+        return None if entry is None else slice(entry[0], entry[1])
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({column: np.array(self.columns[column]) for column in PARTITION_COLUMNS})
+
+
+class StatisReplica:
+    """
+    ggs_statis를 root 디렉터리에 연도별 컬럼 파일(.npy)로 복제해 두고, 분석과 차트 데이터를 DB 대신 여기서 읽는다.
+    refresh_interval마다 최종 수정일시(last_mdfcn_dt)가 마지막 동기화 이후인 행만 가져와 바뀐 연도의 파티션만 다시 쓰고,
+    행 삭제는 수정일시로 알 수 없으므로 연도별 행 수가 DB와 다르면 그 연도를 다시 읽는다.
+    파티션은 새 디렉터리에 쓴 뒤 manifest.json을 교체하므로 읽는 쪽은 이전 파티션을 끝까지 읽을 수 있고,
+    여러 프로세스가 같은 root를 쓰면 파일 lock으로 한 프로세스씩 동기화한다. root가 없으면 사용하지 않는다.
+    """
+
+    def __init__(self, root: str = None, refresh_interval: float = 60, clock: Callable[[], float] = time.time):
+        self.root: Optional[str] = root
+        self.refresh_interval: float = refresh_interval
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.sync_lock = threading.Lock()
+        self.checked_at: float = None
+
+        self.manifest_id: Optional[str] = None
+        self.synced_until: Optional[str] = None
+        self.partitions: Dict[str, StatisPartition] = {}
+        self.stdg_nm: Dict[str, str] = {}
+        self.dat_nm: Dict[str, str] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    @property
+    def ready(self) -> bool:
+        """
+        한 번 이상 동기화되어 읽을 수 있는 상태인지
+        """
+        return self.manifest_id is not None
+
+    def refresh(self, db: Session, force: bool = False) -> None:
+        if not self.enabled:
+            return
+
+        with self.lock:
+            if not force and self.checked_at is not None and self.clock() - self.checked_at < self.refresh_interval:
+                return
+            self.checked_at = self.clock()
+
+        # 다른 요청이 동기화 중이면 기다리지 않고 지금 가진 복제본을 읽는다
+        if not self.sync_lock.acquire(blocking=force):
+            return
+        try:
+            with self._file_lock():
+                self._load_manifest()
+                self._sync(db)
+        finally:
+            self.sync_lock.release()
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, LOCK_FILE), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_manifest(self) -> None:
+        """
+        다른 프로세스가 먼저 동기화했으면 그 manifest를 읽어 온다
+        """
+        path = os.path.join(self.root, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest["id"] == self.manifest_id:
+            return
+
+        partitions = {}
+        for year, partition in manifest["partitions"].items():
+            current = self.partitions.get(year)
+            path = os.path.join(self.root, partition["path"])
+            partitions[year] = current if current is not None and current.path == path else \
+                StatisPartition(path, partition["variables"])
+
+        with self.lock:
+            self.manifest_id = manifest["id"]
+            self.synced_until = manifest["synced_until"]
+            self.partitions = partitions
+            self.stdg_nm, self.dat_nm = manifest["stdg_nm"], manifest["dat_nm"]
+
+    def _sync(self, db: Session) -> None:
+        # 마지막 동기화 시각과 같은 시각에 수정되어 그 뒤에 커밋된 행도 있으므로 그 시각의 행부터(>=) 다시 가져온다
+        changes = fetch_statis_rows(db, since=self.synced_until)
+        year_counts = fetch_year_counts(db)
+        stdg_nm, dat_nm = fetch_names(db)
+
+        frames = {}
+        for year, rows in changes.groupby("yr", sort=True):
+            rows = rows.drop(columns="yr")
+            current = self.partitions.get(year)
+            if current is not None:
+                current_rows = current.to_frame()
+                rows = pd.concat([current_rows, rows]).drop_duplicates(["dat_no", "stdg_cd"], keep="last")
+                rows = rows.sort_values(["dat_no", "stdg_cd"], ignore_index=True)
+                # 이미 반영한 행만 다시 가져온 연도는 파티션을 다시 쓰지 않는다
+                if rows.equals(current_rows):
+                    continue
+            frames[year] = rows
+
+        last_modified_list = [self.synced_until, get_last_modified(changes)]
+        for year, count in year_counts.items():
+            rows = len(frames[year]) if year in frames else \
+                self.partitions[year].rows if year in self.partitions else None
+            if rows != count:
+                frames[year] = fetch_statis_rows(db, year=year).drop(columns="yr")
+                last_modified_list.append(get_last_modified(frames[year]))
+
+        removed_years = [year for year in self.partitions if year not in year_counts]
+        if self.ready and not frames and not removed_years and (stdg_nm, dat_nm) == (self.stdg_nm, self.dat_nm):
+            return
+
+        partitions = {year: partition for year, partition in self.partitions.items() if year not in removed_years}
+        for year, rows in frames.items():
+            partitions[year] = StatisPartition.write(os.path.join(self.root, "yr=" + year, uuid.uuid4().hex), rows)
+
+        synced_until = max((value for value in last_modified_list if value is not None), default=None)
+        manifest = {
+            "id": uuid.uuid4().hex,
+            "synced_until": synced_until,
+            "partitions": {
+                year: {"path": os.path.relpath(partition.path, self.root), "variables": partition.variables}
+                for year, partition in sorted(partitions.items())
+            },
+            "stdg_nm": stdg_nm,
+            "dat_nm": dat_nm
+        }
+        manifest_path = os.path.join(self.root, MANIFEST_FILE)
+        with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+        with self.lock:
+            self.manifest_id = manifest["id"]
+            self.synced_until = synced_until
+            self.partitions = partitions
+            self.stdg_nm, self.dat_nm = stdg_nm, dat_nm
+
+        self._remove_unused_partitions()
+        logger.info("statis replica synced : {} (until {})".format(sorted(frames), synced_until))
+
+    def _remove_unused_partitions(self) -> None:
+        # 이미 연 memory-map은 파일을 지워도 그대로 읽을 수 있다
+        used = {partition.path for partition in self.partitions.values()}
+        for name in os.listdir(self.root):
+            year_dir = os.path.join(self.root, name)
+            if not name.startswith("yr=") or not os.path.isdir(year_dir):
+                continue
+            for partition_name in os.listdir(year_dir):
+                if os.path.join(year_dir, partition_name) not in used:
+                    shutil.rmtree(os.path.join(year_dir, partition_name), ignore_errors=True)
+            if not os.listdir(year_dir):
+                os.rmdir(year_dir)
+
+    def _snapshot(self) -> Tuple[Dict[str, StatisPartition], Dict[str, str], Dict[str, str]]:
+        with self.lock:
+            return self.partitions, self.stdg_nm, self.dat_nm
+
+    def get_pivot_source(self, variable_list: List[str], year: str, year_end: str,
+                         value_period_list: List[str]) -> pd.DataFrame:
+        """
+        queries.PIVOT_SOURCE, PANEL_SOURCE와 같은 결과 (yr, dat_no, dat_nm, stdg_nm, 기간 컬럼)를 만든다.
+        변수별 구간을 memory-map에서 잘라 필요한 행만 한 번 복사한다.
+        """
+        partitions, stdg_nm, dat_nm = self._snapshot()
+        slices = [(year_key, partitions[year_key], partitions[year_key].get_slice(dat_no))
+                  for year_key in sorted(partitions) if year <= year_key <= year_end
+                  for dat_no in dict.fromkeys(variable_list) if dat_no in dat_nm]
+        slices = [(year_key, partition, rows) for year_key, partition, rows in slices if rows is not None]
+
+        def concat(column: str) -> np.ndarray:
+            return np.concatenate([partition.columns[column][rows] for _, partition, rows in slices]) \
+                if slices else np.empty(0, dtype="float64" if column in STATIS_VALUE_COLUMNS else str)
+
+        df = pd.DataFrame({
+            "yr": np.repeat([year_key for year_key, _, _ in slices], [rows.stop - rows.start for _, _, rows in slices]),
+            "dat_no": concat("dat_no"),
+            "stdg_cd": concat("stdg_cd"),
+            **{column: concat(column) for column in value_period_list}
+        })
+        df.insert(2, "dat_nm", df["dat_no"].map(dat_nm))
+        df.insert(3, "stdg_nm", df.pop("stdg_cd").map(stdg_nm))
+
+        # DB 조회와 같이 지역명이 없는 행(inner join)과 기간 값이 모두 없는 행은 제외한다
+        mask = df["stdg_nm"].notna() & df[value_period_list].notna().any(axis=1)
+        return df[mask].reset_index(drop=True)
+
+    def get_chart_rows(self, id: str, year: str, column: str) -> List[Tuple[int, Optional[str]]]:
+        """
+        queries.CHART_DATA와 같은 (정수 값, 지역명) 목록
+        """
+        partitions, stdg_nm, _ = self._snapshot()
+        partition = partitions.get(year)
+        rows = partition.get_slice(id) if partition is not None else None
+        if rows is None:
+            return []
+
+        values = partition.columns[column][rows]
+        mask = ~np.isnan(values)
+        stdg_cd_list = partition.columns["stdg_cd"][rows][mask].tolist()
+        return list(zip(np.rint(values[mask]).astype("int64").tolist(),
+                        [stdg_nm.get(stdg_cd) for stdg_cd in stdg_cd_list]))
+
+    def get_data_name(self, id: str) -> Optional[str]:
+        return self._snapshot()[2].get(id)
+
+    def get_data_version(self, variable_list: List[str], year: str, year_end: str) -> str:
+        """
+        db.repository.data.get_data_version과 같은 형식 (최종 수정일시/행 수)의 버전 토큰
+        """
+        partitions, _, _ = self._snapshot()
+        last_mdfcn_dt, row_count = None, 0
+        for year_key in sorted(partitions):
+            if not year <= year_key <= year_end:
+                continue
+            for dat_no in set(variable_list):
+                entry = partitions[year_key].variables.get(dat_no)
+                if entry is None:
+                    continue
+                row_count += entry[1] - entry[0]
+                if entry[2] is not None and (last_mdfcn_dt is None or entry[2] > last_mdfcn_dt):
+                    last_mdfcn_dt = entry[2]
+        return "{}/{}".format(last_mdfcn_dt, row_count)
+
+
+statis_replica = StatisReplica(root=getattr(settings, "STATIS_REPLICA_DIR", None),
+                               refresh_interval=getattr(settings, "STATIS_REPLICA_REFRESH_INTERVAL", 60))
@@ -1,22 +1,105 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from core.config import settings
+from db.pool import InstrumentedQueuePool
 
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
-print("Database URL is ",SQLALCHEMY_DATABASE_URL)
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# DB_ASYNC이면 데이터 조회 API가 async 엔진(asyncpg)을 사용한다
+DB_ASYNC = getattr(settings, "DB_ASYNC", False)
+
+
+def get_engine_options(database_url: str) -> dict:
+    """
+    pool 설정은 settings에서 읽는다
+    DB_POOL_SIZE: 유지할 커넥션 수, DB_MAX_OVERFLOW: 순간적으로 더 열 수 있는 커넥션 수,
+    DB_POOL_TIMEOUT: 커넥션을 기다리는 최대 시간(초), DB_POOL_RECYCLE: 커넥션을 다시 여는 주기(초),
+    DB_POOL_PRE_PING: checkout할 때 끊긴 커넥션인지 확인, DB_STATEMENT_TIMEOUT: 쿼리 최대 실행 시간(ms, postgresql)
+    """
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": getattr(settings, "DB_POOL_SIZE", 5),
+        "max_overflow": getattr(settings, "DB_MAX_OVERFLOW", 10),
+        "pool_timeout": getattr(settings, "DB_POOL_TIMEOUT", 30),
+        "pool_recycle": getattr(settings, "DB_POOL_RECYCLE", 1800),
+        "pool_pre_ping": getattr(settings, "DB_POOL_PRE_PING", True)
+    }
+
+    statement_timeout = getattr(settings, "DB_STATEMENT_TIMEOUT", None)
+    if statement_timeout and make_url(database_url).get_backend_name() == "postgresql":
+        options["connect_args"] = {"options": "-c statement_timeout={}".format(int(statement_timeout))}
+
+    return options
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **get_engine_options(SQLALCHEMY_DATABASE_URL))
 
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def get_async_database_url(database_url: str) -> str:
+    """
+    ASYNC_DATABASE_URL이 없으면 DATABASE_URL의 postgresql 드라이버를 asyncpg로 바꿔 사용한다
+    """
+    async_database_url = getattr(settings, "ASYNC_DATABASE_URL", None)
+    if async_database_url:
+        return async_database_url
+
+    url = make_url(database_url)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+def create_async_db_engine(database_url: str) -> AsyncEngine:
+    options = get_engine_options(database_url)
+    options.pop("poolclass")
+    connect_args = options.pop("connect_args", None)
+    if connect_args and make_url(database_url).get_driver_name() == "asyncpg":
+        # asyncpg는 libpq의 options 대신 server_settings로 세션 설정을 전달한다
+        options["connect_args"] = {"server_settings": {"statement_timeout": connect_args["options"].split("=")[1]}}
+
+    return create_async_engine(database_url, **options)
+
+
+_async_engine: AsyncEngine = None
+_async_sessionmaker: async_sessionmaker = None
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    # async 드라이버는 DB_ASYNC를 켠 경우에만 필요하므로 첫 요청 때 엔진을 만든다
+    global _async_engine, _async_sessionmaker
+    if _async_sessionmaker is None:
+        _async_engine = create_async_db_engine(get_async_database_url(SQLALCHEMY_DATABASE_URL))
+        _async_sessionmaker = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_sessionmaker
+
+
+def get_pool_metrics() -> dict:
+    return InstrumentedQueuePool.metrics.snapshot(engine.pool)
+
+
 def get_db() -> Generator:   #new
     try:
         db = SessionLocal()
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator:
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+def get_data_db():
+    """
+    데이터 조회 API의 db dependency (DB_ASYNC 설정에 따라 AsyncSession 또는 Session)
+    """
+    return get_async_db if DB_ASYNC else get_db
@@ -2,15 +2,42 @@ from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from db.base import Base
-from db.session import engine
+from db.session import engine, SessionLocal
 from core.config import settings
 from apis.base import api_router
+from db.repository.analysis import ANALYSIS_EXECUTION_BACKEND, analysis_process_pool
+from db.repository.replica import statis_replica
+from utils.logging_module import logger
 
 
 def include_router(app):
     app.include_router(api_router)
 
 
+def register_process_pool(app):
+    # 분석 worker는 서버가 시작될 때 띄워 두고, 종료될 때 정리한다
+    if ANALYSIS_EXECUTION_BACKEND == "process":
+        app.add_event_handler("startup", analysis_process_pool.start)
+        app.add_event_handler("shutdown", analysis_process_pool.shutdown)
+
+
+def sync_statis_replica():
+    db = SessionLocal()
+    try:
+        statis_replica.refresh(db, force=True)
+    except Exception as e:
+        # 동기화하지 못해도 복제본이 준비될 때까지는 DB에서 읽으므로 서버는 그대로 시작한다
+        logger.error("statis replica sync failed : {}".format(e))
+    finally:
+        db.close()
+
+
+def register_statis_replica(app):
+    # 로컬 복제본은 서버가 시작될 때 동기화해 두고, 이후에는 요청이 들어올 때 refresh_interval마다 변경분만 반영한다
+    if statis_replica.enabled:
+        app.add_event_handler("startup", sync_statis_replica)
+
+
 # def create_tables():
 #     Base.metadata.create_all(bind=engine)
 
@@ -27,6 +54,8 @@ def start_application():
     )
 
     include_router(app)
+    register_process_pool(app)
+    register_statis_replica(app)
     return app
 
 
@@ -9,20 +9,40 @@ class AnalysisResult(BaseModel):
     title: str  # 결과물 이름
     format: str  # 결과물 포맷
     result: Any  # 결과물 (bas64 이미지, html 등의 string)
+    media_type: Optional[str] = None  # base64 이미지의 mime type ex) image/png
 
 
 class ShowAnalysis(BaseModel):
     """
     상관분석 결과를 반환하는 dto
-    모든 필드는 base64형 image
+    요청의 format에 따라 각 필드는 base64형 image 또는 json
     """
     data: List[AnalysisResult]
 
 
+class RenderOptions(BaseModel):
+    """
+    분석 결과 이미지의 렌더링 옵션
+    dpi, width, height(inch)는 서버 허용 범위를 넘으면 잘라서 적용된다.
+    preview가 true이면 썸네일 품질로 빠르게 그린다.
+    """
+    dpi: int = 300
+    width: Optional[float] = None
+    height: Optional[float] = None
+    image_format: Literal["png", "jpeg", "webp", "svg"] = "png"
+    preview: bool = False
+
+
 class BaseAnalysisInput(BaseModel):
     year: str
     period_unit: Literal["year", "month", "quarter", "half"]
     detail_period: Literal["all", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12"]
+    year_end: Optional[str] = None  # 지정하면 year~year_end 연도의 데이터를 하나의 패널로 분석
+    # 지정하면 detail_period 대신 여러 기간의 데이터를 하나의 패널로 분석 ex) ["1", "2", "3", "4"]
+    detail_period_list: Optional[List[Literal["all", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12"]]] = None
+    table_engine: Literal["matplotlib", "chromium"] = "matplotlib"  # 테이블 이미지 생성 방식 (chromium: dataframe_image)
+    format: Literal["base64", "json"] = "base64"  # 결과물 포맷 (json: 이미지 대신 수치 테이블을 json으로 반환)
+    render_options: RenderOptions = Field(default_factory=RenderOptions)
 
 
 class CreateCorrelation(BaseAnalysisInput):
@@ -38,8 +58,11 @@ class CreateCorrelation(BaseAnalysisInput):
     }
     """
     variable_list: List[str]
-    testing_side: str
-    valid_pvalue_accent: bool
+    testing_side: Literal["both", "greater", "less"]  # 상관계수 유의성 검정 방향 (양측, 양의 상관, 음의 상관)
+    valid_pvalue_accent: bool  # 유의한 상관계수를 히트맵에 별표로 강조할지 여부
+    # matrix: 변수가 많을 때 산점도행렬 대신 군집 정렬 히트맵과 상관계수 상위 top_k개 변수쌍을 반환
+    mode: Literal["pair_plot", "matrix"] = "pair_plot"
+    top_k: int = Field(20, ge=1, le=1000)
 
 
 class CreateRegression(BaseAnalysisInput):
@@ -50,15 +73,54 @@ class CreateRegression(BaseAnalysisInput):
     independent_variable_list: List[str]
 
 
+class CreateRegressionBatch(BaseAnalysisInput):
+    """
+    같은 독립변수로 여러 종속변수의 회귀분석을 한 번에 시행하기 위한 parameter dto
+
+    {
+        "dependent_variable_list": ["M020011", "M020012"],
+        "independent_variable_list": ["M020013", "M020014"],
+        "year": "2021",
+        "period_unit": "year",
+        "detail_period": "all"
+    }
+    """
+    dependent_variable_list: List[str]
+    independent_variable_list: List[str]
+
+
 class CreateClustering(BaseAnalysisInput):
     """
     군집분석 시행하기 위한 parameter dto
+    n_point가 auto이면 k_method(BIC, AIC) 기준으로 군집 수를 자동으로 선택한다
     """
     variable_list: List[str]
-    n_point: int
+    n_point: Union[int, Literal["auto"]]
+    k_method: Literal["BIC", "AIC"] = "BIC"
 
     @validator('n_point')
     def check_min_n_point(cls, v):
-        if v < 2:
+        if v != "auto" and v < 2:
             raise ValueError("n은 최소 2 이상입니다.")
         return v
+
+
+class ShowCacheStats(BaseModel):
+    """
+    분석 결과 캐시 상태를 반환하는 dto
+    """
+    backend: Optional[str]
+    size: int
+    hits: int
+    misses: int
+
+
+class ShowJob(BaseModel):
+    """
+    비동기 분석 작업의 상태를 반환하는 dto
+    status : pending, running, success, failure
+    """
+    job_id: str
+    analysis_type: str
+    status: str
+    error: Optional[str] = None
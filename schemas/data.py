@@ -37,7 +37,12 @@ class ShowVariableChartData(BaseModel):
 
 
 class ShowFilterData(BaseModel):
+    """
+    분석 조건 필터 목록 dto
+    available_period_unit : 연도별로 값이 있는 기간 단위 ex) {"2021": ["year", "month"]}
+    """
     year: List[str]
     period_unit: List[str]
     detail_period: Dict[str, List[str]]
+    available_period_unit: Dict[str, List[str]] = {}
 
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+
+class ShowPoolMetrics(BaseModel):
+    """
+    DB 커넥션 pool 상태를 반환하는 dto (응답한 worker 프로세스 기준)
+    checked_out : 현재 사용 중인 커넥션 수, overflow : pool_size를 넘어 연 커넥션 수
+    wait_avg_ms, wait_max_ms : 커넥션 checkout에 걸린 평균/최대 시간
+    timeouts : pool_timeout 안에 커넥션을 얻지 못한 횟수
+    """
+    pool_size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    peak_checked_out: int
+    checkouts: int
+    timeouts: int
+    wait_avg_ms: float
+    wait_max_ms: float
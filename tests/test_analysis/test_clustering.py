@@ -0,0 +1,58 @@
+import pandas as pd
+from sklearn.datasets import make_blobs
+
+from analysis_module import clustering_module
+from analysis_module.clustering_module import GMMModule, _is_rising
+
+
+def _make_module(n_jobs: int = 2) -> GMMModule:
+    x, _ = make_blobs(n_samples=300, centers=3, cluster_std=0.5, random_state=0)
+    data = pd.DataFrame({"yr": 2021, "stdg_nm": [f"지역{i}" for i in range(len(x))], "variable": "yr_vl",
+                         "M01": x[:, 0], "M02": x[:, 1]})
+    module = GMMModule(data, {"M01": "변수1", "M02": "변수2"})
+    module.random_state = 0
+    module.n_jobs = n_jobs
+    return module
+
+
+def test_is_rising_requires_patience_consecutive_increases():
+    assert not _is_rising([5, 3, 4], patience=2)
+    assert _is_rising([5, 3, 4, 6], patience=2)
+    assert not _is_rising([5, 3, 4, 2, 6], patience=2)
+
+
+def test_set_optimal_k_stops_early_with_same_choice_as_full_scan():
+    full_scan = _make_module()
+    full_scan.set_optimal_k("BIC", patience=len(full_scan.k_range))
+
+    early_stop = _make_module()
+    early_stop.set_optimal_k("BIC")
+
+    assert early_stop.optimal_k == full_scan.optimal_k == 3
+    assert len(early_stop.bic_scores) < len(full_scan.bic_scores)
+
+
+def test_set_optimal_k_stops_early_with_many_jobs():
+    # n_jobs가 후보 k 수보다 많아도 한 번에 모든 k를 학습하지 않는다
+    module = _make_module(n_jobs=8)
+    k_count = len(module.k_range)
+    module.set_optimal_k("BIC")
+
+    assert module.optimal_k == 3
+    assert len(module.bic_scores) < k_count
+
+
+def test_n_jobs_is_one_inside_analysis_worker(monkeypatch):
+    monkeypatch.setattr(clustering_module, "is_worker_process", lambda: True)
+
+    assert GMMModule(pd.DataFrame(), {}).n_jobs == 1
+
+
+def test_parallel_fit_labels_every_row():
+    module = _make_module()
+    module.optimal_k = 3
+    module.fit(n_init=8)
+
+    assert module.model.n_components == 3
+    assert sorted(set(module.labels)) == [0, 1, 2]
+    assert len(module.get_clustering_result()) == 300
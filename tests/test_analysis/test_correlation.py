@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import pearsonr, spearmanr
+
+from analysis_module.correlation_module import CorrelationModule, get_significance_mark, pairwise_correlation, \
+    get_cluster_order
+
+
+def _make_module() -> CorrelationModule:
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=40)
+    data = pd.DataFrame({"M01": x, "M02": x + rng.normal(size=40), "M03": rng.normal(size=40),
+                         "M04": -x + rng.normal(scale=2, size=40)})
+    data.iloc[[1, 5, 9], 1] = np.nan
+    data.iloc[[5, 20], 3] = np.nan
+    return CorrelationModule(data, {"M01": "변수1", "M02": "변수2", "M03": "변수3", "M04": "변수4"})
+
+
+@pytest.mark.parametrize("method, test", [("pearson", pearsonr), ("spearman", spearmanr)])
+@pytest.mark.parametrize("testing_side, alternative", [("both", "two-sided"), ("greater", "greater"),
+                                                      ("less", "less")])
+def test_pvalue_matches_pairwise_scipy(method, test, testing_side, alternative):
+    module = _make_module()
+    p_values = module.get_pvalue_of_correlation(testing_side, method)
+
+    for i, a in enumerate(module.columns):
+        for j, b in enumerate(module.columns):
+            if i == j:
+                assert np.isnan(p_values.iloc[i, j])
+                continue
+            pair = module.X[[a, b]].dropna()
+            expected = test(pair[a], pair[b], alternative=alternative).pvalue
+            assert p_values.iloc[i, j] == pytest.approx(expected, rel=1e-6, abs=1e-12)
+
+
+def test_pvalue_is_nan_without_enough_pairs():
+    data = pd.DataFrame({"M01": [1.0, 2.0, 3.0, np.nan], "M02": [np.nan, 1.0, 0.5, 2.0]})
+    p_values = CorrelationModule(data, {"M01": "변수1", "M02": "변수2"}).get_pvalue_of_correlation()
+
+    assert p_values.isna().all().all()
+
+
+def test_significance_mark():
+    assert [get_significance_mark(p) for p in (0.0001, 0.005, 0.03, 0.2, np.nan)] == ["***", "**", "*", "", ""]
+
+
+def _make_wide_data(n_rows=60, n_columns=40) -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    factors = rng.normal(size=(n_rows, 4))
+    values = factors[:, rng.integers(0, 4, size=n_columns)] + rng.normal(scale=0.5, size=(n_rows, n_columns))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    values[:, 3] = 7.0
+    return pd.DataFrame(values, columns=["M{:03d}".format(i) for i in range(n_columns)])
+
+
+@pytest.mark.parametrize("block_size", [7, 256])
+def test_pairwise_correlation_matches_pandas(block_size):
+    data = _make_wide_data()
+    corr, counts = pairwise_correlation(data.to_numpy(), block_size=block_size)
+
+    np.testing.assert_allclose(corr, data.corr().to_numpy(), rtol=1e-10, atol=1e-12)
+    np.testing.assert_array_equal(counts, data.notna().T.astype(int) @ data.notna().astype(int))
+
+
+def test_top_correlation_pairs_are_strongest_upper_triangle_pairs():
+    data = _make_wide_data()
+    module = CorrelationModule(data, {column: "변수" + column for column in data.columns})
+
+    top_pairs = module.get_top_correlation_pairs(k=10)
+
+    corr = data.corr().to_numpy()
+    expected = np.sort(np.abs(corr[np.triu_indices(len(corr), k=1)]))[::-1]
+    np.testing.assert_allclose(np.abs(top_pairs["상관계수"]), expected[~np.isnan(expected)][:10])
+    first = data.columns.get_loc(top_pairs["변수1"][0][2:])
+    second = data.columns.get_loc(top_pairs["변수2"][0][2:])
+    pair = data.iloc[:, [first, second]].dropna()
+    assert top_pairs["표본수"][0] == len(pair)
+    assert top_pairs["유의확률"][0] == pytest.approx(pearsonr(pair.iloc[:, 0], pair.iloc[:, 1]).pvalue, abs=1e-12)
+
+
+def test_cluster_order_groups_correlated_variables():
+    rng = np.random.default_rng(2)
+    a, b = rng.normal(size=(2, 100))
+    data = pd.DataFrame({"a1": a, "b1": b, "a2": a + rng.normal(scale=0.1, size=100),
+                         "b2": -b + rng.normal(scale=0.1, size=100), "a3": a + rng.normal(scale=0.1, size=100)})
+
+    order = data.columns[get_cluster_order(data.corr().to_numpy())].str[0].to_list()
+    assert order in (["a", "a", "a", "b", "b"], ["b", "b", "a", "a", "a"])
+
+
+def test_clustered_heatmap_renders_many_variables():
+    data = _make_wide_data(n_columns=200)
+    module = CorrelationModule(data, {})
+
+    assert module.save_clustered_heatmap_plot()
+    assert sorted(module.get_clustered_correlation_matrix().columns) == sorted(data.columns)
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.formula.api import ols
+from statsmodels.stats.anova import anova_lm
+
+from analysis_module.ols import fit_ols, fit_ols_many
+from db.repository.data import pivot_statis_df
+from tests.utils.statis import load_sample_statis
+
+SUMMARY_ATTRIBUTES = ["nobs", "df_model", "df_resid", "rsquared", "rsquared_adj", "fvalue", "f_pvalue", "llf", "aic",
+                      "bic"]
+
+
+def _sample_data(n_variables: int) -> pd.DataFrame:
+    pivoted_df = pivot_statis_df(load_sample_statis("2021"), "yr_vl")
+    return pivoted_df.iloc[:, 3:3 + n_variables]
+
+
+@pytest.mark.parametrize("n_variables", [2, 4, 6])
+def test_fit_ols_matches_formula_ols(n_variables):
+    data = _sample_data(n_variables)
+    y_column, x_columns = data.columns[0], data.columns[1:].to_list()
+
+    expected = ols(y_column + " ~ " + " + ".join(x_columns), data=data).fit()
+    result = fit_ols(data[y_column], data[x_columns])
+
+    for attribute in SUMMARY_ATTRIBUTES:
+        assert getattr(result, attribute) == pytest.approx(getattr(expected, attribute), rel=1e-8), attribute
+
+    for attribute in ["params", "bse", "tvalues", "pvalues"]:
+        np.testing.assert_allclose(getattr(result, attribute), getattr(expected, attribute), rtol=1e-7, atol=1e-300)
+    assert result.params.index.to_list() == expected.params.index.to_list()
+    np.testing.assert_allclose(result.conf_int(), expected.conf_int(), rtol=1e-7)
+
+    pd.testing.assert_frame_equal(result.anova_table(), anova_lm(expected), rtol=1e-7)
+
+
+def test_fit_ols_with_collinear_variables():
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({"y": rng.normal(size=30), "a": rng.normal(size=30), "b": rng.normal(size=30)})
+    data["c"] = data["a"] + data["b"]
+
+    expected = ols("y ~ a + b + c", data=data).fit()
+    result = fit_ols(data["y"], data[["a", "b", "c"]])
+
+    assert result.df_model == expected.df_model
+    assert result.rsquared == pytest.approx(expected.rsquared)
+    np.testing.assert_allclose(result.params, expected.params, rtol=1e-6)
+
+
+def test_fit_ols_many_matches_individual_fits():
+    data = _sample_data(6)
+    data.iloc[[0, 3], 1] = np.nan
+    targets, independents = data.columns[:3].to_list(), data.columns[3:].to_list()
+
+    results = fit_ols_many(data[targets], data[independents])
+
+    assert list(results) == targets
+    for target in targets:
+        expected = fit_ols(data[target], data[independents])
+        assert results[target].nobs == expected.nobs
+        np.testing.assert_allclose(results[target].params, expected.params, rtol=1e-10)
+        pd.testing.assert_frame_equal(results[target].anova_table(), expected.anova_table())
+
+
+def test_fit_ols_without_residual_degrees_of_freedom():
+    # 관측치 수가 모수 개수와 같으면 statsmodels와 같이 오류 없이 nan/inf 통계량을 반환한다
+    data = pd.DataFrame({"y": [1.0, 3.0, 2.0], "a": [0.0, 1.0, 2.0], "b": [1.0, 0.0, 4.0]})
+
+    expected = ols("y ~ a + b", data=data).fit()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = fit_ols(data["y"], data[["a", "b"]])
+        many_result = fit_ols_many(data[["y"]], data[["a", "b"]])["y"]
+        summary = [getattr(result, attribute) for attribute in SUMMARY_ATTRIBUTES] + [result.anova_table()]
+
+    assert result.nobs == 3 and result.df_resid == expected.df_resid == 0
+    np.testing.assert_allclose(result.params, expected.params, atol=1e-10)
+    np.testing.assert_allclose(many_result.params, expected.params, atol=1e-10)
+    assert not np.isfinite(result.bse).any() and not np.isfinite(summary[SUMMARY_ATTRIBUTES.index("rsquared_adj")])
+
+
+def test_fit_ols_without_complete_rows():
+    data = pd.DataFrame({"y": [1.0, np.nan], "a": [np.nan, 2.0]})
+
+    with pytest.raises(ValueError):
+        fit_ols(data["y"], data[["a"]])
@@ -0,0 +1,83 @@
+import base64
+import gc
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
+
+from analysis_module.correlation_module import CorrelationModule
+from analysis_module.fonts import FONT_PATH, register_font
+from analysis_module.plotting import RenderConfig, MAX_DPI, MAX_FIGURE_INCH, MIN_FIGURE_INCH, PREVIEW_DPI, MIN_DPI, \
+    create_figure, figure_to_base64
+
+N_REQUESTS = 8
+
+
+def _make_module(seed: int) -> CorrelationModule:
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame(rng.normal(size=(50, 4)), columns=["M01", "M02", "M03", "M04"])
+    return CorrelationModule(data, {column: "변수" + column for column in data.columns})
+
+
+def _render(seed: int) -> str:
+    return _make_module(seed).save_heatmap_plot()
+
+
+def _count_live_figures() -> int:
+    gc.collect()
+    return len([obj for obj in gc.get_objects() if isinstance(obj, Figure)])
+
+
+def test_concurrent_plots_do_not_interfere_and_do_not_leak():
+    seeds = [i % 2 for i in range(N_REQUESTS)]
+    expected = {seed: _render(seed) for seed in set(seeds)}
+    live_figures = _count_live_figures()
+
+    with ThreadPoolExecutor(max_workers=N_REQUESTS) as executor:
+        results = list(executor.map(_render, seeds))
+
+    # 동시에 그려도 혼자 그린 결과와 같아야 한다
+    for seed, result in zip(seeds, results):
+        assert result == expected[seed]
+
+    # pyplot 전역 figure를 만들지 않고, 요청이 끝나면 Figure가 모두 해제되어야 한다
+    assert plt.get_fignums() == []
+    assert _count_live_figures() == live_figures
+
+
+def test_render_config_caps_and_preview():
+    config = RenderConfig(dpi=10000, width=100, height=0.1)
+    assert (config.dpi, config.width, config.height) == (MAX_DPI, MAX_FIGURE_INCH, MIN_FIGURE_INCH)
+
+    preview_config = RenderConfig(preview=True, image_format="jpeg")
+    assert preview_config.dpi == PREVIEW_DPI
+    assert preview_config.media_type == "image/jpeg"
+
+
+def test_heatmap_honors_image_format():
+    module = _make_module(0)
+    module.render_config = RenderConfig(image_format="svg", preview=True)
+
+    assert base64.b64decode(module.save_heatmap_plot()).startswith(b"<?xml")
+
+
+def test_create_figure_registers_bundled_korean_font():
+    from matplotlib import font_manager, rcParams
+
+    fig = create_figure()
+    font_name = register_font()
+
+    assert rcParams["font.family"] == [font_name]
+    # 사용자 글꼴 캐시의 내용과 관계없이 번들 글꼴 파일이 이 이름으로 등록되어 있다
+    assert [os.path.abspath(font.fname) for font in font_manager.fontManager.ttflist
+            if font.name == font_name] == [FONT_PATH]
+
+    ax = fig.subplots()
+    ax.set_title("상관계수 히트맵")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        figure_to_base64(fig, RenderConfig(dpi=MIN_DPI))
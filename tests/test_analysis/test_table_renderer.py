@@ -0,0 +1,34 @@
+import base64
+
+import numpy as np
+import pandas as pd
+
+from analysis_module.plotting import RenderConfig
+from analysis_module.table_renderer import render_table, table_to_json, get_table_media_type
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def test_render_table_returns_base64_png_without_chromium():
+    df = pd.DataFrame({"평균": [1.5, 2.25], "개수": [3, 4]}, index=["인구", "세대수"])
+
+    image = base64.b64decode(render_table(df, "matplotlib"))
+
+    assert image.startswith(PNG_SIGNATURE)
+
+
+def test_render_table_uses_table_dpi_and_reports_media_type():
+    df = pd.DataFrame({"평균": [1.5, 2.25], "개수": [3, 4]}, index=["인구", "세대수"])
+    render_config = RenderConfig(dpi=300, image_format="jpeg")
+
+    # 요청 옵션의 dpi(300)가 아니라 TABLE_DPI로 그린다
+    assert render_table(df, "matplotlib", render_config) == render_table(df, "matplotlib",
+                                                                         RenderConfig(dpi=200, image_format="jpeg"))
+    assert get_table_media_type("matplotlib", render_config) == "image/jpeg"
+    assert get_table_media_type("chromium", render_config) == "image/png"
+
+
+def test_table_to_json_is_split_oriented_and_maps_nan_to_null():
+    df = pd.DataFrame({"평균": [1.5, np.nan]}, index=["인구", "세대수"])
+
+    assert table_to_json(df) == {"columns": ["평균"], "index": ["인구", "세대수"], "data": [[1.5], [None]]}
@@ -0,0 +1,124 @@
+import threading
+
+import pytest
+
+from db.repository import catalog
+from db.repository.catalog import VariableCatalog
+from tests.utils.catalog import FakeCatalogDB
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake_db = FakeCatalogDB()
+    fake_db.patch(monkeypatch)
+    return fake_db
+
+
+def _children(result, category_id):
+    return [list(child)[0] for child in result[category_id]["children"]]
+
+
+def test_variable_list_filters_by_year_region_and_period(fake_db):
+    variable_catalog = VariableCatalog()
+
+    _, result = variable_catalog.get_variable_list("2021", "all", "year", "all", None)
+    assert list(result) == ["M010001", "M010002"]
+    assert _children(result, "M010001") == ["M020011", "M020012"]
+    assert _children(result, "M010002") == []
+
+    _, result = variable_catalog.get_variable_list("2021", "gsbd", "year", "all", None)
+    assert _children(result, "M010001") == [] and _children(result, "M010002") == ["M020013"]
+
+    _, result = variable_catalog.get_variable_list("2021", "all", "month", "2", None)
+    assert _children(result, "M010001") == ["M020012"]
+
+    _, result = variable_catalog.get_variable_list("2021", "all", "month", "3", None)
+    assert _children(result, "M010001") == []
+
+    _, result = variable_catalog.get_variable_list("2020", "all", "year", "all", None)
+    assert _children(result, "M010001") == ["M020011"]
+
+
+def test_refresh_reloads_only_changed_parts(fake_db):
+    clock = Clock()
+    variable_catalog = VariableCatalog(refresh_interval=60, clock=clock)
+
+    etag, _ = variable_catalog.get_variable_list("2021", "all", "year", "all", None)
+    assert fake_db.fetched_years == [["2020", "2021"]]
+
+    fake_db.year_versions["2021"] = "b"
+    assert variable_catalog.get_variable_list("2021", "all", "year", "all", None)[0] == etag
+
+    clock.now = 61
+    fake_db.availability["2021"]["M020013"] = set()
+    new_etag, result = variable_catalog.get_variable_list("2021", "gsbd", "year", "all", None)
+    assert fake_db.fetched_years == [["2020", "2021"], ["2021"]]
+    assert fake_db.info_fetches == 1
+    assert _children(result, "M010002") == []
+    assert variable_catalog.get_variable_list("2021", "all", "year", "all", None)[0] != etag
+
+    clock.now = 200
+    assert variable_catalog.get_variable_list("2021", "gsbd", "year", "all", None)[0] == new_etag
+    assert fake_db.fetched_years == [["2020", "2021"], ["2021"]]
+
+
+def test_filter_list_reports_period_units_with_data(fake_db):
+    variable_catalog = VariableCatalog()
+
+    filter_list = variable_catalog.get_filter_list(None)
+
+    assert filter_list["year"] == ["2020", "2021"]
+    assert filter_list["period_unit"] == ["year", "half", "quarter", "month"]
+    assert filter_list["available_period_unit"] == {"2020": ["year"], "2021": ["year", "month"]}
+
+
+def test_concurrent_first_request_waits_for_initial_load(fake_db, monkeypatch):
+    variable_catalog = VariableCatalog()
+    started, release = threading.Event(), threading.Event()
+
+    def slow_fetch_info_version(db):
+        started.set()
+        release.wait(5)
+        return fake_db.info_version
+
+    monkeypatch.setattr(catalog, "fetch_info_version", slow_fetch_info_version)
+    first = threading.Thread(target=variable_catalog.get_variable_list, args=("2021", "all", "year", "all", None))
+    first.start()
+    started.wait(5)
+
+    results = []
+    second = threading.Thread(target=lambda: results.append(
+        variable_catalog.get_variable_list("2021", "all", "year", "all", None)))
+    second.start()
+    second.join(0.2)
+    assert second.is_alive()
+
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert _children(results[0][1], "M010001") == ["M020011", "M020012"]
+
+
+def test_failed_refresh_is_retried_on_next_request(fake_db, monkeypatch):
+    variable_catalog = VariableCatalog(refresh_interval=60, clock=Clock())
+
+    def failing_fetch_year_versions(db):
+        raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(catalog, "fetch_year_versions", failing_fetch_year_versions)
+    with pytest.raises(ConnectionError):
+        variable_catalog.get_variable_list("2021", "all", "year", "all", None)
+    assert variable_catalog.checked_at is None
+
+    monkeypatch.setattr(catalog, "fetch_year_versions", lambda db: dict(fake_db.year_versions))
+    _, result = variable_catalog.get_variable_list("2021", "all", "year", "all", None)
+    assert _children(result, "M010001") == ["M020011", "M020012"]
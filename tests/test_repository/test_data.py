@@ -0,0 +1,104 @@
+import io
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from db.repository.data import pivot_statis_df, get_detail_filter_condition, get_histogram_data, \
+    STATIS_VALUE_COLUMNS, get_histogram_bin_edges, HISTOGRAM_MAX_BINS
+from tests.utils.statis import load_sample_statis
+
+
+def _pivot_by_csv_round_trip(df, value_period_list):
+    melted_df = pd.melt(df, id_vars=['yr', 'stdg_nm', 'dat_no', 'dat_nm'], value_vars=value_period_list)
+    pivoted_df = pd.pivot_table(melted_df, values='value', index=['yr', 'stdg_nm', 'variable'], columns='dat_no')
+
+    buffer = io.StringIO()
+    pivoted_df.to_csv(buffer)
+    buffer.seek(0)
+    return pd.read_csv(buffer)
+
+
+def test_pivot_statis_df_matches_csv_round_trip():
+    df = load_sample_statis(year="2021")
+
+    for value_period_list in ["yr_vl", "jan", "qu_1", "ht_2"]:
+        expected = _pivot_by_csv_round_trip(df, value_period_list)
+        pivoted_df = pivot_statis_df(df, value_period_list)
+
+        assert pivoted_df.columns.to_list() == expected.columns.to_list()
+        assert pivoted_df.dtypes.to_list() == expected.dtypes.to_list()
+        pd.testing.assert_frame_equal(pivoted_df, expected)
+
+
+def test_pivot_statis_df_matches_csv_round_trip_with_decimal_values():
+    df = load_sample_statis(year="2021")
+    df["yr_vl"] = df["yr_vl"].map(lambda x: None if pd.isna(x) else Decimal(int(x))).astype(object)
+
+    expected = _pivot_by_csv_round_trip(df, "yr_vl")
+    pd.testing.assert_frame_equal(pivot_statis_df(df, "yr_vl"), expected)
+
+
+def test_pivot_statis_df_on_pruned_rows_matches_full_fetch():
+    df = load_sample_statis(year="2021")
+
+    for value_period_list in ["yr_vl", "qu_1", "ht_2"]:
+        pruned_df = df.loc[df[value_period_list].notna(), ['yr', 'dat_no', 'dat_nm', 'stdg_nm', value_period_list]]
+        pd.testing.assert_frame_equal(pivot_statis_df(pruned_df, value_period_list),
+                                      _pivot_by_csv_round_trip(df, value_period_list))
+
+
+def test_column_pruning_benchmark():
+    """
+    period_unit별로 전체 기간 컬럼 조회 대비 필요한 컬럼만 조회할 때의 행/바이트 감소량 (pytest -s로 확인)
+    """
+    df = load_sample_statis()
+    id_columns = ['yr', 'dat_no', 'dat_nm', 'stdg_nm']
+    full_df = df[id_columns + STATIS_VALUE_COLUMNS]
+    full_bytes = full_df.memory_usage(deep=True, index=False).sum()
+    full_value_bytes = full_df[STATIS_VALUE_COLUMNS].memory_usage(index=False).sum()
+
+    for period_unit, detail_period in [("year", "all"), ("half", "1"), ("quarter", "1"), ("month", "1")]:
+        column = get_detail_filter_condition(period_unit, detail_period)
+        pruned_df = df.loc[df[column].notna(), id_columns + [column]]
+        pruned_bytes = pruned_df.memory_usage(deep=True, index=False).sum()
+        pruned_value_bytes = pruned_df[[column]].memory_usage(index=False).sum()
+
+        print("{:8} rows {:>6} -> {:>6} | value bytes {:>8} -> {:>8} | total bytes {:>9} -> {:>9}".format(
+            period_unit, len(full_df), len(pruned_df), full_value_bytes, pruned_value_bytes, full_bytes, pruned_bytes))
+
+        assert len(pruned_df) <= len(full_df)
+        assert pruned_value_bytes * len(STATIS_VALUE_COLUMNS) <= full_value_bytes
+        assert pruned_bytes < full_bytes
+
+
+@pytest.mark.parametrize("bins", ["fixed", "sturges", "fd"])
+def test_histogram_matches_numpy(bins):
+    data = load_sample_statis("2021")["yr_vl"].dropna().to_numpy(dtype="float64")
+
+    histogram_data = get_histogram_data(data, bins, num_bins=30)
+
+    expected_counts, expected_edges = np.histogram(data, bins=30 if bins == "fixed" else bins)
+    assert [row["count"] for row in histogram_data] == expected_counts.tolist()
+    np.testing.assert_allclose([row["bin_start"] for row in histogram_data], expected_edges[:-1])
+    np.testing.assert_allclose([row["bin_end"] for row in histogram_data], expected_edges[1:])
+    assert sum(row["count"] for row in histogram_data) == len(data)
+
+
+def test_histogram_handles_narrow_and_constant_range():
+    narrow = get_histogram_data([10, 11, 12, 10, 12], "fixed", num_bins=100)
+    assert sum(row["count"] for row in narrow) == 5
+    assert narrow[0]["bin_start"] == 10 and narrow[-1]["bin_end"] == 12
+
+    constant = get_histogram_data([5, 5, 5], "fixed", num_bins=4)
+    assert [row["count"] for row in constant] == [0, 0, 3, 0]
+
+
+@pytest.mark.parametrize("bins", ["sturges", "fd"])
+def test_histogram_bin_count_is_capped(bins):
+    # 사분위범위가 0에 가깝고 이상치가 하나 있으면 fd 규칙의 구간 수는 수십억 개가 된다
+    edges = get_histogram_bin_edges(bins, 100, 1e305 if bins == "sturges" else 1000, 0.0, 1e12, iqr=1e-3)
+
+    assert len(edges) == HISTOGRAM_MAX_BINS + 1
+    assert edges[0] == 0.0 and edges[-1] == 1e12
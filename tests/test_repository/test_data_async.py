@@ -0,0 +1,85 @@
+import asyncio
+import datetime
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from db.models.data import GgsCmmn, GgsDataInfo
+from db.repository import catalog, data_async
+from db.repository.catalog import VariableCatalog
+from tests.utils.catalog import FakeCatalogDB
+
+aiosqlite = pytest.importorskip("aiosqlite")
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+
+def _create_variable(path):
+    engine = create_engine("sqlite:///{}".format(path))
+    GgsCmmn.metadata.create_all(engine, tables=[GgsCmmn.__table__, GgsDataInfo.__table__])
+    with Session(engine) as db:
+        db.add(GgsCmmn(cmmn_cd="M010001", lclsf_cmmn_cd="M010000", cmmn_cd_nm="인구"))
+        db.execute(text("INSERT INTO ggs_data_info (dat_no, clsf_cd, dat_nm, use_yn, last_mdfcn_dt) "
+                        "VALUES ('M020011', 'M010001', '총인구', 'Y', :last_mdfcn_dt)"),
+                   {"last_mdfcn_dt": datetime.datetime(2023, 1, 1)})
+        db.commit()
+    engine.dispose()
+
+
+def test_variable_detail_with_async_and_sync_session(tmp_path):
+    path = tmp_path / "data.db"
+    _create_variable(path)
+
+    async def retrieve_with_async_session():
+        engine = create_async_engine("sqlite+aiosqlite:///{}".format(path))
+        async with AsyncSession(engine) as db:
+            result = await data_async.retrieve_variable_detail("M020011", db)
+        await engine.dispose()
+        return result
+
+    async def retrieve_with_sync_session():
+        engine = create_engine("sqlite:///{}".format(path), connect_args={"check_same_thread": False})
+        with Session(engine) as db:
+            return await data_async.retrieve_variable_detail("M020011", db)
+
+    async_result = asyncio.run(retrieve_with_async_session())
+    sync_result = asyncio.run(retrieve_with_sync_session())
+
+    assert async_result.dat_nm == sync_result.dat_nm == "총인구"
+    assert async_result.clsf_nm == "인구"
+
+
+def test_concurrent_first_catalog_load_with_async_sessions(tmp_path, monkeypatch):
+    path = tmp_path / "data.db"
+    _create_variable(path)
+    FakeCatalogDB().patch(monkeypatch)
+    fetch_info_version = catalog.fetch_info_version
+
+    def fetch_info_version_from_db(db):
+        # async 드라이버의 조회처럼 event loop에 제어를 넘긴다
+        db.execute(text("SELECT 1"))
+        return fetch_info_version(db)
+
+    monkeypatch.setattr(catalog, "fetch_info_version", fetch_info_version_from_db)
+    monkeypatch.setattr(data_async, "variable_catalog", VariableCatalog())
+
+    async def retrieve_filter_list(engine):
+        async with AsyncSession(engine) as db:
+            return await data_async.retrieve_filter_list(db)
+
+    async def retrieve_concurrently():
+        engine = create_async_engine("sqlite+aiosqlite:///{}".format(path))
+        try:
+            return await asyncio.gather(retrieve_filter_list(engine), retrieve_filter_list(engine))
+        finally:
+            await engine.dispose()
+
+    # event loop thread가 멈추면 wait_for도 동작하지 않으므로 별도 thread에서 실행하고 기다린다
+    results = []
+    worker = threading.Thread(target=lambda: results.append(asyncio.run(retrieve_concurrently())), daemon=True)
+    worker.start()
+    worker.join(10)
+
+    assert not worker.is_alive()
+    assert [filter_list["year"] for filter_list in results[0]] == [["2020", "2021"], ["2020", "2021"]]
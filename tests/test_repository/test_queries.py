@@ -0,0 +1,191 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Numeric, create_engine, text
+from sqlalchemy.orm import Session
+
+from db.repository import data, queries
+from db.repository.data import retrieve_variable_chart_data, get_pivoted_df
+from utils.frame_cache import FrameCache
+from db.repository.queries import STATIS_VALUE_COLUMNS, fetch_statis_frame, get_statis_query
+from tests.utils.statis import load_sample_statis
+
+
+@pytest.fixture(scope="module")
+def statis_db(tmp_path_factory):
+    """
+    샘플 데이터를 ggs_statis, ggs_stdg, ggs_data_info 테이블로 적재한 sqlite db
+    """
+    engine = create_engine("sqlite:///{}".format(tmp_path_factory.mktemp("queries") / "statis.db"))
+    df = load_sample_statis()
+    df[["yr", "stdg_cd", "dat_no"] + STATIS_VALUE_COLUMNS].to_sql("ggs_statis", engine, index=False)
+    df[["stdg_cd", "stdg_nm"]].drop_duplicates().to_sql("ggs_stdg", engine, index=False)
+    df[["dat_no", "dat_nm"]].drop_duplicates().to_sql("ggs_data_info", engine, index=False)
+
+    with Session(engine) as db:
+        yield db
+    engine.dispose()
+
+
+def _retrieve_chart_data_by_formatted_sql(id, year, column, db):
+    # 값과 컬럼명을 SQL 문자열에 직접 넣던 기존 방식
+    db_result = db.execute(text("""
+        select CAST(stat.{column} AS integer), stdg.stdg_nm
+        from ggs_statis stat left join ggs_stdg stdg on stat.stdg_cd = stdg.stdg_cd
+        where dat_no='{id}' and stat.yr='{year}' and stat.{column} is not null
+    """.format(column=column, id=id, year=year))).fetchall()
+    dat_nm = db.execute(text("select dat_nm from ggs_data_info gdi where dat_no='{}'".format(id))).first()[0]
+    return dat_nm, [{"value": row[0], "name": row[1]} for row in db_result]
+
+
+def test_statis_query_rejects_unknown_column():
+    with pytest.raises(ValueError):
+        get_statis_query(queries.CHART_DATA, "yr_vl; drop table ggs_statis")
+
+
+def test_bound_values_are_not_interpreted_as_sql(statis_db):
+    assert statis_db.execute(queries.DATA_NAME, {"id": "' or '1'='1"}).first() is None
+
+
+def test_chart_data_and_pivot_with_bound_queries(statis_db):
+    dat_no = load_sample_statis("2021")["dat_no"].iloc[0]
+
+    chart_data = retrieve_variable_chart_data(dat_no, "2021", "year", "all", "bar", statis_db)
+    _, expected = _retrieve_chart_data_by_formatted_sql(dat_no, "2021", "yr_vl", statis_db)
+    assert chart_data["data"] == expected
+
+    pivoted_df, dat_no_dat_nm_dict = get_pivoted_df([dat_no], "2021", "year", "all", statis_db)
+    assert pivoted_df.columns.to_list() == ["yr", "stdg_nm", "variable", dat_no]
+    assert len(pivoted_df) == len(expected)
+
+
+def test_year_range_panel_matches_per_year_pivots(statis_db):
+    dat_no_list = load_sample_statis("2021")["dat_no"].unique()[:3].tolist()
+
+    panel_df, _ = get_pivoted_df(dat_no_list, "2019", "year", "all", statis_db, year_end="2021")
+    expected = pd.concat([get_pivoted_df(dat_no_list, year, "year", "all", statis_db)[0]
+                          for year in ["2019", "2020", "2021"]], ignore_index=True)
+
+    assert panel_df["yr"].astype(str).unique().tolist() == ["2019", "2020", "2021"]
+    pd.testing.assert_frame_equal(panel_df, expected)
+
+
+def test_multi_period_panel_matches_per_period_pivots(tmp_path):
+    engine = create_engine("sqlite:///{}".format(tmp_path / "panel.db"))
+    df = load_sample_statis("2021")
+    dat_no_list = df["dat_no"].unique()[:3].tolist()
+    df = df[df["dat_no"].isin(dat_no_list)]
+    # 분기 값이 없는 샘플이므로 연간 값으로 분기 값을 만들고, 4분기는 일부 행만 비워 둔다
+    df = df.assign(qu_1=df["yr_vl"], qu_2=df["yr_vl"] * 2, qu_3=None, qu_4=df["yr_vl"].where(df.index % 2 == 0))
+    df[["yr", "stdg_cd", "dat_no"] + STATIS_VALUE_COLUMNS].to_sql("ggs_statis", engine, index=False)
+    df[["stdg_cd", "stdg_nm"]].drop_duplicates().to_sql("ggs_stdg", engine, index=False)
+    df[["dat_no", "dat_nm"]].drop_duplicates().to_sql("ggs_data_info", engine, index=False)
+
+    with Session(engine) as db:
+        panel_df, _ = get_pivoted_df(dat_no_list, "2021", "quarter", "1", db, detail_period_list=["4", "1", "2"])
+        per_period_df = pd.concat([get_pivoted_df(dat_no_list, "2021", "quarter", period, db)[0]
+                                   for period in ["1", "2", "4"]])
+    engine.dispose()
+
+    expected = per_period_df.sort_values(["yr", "stdg_nm", "variable"], ignore_index=True)
+    assert panel_df["variable"].unique().tolist() == ["qu_1", "qu_2", "qu_4"]
+    pd.testing.assert_frame_equal(panel_df, expected, check_like=True)
+
+
+def test_pivot_is_reused_across_variable_order_until_data_version_changes(statis_db, monkeypatch):
+    monkeypatch.setattr(data, "pivot_frame_cache", FrameCache())
+    dat_no_list = load_sample_statis("2021")["dat_no"].unique()[:3].tolist()
+    executed = []
+    monkeypatch.setattr(statis_db, "execute", lambda *args, **kwargs: executed.append(args) or Session.execute(
+        statis_db, *args, **kwargs))
+
+    first_df, first_dict = get_pivoted_df(dat_no_list, "2021", "year", "all", statis_db, data_version="v1")
+    second_df, second_dict = get_pivoted_df(dat_no_list[::-1], "2021", "year", "all", statis_db, data_version="v1")
+    assert len(executed) == 1
+    pd.testing.assert_frame_equal(second_df, first_df)
+    assert second_dict == first_dict
+
+    get_pivoted_df(dat_no_list, "2021", "year", "all", statis_db, data_version="v2")
+    assert len(executed) == 2
+
+
+def test_statis_values_are_fetched_as_float64(statis_db):
+    dat_no_list = load_sample_statis("2021")["dat_no"].unique()[:3].tolist()
+    params = {"variable_list": dat_no_list, "year": "2019", "year_end": "2021"}
+
+    pivot_df = fetch_statis_frame(statis_db.execute(get_statis_query(queries.PIVOT_SOURCE, "yr_vl"), params))
+    panel_df = fetch_statis_frame(statis_db.execute(queries.PANEL_SOURCE["quarter"], params))
+
+    assert pivot_df["yr_vl"].dtype == "float64" and len(pivot_df) > 0
+    assert (panel_df[["qu_1", "qu_2", "qu_3", "qu_4"]].dtypes == "float64").all()
+    assert fetch_statis_frame(statis_db.execute(queries.PANEL_SOURCE["quarter"],
+                                                {**params, "year": "1900", "year_end": "1900"}))["qu_1"].dtype == \
+        "float64"
+
+
+def test_typed_fetch_benchmark(statis_db):
+    """
+    ggs_statis 전체를 numeric(Decimal 객체)으로 읽어 object 컬럼에 담을 때와
+    float8로 변환해 컬럼 단위로 float64 배열을 만들 때의 시간과 메모리 (pytest -s로 확인)
+    """
+    columns = ", ".join(["yr", "stdg_cd", "dat_no"] + STATIS_VALUE_COLUMNS)
+    # postgresql의 numeric 컬럼처럼 기간 값을 Decimal로 받는다
+    decimal_query = text("SELECT {} FROM ggs_statis".format(columns)).columns(
+        **{column: Numeric(15) for column in STATIS_VALUE_COLUMNS})
+    typed_query = text("SELECT yr, stdg_cd, dat_no, {} FROM ggs_statis stat".format(
+        ", ".join(queries.select_statis_value(column) for column in STATIS_VALUE_COLUMNS)))
+
+    start = time.perf_counter()
+    result = statis_db.execute(decimal_query)
+    decimal_df = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+    decimal_values = decimal_df[STATIS_VALUE_COLUMNS].to_numpy(dtype="float64", na_value=float("nan"))
+    decimal_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    typed_df = fetch_statis_frame(statis_db.execute(typed_query))
+    typed_values = typed_df[STATIS_VALUE_COLUMNS].to_numpy()
+    typed_time = time.perf_counter() - start
+
+    decimal_bytes = decimal_df[STATIS_VALUE_COLUMNS].memory_usage(deep=True).sum()
+    typed_bytes = typed_df[STATIS_VALUE_COLUMNS].memory_usage(deep=True).sum()
+    print("{} rows | decimal objects {:.1f} ms, {:.1f} MB -> float64 columns {:.1f} ms, {:.1f} MB".format(
+        len(typed_df), decimal_time * 1000, decimal_bytes / 1024 ** 2, typed_time * 1000, typed_bytes / 1024 ** 2))
+
+    assert (decimal_df[STATIS_VALUE_COLUMNS].dtypes == object).all()
+    assert (typed_df[STATIS_VALUE_COLUMNS].dtypes == "float64").all()
+    assert typed_bytes < decimal_bytes
+    np.testing.assert_array_equal(typed_values, decimal_values)
+
+
+def test_reversed_year_range_is_rejected(statis_db):
+    with pytest.raises(HTTPException) as exc_info:
+        get_pivoted_df(["M000001"], "2021", "year", "all", statis_db, year_end="2019")
+    assert exc_info.value.status_code == 400
+
+
+def test_chart_data_query_benchmark(statis_db):
+    """
+    서로 다른 변수로 chart-data를 반복 조회할 때 값을 SQL에 넣는 방식과 bind parameter 방식의 소요 시간 (pytest -s로 확인)
+    """
+    sample = load_sample_statis("2021")
+    dat_no_list = sample["dat_no"].unique().tolist()
+    repeat = 20
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for dat_no in dat_no_list:
+            _retrieve_chart_data_by_formatted_sql(dat_no, "2021", "yr_vl", statis_db)
+    formatted_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for dat_no in dat_no_list:
+            retrieve_variable_chart_data(dat_no, "2021", "year", "all", "bar", statis_db)
+    bound_time = time.perf_counter() - start
+
+    calls = repeat * len(dat_no_list)
+    print("chart-data {} calls | formatted sql {:.2f} ms/call -> bound statement {:.2f} ms/call".format(
+        calls, formatted_time / calls * 1000, bound_time / calls * 1000))
@@ -0,0 +1,163 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from db.repository import data, replica
+from db.repository.data import get_data_version, get_pivoted_df, retrieve_variable_chart_data
+from db.repository.queries import STATIS_VALUE_COLUMNS
+from db.repository.replica import StatisReplica
+from tests.utils.statis import load_sample_statis
+
+
+@pytest.fixture
+def statis_db(tmp_path):
+    """
+    샘플 데이터를 ggs_statis(최종 수정일시 포함), ggs_stdg, ggs_data_info 테이블로 적재한 sqlite db
+    """
+    engine = create_engine("sqlite:///{}".format(tmp_path / "statis.db"))
+    df = load_sample_statis()
+    df[["yr", "stdg_cd", "dat_no"] + STATIS_VALUE_COLUMNS + ["last_mdfcn_dt"]].to_sql("ggs_statis", engine,
+                                                                                     index=False)
+    df[["stdg_cd", "stdg_nm"]].drop_duplicates().to_sql("ggs_stdg", engine, index=False)
+    df[["dat_no", "dat_nm"]].drop_duplicates().to_sql("ggs_data_info", engine, index=False)
+
+    with Session(engine) as db:
+        yield db
+    engine.dispose()
+
+
+@pytest.fixture
+def statis_replica(tmp_path, monkeypatch):
+    statis_replica = StatisReplica(root=str(tmp_path / "replica"))
+    monkeypatch.setattr(data, "statis_replica", statis_replica)
+    return statis_replica
+
+
+def _read_all(dat_no_list, dat_no, db):
+    pivoted = get_pivoted_df(dat_no_list, "2019", "year", "all", db, year_end="2021")
+    chart_data = retrieve_variable_chart_data(dat_no, "2021", "year", "all", "bar", db)
+    version = get_data_version(dat_no_list, "2019", db, year_end="2021")
+    return pivoted, chart_data, version
+
+
+def test_replica_reads_match_database(statis_db, statis_replica, monkeypatch):
+    dat_no_list = load_sample_statis("2021")["dat_no"].unique()[:3].tolist()
+
+    statis_replica.refresh(statis_db, force=True)
+    assert statis_replica.ready
+    (pivoted_df, name_dict), chart_data, version = _read_all(dat_no_list, dat_no_list[0], statis_db)
+
+    monkeypatch.setattr(data, "statis_replica", StatisReplica())
+    (expected_df, expected_dict), expected_chart_data, expected_version = _read_all(dat_no_list, dat_no_list[0],
+                                                                                   statis_db)
+
+    pd.testing.assert_frame_equal(pivoted_df, expected_df)
+    assert name_dict == expected_dict
+    assert sorted(chart_data["data"], key=lambda row: row["name"]) == \
+        sorted(expected_chart_data["data"], key=lambda row: row["name"])
+    assert chart_data["name"] == expected_chart_data["name"]
+    last_mdfcn_dt, row_count = version.split("/")
+    expected_last_mdfcn_dt, expected_row_count = expected_version.split("/")
+    assert pd.Timestamp(last_mdfcn_dt) == pd.Timestamp(expected_last_mdfcn_dt) and row_count == expected_row_count
+
+
+def test_replica_columns_are_memory_mapped_views(statis_db, statis_replica):
+    statis_replica.refresh(statis_db, force=True)
+    partition = statis_replica.partitions["2021"]
+    dat_no = next(iter(partition.variables))
+    column = partition.columns["yr_vl"]
+
+    assert isinstance(column, np.memmap)
+    assert np.shares_memory(column[partition.get_slice(dat_no)], column)
+    assert set(partition.columns["dat_no"][partition.get_slice(dat_no)]) == {dat_no}
+
+
+def test_refresh_rewrites_only_changed_years(statis_db, statis_replica, monkeypatch):
+    statis_replica.refresh(statis_db, force=True)
+    paths = {year: partition.path for year, partition in statis_replica.partitions.items()}
+    dat_no, stdg_cd = statis_db.execute(text("SELECT dat_no, stdg_cd FROM ggs_statis WHERE yr = '2021' "
+                                             "AND yr_vl IS NOT NULL")).first()
+    rows_2020, synced_until = statis_replica.partitions["2020"].rows, statis_replica.synced_until
+
+    # 2021년 값 하나를 수정하고, 2020년 행 하나는 수정일시 없이 삭제한다
+    statis_db.execute(text("UPDATE ggs_statis SET yr_vl = 123456789, last_mdfcn_dt = '2024-01-01 00:00:00.000' "
+                           "WHERE yr = '2021' AND dat_no = :dat_no AND stdg_cd = :stdg_cd"),
+                      {"dat_no": dat_no, "stdg_cd": stdg_cd})
+    statis_db.execute(text("DELETE FROM ggs_statis WHERE rowid = (SELECT min(rowid) FROM ggs_statis "
+                           "WHERE yr = '2020')"))
+    fetched = []
+    fetch_statis_rows = replica.fetch_statis_rows
+    monkeypatch.setattr(replica, "fetch_statis_rows", lambda db, since=None, year=None: fetched.append(
+        (since, year)) or fetch_statis_rows(db, since, year))
+
+    # 같은 root를 여는 다른 프로세스처럼 새 객체로 동기화한다
+    reopened = StatisReplica(root=statis_replica.root)
+    reopened.refresh(statis_db, force=True)
+
+    assert fetched == [(synced_until, None), (None, "2020")]
+    changed = sorted(year for year, partition in reopened.partitions.items() if partition.path != paths[year])
+    assert changed == ["2020", "2021"]
+    assert reopened.partitions["2020"].rows == rows_2020 - 1
+    assert (123456789, statis_db.execute(text("SELECT stdg_nm FROM ggs_stdg WHERE stdg_cd = :stdg_cd"),
+                                         {"stdg_cd": stdg_cd}).first()[0]) in \
+        reopened.get_chart_rows(dat_no, "2021", "yr_vl")
+    assert reopened.synced_until == "2024-01-01 00:00:00"
+
+    # 지난 동기화에서 교체된 파티션 디렉터리는 지운다
+    statis_replica.refresh(statis_db, force=True)
+    assert statis_replica.partitions["2020"].path == reopened.partitions["2020"].path
+    assert not any(os.path.exists(path) for year, path in paths.items() if year in changed)
+
+
+def test_refresh_applies_rows_stamped_at_last_sync_time(statis_db, statis_replica):
+    statis_replica.refresh(statis_db, force=True)
+    paths = {year: partition.path for year, partition in statis_replica.partitions.items()}
+    synced_until = statis_replica.synced_until
+    dat_no, stdg_cd, year = statis_db.execute(text("SELECT dat_no, stdg_cd, yr FROM ggs_statis "
+                                                   "WHERE yr_vl IS NOT NULL AND yr = '2019'")).first()
+
+    # 마지막 동기화 시각과 같은 수정일시로 동기화 뒤에 커밋된 수정
+    statis_db.execute(text("UPDATE ggs_statis SET yr_vl = 999999, last_mdfcn_dt = :last_mdfcn_dt "
+                           "WHERE yr = :year AND dat_no = :dat_no AND stdg_cd = :stdg_cd"),
+                      {"last_mdfcn_dt": synced_until, "year": year, "dat_no": dat_no, "stdg_cd": stdg_cd})
+    statis_replica.refresh(statis_db, force=True)
+
+    assert 999999 in [value for value, _ in statis_replica.get_chart_rows(dat_no, year, "yr_vl")]
+    changed = sorted(year for year, partition in statis_replica.partitions.items() if partition.path != paths[year])
+    assert changed == [year]
+
+    # 다시 가져온 행이 이미 반영된 것뿐이면 파티션을 다시 쓰지 않는다
+    paths = {year: partition.path for year, partition in statis_replica.partitions.items()}
+    statis_replica.refresh(statis_db, force=True)
+    assert {year: partition.path for year, partition in statis_replica.partitions.items()} == paths
+
+
+def test_replica_pivot_read_benchmark(statis_db, statis_replica, monkeypatch):
+    """
+    전체 연도, 전체 변수의 pivot을 DB에서 읽을 때와 로컬 복제본에서 읽을 때의 소요 시간 (pytest -s로 확인)
+    """
+    dat_no_list = load_sample_statis()["dat_no"].unique().tolist()
+    statis_replica.refresh(statis_db, force=True)
+    repeat = 5
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        replica_df, _ = get_pivoted_df(dat_no_list, "2011", "year", "all", statis_db, year_end="2022",
+                                       max_variables=len(dat_no_list))
+    replica_time = time.perf_counter() - start
+
+    monkeypatch.setattr(data, "statis_replica", StatisReplica())
+    start = time.perf_counter()
+    for _ in range(repeat):
+        db_df, _ = get_pivoted_df(dat_no_list, "2011", "year", "all", statis_db, year_end="2022",
+                                  max_variables=len(dat_no_list))
+    db_time = time.perf_counter() - start
+
+    print("pivot of {} rows | database {:.1f} ms/call -> replica {:.1f} ms/call".format(
+        len(db_df), db_time / repeat * 1000, replica_time / repeat * 1000))
+    pd.testing.assert_frame_equal(replica_df, db_df)
@@ -0,0 +1,138 @@
+from db.repository import analysis
+from db.repository.data import pivot_statis_df
+from schemas.analysis import ShowAnalysis, AnalysisResult
+from tests.utils.statis import load_sample_statis
+from utils.cache import ResultCache
+from utils.job_queue import JobQueue
+
+CORRELATION_DATA = {
+    "variable_list": ["M020011", "M020012"],
+    "year": "2021",
+    "period_unit": "year",
+    "detail_period": "all",
+    "testing_side": "both",
+    "valid_pvalue_accent": True
+}
+
+
+def test_async_correlation_returns_job_and_result(client, db_session, monkeypatch):
+    monkeypatch.setattr(analysis, "analysis_job_queue", JobQueue(backend="thread", max_workers=1))
+    monkeypatch.setattr(analysis, "SessionLocal", lambda: db_session)
+    monkeypatch.setattr(analysis, "create_correlation_analysis", lambda analysis_data, db: ShowAnalysis(
+        data=[AnalysisResult(title="상관계수 히트맵", result={"columns": []}, format="json")]))
+
+    response = client.post("/analysis/correlation?run_async=true", json=CORRELATION_DATA)
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    analysis.analysis_job_queue.get(job_id).result()
+    assert client.get(f"/analysis/jobs/{job_id}").json()["status"] == "success"
+
+    response = client.get(f"/analysis/jobs/{job_id}/result")
+    assert response.status_code == 200
+    assert response.json()["data"][0]["title"] == "상관계수 히트맵"
+
+
+def test_unknown_job_returns_404(client):
+    assert client.get("/analysis/jobs/unknown").status_code == 404
+
+
+def test_regression_batch_returns_result_per_dependent_variable(client, monkeypatch):
+    pivoted_df = pivot_statis_df(load_sample_statis("2021"), "yr_vl")
+    variables = pivoted_df.columns[3:7].to_list()
+    monkeypatch.setattr(analysis, "analysis_cache", ResultCache(None))
+    monkeypatch.setattr(analysis, "get_data_version", lambda *args, **kwargs: "test")
+    monkeypatch.setattr(analysis, "get_pivoted_df", lambda *args, **kwargs: (pivoted_df[pivoted_df.columns[:3].to_list() + variables],
+                                                                   {variable: variable for variable in variables}))
+
+    response = client.post("/analysis/regression/batch", json={
+        "dependent_variable_list": variables[:2],
+        "independent_variable_list": variables[2:],
+        "year": "2021",
+        "period_unit": "year",
+        "detail_period": "all",
+        "format": "json"
+    })
+
+    assert response.status_code == 201
+    titles = [result["title"] for result in response.json()["data"]]
+    assert titles == ["모형요약표 ({})".format(variables[0]), "분산분석표 ({})".format(variables[0]),
+                      "모형요약표 ({})".format(variables[1]), "분산분석표 ({})".format(variables[1]), "기술통계"]
+
+
+def test_regression_without_complete_rows_returns_400(client, monkeypatch):
+    pivoted_df = pivot_statis_df(load_sample_statis("2021"), "yr_vl")
+    variables = pivoted_df.columns[3:6].to_list()
+    pivoted_df = pivoted_df[pivoted_df.columns[:3].to_list() + variables].assign(**{variables[0]: float("nan")})
+    monkeypatch.setattr(analysis, "analysis_cache", ResultCache(None))
+    monkeypatch.setattr(analysis, "get_data_version", lambda *args, **kwargs: "test")
+    monkeypatch.setattr(analysis, "get_pivoted_df", lambda *args, **kwargs: (
+        pivoted_df, {variable: variable for variable in variables}))
+
+    response = client.post("/analysis/regression", json={
+        "dependent_variable": variables[0],
+        "independent_variable_list": variables[1:],
+        "year": "2021",
+        "period_unit": "year",
+        "detail_period": "all",
+        "format": "json"
+    })
+
+    assert response.status_code == 400
+
+
+def test_regression_batch_with_missing_variable_returns_400(client, monkeypatch):
+    pivoted_df = pivot_statis_df(load_sample_statis("2021"), "yr_vl")
+    variables = pivoted_df.columns[3:6].to_list()
+    monkeypatch.setattr(analysis, "analysis_cache", ResultCache(None))
+    monkeypatch.setattr(analysis, "get_data_version", lambda *args, **kwargs: "test")
+    monkeypatch.setattr(analysis, "get_pivoted_df", lambda *args, **kwargs: (
+        pivoted_df[pivoted_df.columns[:3].to_list() + variables], {variable: variable for variable in variables}))
+
+    # 조회 기간에 값이 없는 변수는 pivot 결과에 컬럼이 없다
+    response = client.post("/analysis/regression/batch", json={
+        "dependent_variable_list": [variables[0], "M999999"],
+        "independent_variable_list": variables[1:],
+        "year": "2021",
+        "period_unit": "year",
+        "detail_period": "all",
+        "format": "json"
+    })
+
+    assert response.status_code == 400
+
+
+def test_regression_batch_rejects_overlapping_variables(client):
+    response = client.post("/analysis/regression/batch", json={
+        "dependent_variable_list": ["M020011"],
+        "independent_variable_list": ["M020011", "M020012"],
+        "year": "2021",
+        "period_unit": "year",
+        "detail_period": "all"
+    })
+
+    assert response.status_code == 400
+
+
+def test_correlation_matrix_mode_accepts_more_than_ten_variables(client, monkeypatch):
+    pivoted_df = pivot_statis_df(load_sample_statis("2021"), "yr_vl")
+    variables = pivoted_df.columns[3:].to_list()
+    monkeypatch.setattr(analysis, "analysis_cache", ResultCache(None))
+    monkeypatch.setattr(analysis, "get_data_version", lambda *args, **kwargs: "test")
+    monkeypatch.setattr(analysis, "get_pivoted_df", lambda *args, **kwargs: (pivoted_df,
+                                                                             {variable: variable for variable in variables}))
+
+    response = client.post("/analysis/correlation", json={**CORRELATION_DATA, "variable_list": variables,
+                                                          "mode": "matrix", "top_k": 5, "format": "json"})
+
+    assert len(variables) > 10
+    assert response.status_code == 201
+    heatmap, top_pairs, statistics = response.json()["data"]
+    assert (heatmap["title"], top_pairs["title"], statistics["title"]) == ("상관계수 히트맵", "상관계수 상위 변수쌍", "기술통계")
+    assert sorted(heatmap["result"]["columns"]) == sorted(variables)
+    assert len(top_pairs["result"]["data"]) == 5
+
+    monkeypatch.setattr(analysis, "CORRELATION_MAX_COST", len(pivoted_df) * 10 ** 2)
+    response = client.post("/analysis/correlation", json={**CORRELATION_DATA, "variable_list": variables,
+                                                          "mode": "matrix"})
+    assert response.status_code == 400
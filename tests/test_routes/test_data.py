@@ -0,0 +1,33 @@
+from db.repository.catalog import VariableCatalog
+from tests.utils.catalog import FakeCatalogDB
+
+VARIABLE_LIST_PARAMS = {"year": "2021", "region": "all", "period_unit": "year", "detail_period": "all"}
+
+
+def test_variable_list_supports_etag(client, monkeypatch):
+    FakeCatalogDB().patch(monkeypatch)
+    monkeypatch.setattr("db.repository.data_async.variable_catalog", VariableCatalog())
+
+    response = client.get("/data/variable", params=VARIABLE_LIST_PARAMS)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert list(response.json()["M010001"]["children"][0]) == ["M020011"]
+
+    response = client.get("/data/variable", params=VARIABLE_LIST_PARAMS, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    response = client.get("/data/variable", params={**VARIABLE_LIST_PARAMS, "year": "2020"},
+                          headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+def test_filter_list_is_served_from_catalog(client, monkeypatch):
+    FakeCatalogDB().patch(monkeypatch)
+    monkeypatch.setattr("db.repository.data_async.variable_catalog", VariableCatalog())
+
+    response = client.get("/data/filter-list")
+
+    assert response.status_code == 200
+    assert response.json()["year"] == ["2020", "2021"]
+    assert response.json()["available_period_unit"]["2021"] == ["year", "month"]
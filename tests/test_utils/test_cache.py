@@ -0,0 +1,66 @@
+from utils.cache import MemoryCacheBackend, DiskCacheBackend, ResultCache, make_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_make_cache_key_ignores_dict_key_order():
+    assert make_cache_key("correlation", {"year": "2021", "period_unit": "year"}, "v1") == \
+           make_cache_key("correlation", {"period_unit": "year", "year": "2021"}, "v1")
+    assert make_cache_key("correlation", {"year": "2021"}, "v1") != make_cache_key("correlation", {"year": "2021"}, "v2")
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+
+    assert backend.get("a") == 1
+    assert backend.get("b") is None
+    assert backend.get("c") == 3
+
+
+def test_memory_backend_expires_after_ttl():
+    clock = FakeClock()
+    backend = MemoryCacheBackend(ttl=10, clock=clock)
+    backend.set("a", 1)
+
+    clock.now += 5
+    assert backend.get("a") == 1
+    clock.now += 10
+    assert backend.get("a") is None
+
+
+def test_disk_backend_round_trip_and_eviction(tmp_path):
+    clock = FakeClock()
+    backend = DiskCacheBackend(str(tmp_path), max_entries=2, ttl=100, clock=clock)
+    backend.set("a", {"data": [1, 2]})
+    clock.now += 1
+    backend.set("b", 2)
+    clock.now += 1
+    backend.get("a")
+    clock.now += 1
+    backend.set("c", 3)
+
+    assert len(backend) == 2
+    assert backend.get("a") == {"data": [1, 2]}
+    assert backend.get("b") is None
+
+    clock.now += 200
+    assert backend.get("c") is None
+
+
+def test_result_cache_counts_hits_and_misses():
+    cache = ResultCache(MemoryCacheBackend())
+    cache.get("a")
+    cache.set("a", 1)
+    cache.get("a")
+
+    assert cache.stats() == {"backend": "MemoryCacheBackend", "size": 1, "hits": 1, "misses": 1}
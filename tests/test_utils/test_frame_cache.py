@@ -0,0 +1,53 @@
+import pandas as pd
+
+from db.repository.data import pivot_statis_df
+from tests.utils.statis import load_sample_statis
+from utils.frame_cache import CompactFrame, FrameCache
+
+
+def _pivoted_df(year: str = "2021") -> pd.DataFrame:
+    return pivot_statis_df(load_sample_statis(year), "yr_vl")
+
+
+def test_compact_frame_round_trip_is_smaller_and_independent():
+    df = _pivoted_df()
+    frame = CompactFrame(df)
+
+    restored = frame.to_frame()
+    pd.testing.assert_frame_equal(restored, df)
+    assert frame.nbytes < df.memory_usage(deep=True).sum()
+
+    restored.iloc[0, 3] = -1
+    restored["labels"] = 0
+    pd.testing.assert_frame_equal(frame.to_frame(), df)
+
+
+def test_frame_cache_invalidates_on_version_change():
+    cache = FrameCache()
+    df = _pivoted_df()
+    cache.set("key", "v1", df, {"M01": "변수1"})
+
+    cached_df, extra = cache.get("key", "v1")
+    pd.testing.assert_frame_equal(cached_df, df)
+    assert extra == {"M01": "변수1"}
+
+    assert cache.get("key", "v2") is None
+    assert cache.stats()["size"] == 0 and cache.stats()["bytes"] == 0
+
+
+def test_frame_cache_evicts_least_recently_used_within_byte_budget():
+    frames = {year: _pivoted_df(year) for year in ["2019", "2020", "2021"]}
+    sizes = {year: CompactFrame(df).nbytes for year, df in frames.items()}
+    cache = FrameCache(max_bytes=sizes["2019"] + max(sizes["2020"], sizes["2021"]))
+
+    cache.set("2019", "v", frames["2019"])
+    cache.set("2020", "v", frames["2020"])
+    cache.get("2019", "v")
+    cache.set("2021", "v", frames["2021"])
+
+    assert cache.get("2020", "v") is None
+    assert cache.get("2019", "v") is not None
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+    cache.set("huge", "v", pd.concat(frames.values()))
+    assert cache.get("huge", "v") is None
@@ -0,0 +1,79 @@
+import os
+import threading
+
+import pytest
+
+from utils.job_queue import JobQueue, JobNotFoundError, JOB_SUCCESS, JOB_FAILURE, JOB_RUNNING
+
+
+def _square(x):
+    return x * x
+
+
+def _fail():
+    raise ValueError("failed")
+
+
+def _crash():
+    os._exit(1)
+
+
+def test_thread_job_queue_reports_status_and_result():
+    queue = JobQueue(backend="thread", max_workers=1)
+    started, release = threading.Event(), threading.Event()
+
+    def _wait():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    job_id = queue.submit("wait", _wait)
+    started.wait(5)
+    assert queue.get(job_id).status == JOB_RUNNING
+
+    release.set()
+    assert queue.get(job_id).result() == "done"
+    assert queue.get(job_id).status == JOB_SUCCESS
+
+    failed_job_id = queue.submit("fail", _fail)
+    queue.get(failed_job_id).future.exception(5)
+    assert queue.get(failed_job_id).status == JOB_FAILURE
+    assert "failed" in queue.get(failed_job_id).error
+
+    with pytest.raises(JobNotFoundError):
+        queue.get("unknown")
+    queue.shutdown()
+
+
+def test_process_job_queue_runs_in_worker_process():
+    queue = JobQueue(backend="process", max_workers=1)
+    job_id = queue.submit("square", _square, 7)
+
+    assert queue.get(job_id).result() == 49
+    assert queue.get(job_id).status == JOB_SUCCESS
+    queue.shutdown()
+
+
+def test_process_job_queue_recovers_from_crashed_worker():
+    queue = JobQueue(backend="process", max_workers=1)
+    crashed_job_id = queue.submit("crash", _crash)
+    queue.get(crashed_job_id).future.exception(30)
+    assert queue.get(crashed_job_id).status == JOB_FAILURE
+
+    job_id = queue.submit("square", _square, 7)
+
+    assert queue.get(job_id).result() == 49
+    queue.shutdown()
+
+
+def test_job_queue_evicts_oldest_finished_jobs():
+    queue = JobQueue(backend="thread", max_workers=1, max_retained_jobs=2)
+    job_ids = [queue.submit("square", _square, i) for i in range(3)]
+    for job_id in job_ids[1:]:
+        queue.get(job_id).result()
+    queue.submit("square", _square, 3)
+
+    assert len(queue.jobs) <= 3
+    with pytest.raises(JobNotFoundError):
+        queue.get(job_ids[0])
+    queue.shutdown()
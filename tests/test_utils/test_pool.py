@@ -0,0 +1,58 @@
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from db.pool import InstrumentedQueuePool, PoolMetrics
+
+
+@pytest.fixture
+def pool_metrics(monkeypatch):
+    metrics = PoolMetrics()
+    monkeypatch.setattr(InstrumentedQueuePool, "metrics", metrics)
+    return metrics
+
+
+def test_pool_metrics_records_checkouts_and_in_use(tmp_path, pool_metrics):
+    engine = create_engine("sqlite:///{}".format(tmp_path / "pool.db"), poolclass=InstrumentedQueuePool,
+                           pool_size=2, max_overflow=0)
+
+    with engine.connect() as first, engine.connect() as second:
+        first.execute(text("select 1"))
+        second.execute(text("select 1"))
+        assert pool_metrics.snapshot(engine.pool)["checked_out"] == 2
+
+    snapshot = pool_metrics.snapshot(engine.pool)
+    assert snapshot["checked_out"] == 0
+    assert snapshot["checkouts"] == 2
+    assert snapshot["peak_checked_out"] == 2
+    assert snapshot["pool_size"] == 2
+
+
+def test_pool_metrics_records_timeouts(tmp_path, pool_metrics):
+    engine = create_engine("sqlite:///{}".format(tmp_path / "pool.db"), poolclass=InstrumentedQueuePool,
+                           pool_size=1, max_overflow=0, pool_timeout=0.1)
+
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    snapshot = pool_metrics.snapshot(engine.pool)
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_max_ms"] < 100
+
+
+def test_pool_metrics_survives_dispose(tmp_path, pool_metrics):
+    engine = create_engine("sqlite:///{}".format(tmp_path / "pool.db"), poolclass=InstrumentedQueuePool)
+
+    engine.connect().close()
+    engine.dispose()
+    engine.connect().close()
+
+    assert pool_metrics.checkouts == 2
+
+
+def test_db_pool_metrics_route(client):
+    response = client.get("/metrics/db-pool")
+
+    assert response.status_code == 200
+    assert set(response.json()) >= {"pool_size", "checked_out", "wait_avg_ms", "timeouts"}
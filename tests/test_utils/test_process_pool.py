@@ -0,0 +1,158 @@
+import os
+import pickle
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from db.repository import analysis
+from db.repository.data import pivot_statis_df
+from schemas.analysis import CreateRegression
+from tests.utils.statis import load_sample_statis
+from utils.process_pool import ProcessPool, SharedFrame, TaskTimeoutError, TaskQueueTimeoutError
+
+
+def _column_sums(df: pd.DataFrame) -> dict:
+    return df.iloc[:, 3:].sum().to_dict()
+
+
+def _sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def _hang(seconds: float) -> None:
+    # worker 안의 timeout(SIGALRM)에도 응답하지 않는 작업
+    signal.signal(signal.SIGALRM, signal.SIG_IGN)
+    time.sleep(seconds)
+
+
+def _cpu_bound(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+@pytest.fixture
+def process_pool():
+    pool = ProcessPool(processes=2, max_tasks_per_child=2, timeout=10, grace=1)
+    yield pool
+    pool.shutdown(wait=False)
+
+
+def test_shared_frame_round_trip():
+    df = pivot_statis_df(load_sample_statis("2021"), "yr_vl")
+    shared_frame = SharedFrame(df)
+    try:
+        restored = pickle.loads(pickle.dumps(shared_frame)).to_frame()
+        pd.testing.assert_frame_equal(restored, df)
+        # pickle 되는 크기는 값 버퍼 크기와 관계없다
+        assert len(pickle.dumps(shared_frame)) < df.iloc[:, 3:].to_numpy().nbytes
+    finally:
+        shared_frame.release()
+
+
+def test_process_pool_passes_data_through_shared_memory(process_pool):
+    df = pivot_statis_df(load_sample_statis("2021"), "yr_vl")
+    shared_frame = SharedFrame(df)
+    try:
+        assert process_pool.run(_column_sums, shared_frame) == pytest.approx(_column_sums(df))
+    finally:
+        shared_frame.release()
+
+
+def test_process_pool_times_out_and_recovers(process_pool):
+    with pytest.raises(TaskTimeoutError):
+        process_pool.run(_sleep, 5, timeout=0.2)
+
+    assert process_pool.run(_sleep, 0) == 0
+
+
+def test_hung_task_does_not_fail_other_tasks(process_pool):
+    process_pool.run(_sleep, 0)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        neighbour = executor.submit(process_pool.run, _sleep, 2.5, timeout=3)
+        hung = executor.submit(process_pool.run, _hang, 30, timeout=0.2)
+
+        with pytest.raises(TaskTimeoutError):
+            hung.result()
+        assert neighbour.result() == 2.5
+
+    assert process_pool.run(_sleep, 0) == 0
+
+
+def test_time_waiting_in_queue_does_not_count_as_run_time():
+    pool = ProcessPool(processes=1, timeout=2, grace=0.5)
+    try:
+        pid = pool.run(os.getpid)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(pool.run, _sleep, 1.9)
+            time.sleep(0.1)
+            second = executor.submit(pool.run, _sleep, 0.7)
+
+            # 두 번째 작업은 2.6초 뒤에 끝나지만 실행 시간은 0.7초이다
+            assert first.result() == 1.9
+            assert second.result() == 0.7
+        assert pool.run(os.getpid) == pid
+    finally:
+        pool.shutdown(wait=False)
+
+
+def test_task_that_never_starts_fails_without_killing_worker():
+    pool = ProcessPool(processes=1, timeout=5, grace=0.5, queue_timeout=0.3)
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            running = executor.submit(pool.run, _sleep, 1)
+            time.sleep(0.1)
+            queued = executor.submit(pool.run, _sleep, 0)
+
+            with pytest.raises(TaskQueueTimeoutError):
+                queued.result()
+            assert running.result() == 1
+    finally:
+        pool.shutdown(wait=False)
+
+
+def test_process_pool_recycles_workers(process_pool):
+    pids = {process_pool.run(os.getpid) for _ in range(8)}
+
+    assert os.getpid() not in pids
+    assert len(pids) > 2
+
+
+def test_regression_in_process_pool_matches_inline(monkeypatch, process_pool):
+    pivoted_df = pivot_statis_df(load_sample_statis("2021"), "yr_vl")
+    variables = pivoted_df.columns[3:6].to_list()
+    pivoted_df = pivoted_df[pivoted_df.columns[:3].to_list() + variables]
+    analysis_data = CreateRegression(dependent_variable=variables[0], independent_variable_list=variables[1:],
+                                     year="2021", period_unit="year", detail_period="all", format="json")
+    name_dict = {variable: variable for variable in variables}
+
+    inline = analysis.run_analysis(analysis.compute_regression_result, analysis_data, pivoted_df, name_dict)
+    monkeypatch.setattr(analysis, "ANALYSIS_EXECUTION_BACKEND", "process")
+    monkeypatch.setattr(analysis, "analysis_process_pool", process_pool)
+    in_pool = analysis.run_analysis(analysis.compute_regression_result, analysis_data, pivoted_df, name_dict)
+
+    assert in_pool == inline
+
+
+def test_process_pool_throughput_benchmark(process_pool):
+    """
+    CPU 작업을 요청 thread에서 직접 실행할 때와 process pool에서 실행할 때의 처리 시간 (pytest -s로 확인)
+    """
+    tasks, n = 8, 300000
+    process_pool.run(_cpu_bound, 1)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        start = time.perf_counter()
+        inline_results = list(executor.map(_cpu_bound, [n] * tasks))
+        inline_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pool_results = list(executor.map(lambda value: process_pool.run(_cpu_bound, value), [n] * tasks))
+        pool_time = time.perf_counter() - start
+
+    print("{} tasks on {} cores | threads {:.2f} s -> process pool {:.2f} s".format(
+        tasks, os.cpu_count(), inline_time, pool_time))
+    assert pool_results == inline_results
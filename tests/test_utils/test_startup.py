@@ -0,0 +1,59 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HEAVY_MODULES = ["matplotlib", "seaborn", "scipy", "sklearn", "joblib", "dataframe_image", "statsmodels"]
+
+# 새 프로세스에서 앱 import, 첫 /data 요청, 첫 분석 그림까지의 시간을 잰다
+STARTUP_SCRIPT = """
+import json, sys, time
+
+start = time.perf_counter()
+import main
+import_time = time.perf_counter() - start
+
+import pytest
+from fastapi.testclient import TestClient
+from db.session import get_data_db
+from tests.utils.catalog import FakeCatalogDB
+
+FakeCatalogDB().patch(pytest.MonkeyPatch())
+main.app.dependency_overrides[get_data_db()] = lambda: None
+client = TestClient(main.app)
+
+start = time.perf_counter()
+status_code = client.get("/data/filter-list").status_code
+first_request_time = time.perf_counter() - start
+loaded_after_request = [name for name in {heavy_modules} if name in sys.modules]
+
+import pandas as pd
+from analysis_module.correlation_module import CorrelationModule
+
+start = time.perf_counter()
+data = pd.DataFrame({{"M01": [1.0, 2.0, 3.0, 4.0], "M02": [2.0, 1.0, 4.0, 3.0]}})
+CorrelationModule(data, {{"M01": "변수1", "M02": "변수2"}}).save_heatmap_plot()
+first_analysis_time = time.perf_counter() - start
+
+print(json.dumps({{"import_time": import_time, "first_request_time": first_request_time, "status_code": status_code,
+                  "first_analysis_time": first_analysis_time, "loaded_after_request": loaded_after_request,
+                  "loaded_after_analysis": [name for name in {heavy_modules} if name in sys.modules]}}))
+""".format(heavy_modules=HEAVY_MODULES)
+
+
+def test_startup_defers_heavy_imports_benchmark():
+    """
+    앱 import와 첫 /data 요청 시간을 측정하고, 분석 라이브러리가 첫 분석 전까지 import 되지 않는지 확인한다 (pytest -s로 확인)
+    """
+    output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=ROOT, capture_output=True, text=True,
+                            check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    print("import main {:.2f} s | first /data request {:.2f} s | first analysis plot {:.2f} s".format(
+        result["import_time"], result["first_request_time"], result["first_analysis_time"]))
+
+    assert result["status_code"] == 200
+    assert result["loaded_after_request"] == []
+    assert {"matplotlib", "seaborn", "scipy"} <= set(result["loaded_after_analysis"])
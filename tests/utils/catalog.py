@@ -0,0 +1,39 @@
+from db.repository import catalog
+
+CATEGORIES = [{"id": "M010001", "name": "인구", "order_index": 1}, {"id": "M010002", "name": "경제", "order_index": 2}]
+VARIABLES = [
+    {"dat_no": "M020011", "dat_nm": "총인구", "clsf_cd": "M010001", "indct_orr": 1, "pd_se": "M030004",
+     "dat_src": "통계청", "rgn_se_nm": "시군"},
+    {"dat_no": "M020012", "dat_nm": "월별 출생", "clsf_cd": "M010001", "indct_orr": 2, "pd_se": "M030001",
+     "dat_src": "통계청", "rgn_se_nm": "시군"},
+    {"dat_no": "M020013", "dat_nm": "도 사업체수", "clsf_cd": "M010002", "indct_orr": 3, "pd_se": "M030004",
+     "dat_src": "경상북도", "rgn_se_nm": "시군"}
+]
+
+
+class FakeCatalogDB:
+
+    def __init__(self):
+        self.info_version = "v1"
+        self.year_versions = {"2020": "a", "2021": "a"}
+        self.availability = {
+            "2020": {"M020011": {"yr_vl"}},
+            "2021": {"M020011": {"yr_vl"}, "M020012": {"jan", "feb", "yr_vl"}, "M020013": {"yr_vl"}}
+        }
+        self.info_fetches = 0
+        self.fetched_years = []
+
+    def patch(self, monkeypatch):
+        monkeypatch.setattr(catalog, "fetch_info_version", lambda db: self.info_version)
+        monkeypatch.setattr(catalog, "fetch_year_versions", lambda db: dict(self.year_versions))
+        monkeypatch.setattr(catalog, "fetch_categories", self._fetch_categories)
+        monkeypatch.setattr(catalog, "fetch_variables", lambda db: VARIABLES)
+        monkeypatch.setattr(catalog, "fetch_availability", self._fetch_availability)
+
+    def _fetch_categories(self, db):
+        self.info_fetches += 1
+        return CATEGORIES
+
+    def _fetch_availability(self, years, db):
+        self.fetched_years.append(sorted(years))
+        return {year: self.availability.get(year, {}) for year in years}
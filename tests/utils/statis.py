@@ -0,0 +1,22 @@
+import os
+
+import pandas as pd
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                            "analysis_module", "dataset", "ggs_statis.csv")
+
+
+def load_sample_statis(year: str = None, variable_list=None) -> pd.DataFrame:
+    """
+    샘플 ggs_statis.csv를 get_pivoted_df의 조회 결과와 같은 형태로 읽어온다.
+    stdg_nm, dat_nm은 샘플에 없으므로 stdg_cd, dat_no로 만든 이름으로 대신한다.
+    """
+    df = pd.read_csv(DATASET_PATH, dtype={"yr": str, "stdg_cd": str, "dat_no": str})
+
+    if year is not None:
+        df = df[df["yr"] == year]
+    if variable_list is not None:
+        df = df[df["dat_no"].isin(variable_list)]
+
+    df = df.assign(stdg_nm="지역" + df["stdg_cd"], dat_nm="변수" + df["dat_no"])
+    return df.reset_index(drop=True)
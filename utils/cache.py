@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from utils.logging_module import logger
+
+
+def make_cache_key(*parts) -> str:
+    """
+    입력값들을 정렬된 json으로 직렬화한 뒤 sha256 해시로 캐시 키를 만든다.
+    dict의 키 순서와 관계없이 같은 입력이면 같은 키가 나온다.
+    """
+    canonical = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(metaclass=ABCMeta):
+
+    def __init__(self, max_entries: int = 128, ttl: Optional[float] = None, clock: Callable[[], float] = time.time):
+        self.max_entries: int = max_entries
+        self.ttl: Optional[float] = ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+
+    @abstractmethod
+    def get(self, key: str) -> Any: pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None: pass
+
+    @abstractmethod
+    def clear(self) -> None: pass
+
+    @abstractmethod
+    def __len__(self) -> int: pass
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and self.clock() - stored_at > self.ttl
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    프로세스 메모리에 저장하는 LRU + TTL 캐시
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: Optional[float] = None, clock: Callable[[], float] = time.time):
+        super().__init__(max_entries, ttl, clock)
+        self.entries: OrderedDict = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        with self.lock:
+            if key not in self.entries:
+                return None
+
+            stored_at, value = self.entries[key]
+            if self._is_expired(stored_at):
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self.lock:
+            self.entries[key] = (self.clock(), value)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class DiskCacheBackend(CacheBackend):
+    """
+    로컬 디스크에 pickle 파일로 저장하는 LRU + TTL 캐시
+    파일의 mtime을 저장 시각, atime을 마지막 사용 시각으로 사용하므로 여러 worker 프로세스가 같은 디렉토리를 공유할 수 있다
+    """
+
+    def __init__(self, directory: str, max_entries: int = 128, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.time):
+        super().__init__(max_entries, ttl, clock)
+        self.directory: str = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".pickle")
+
+    def get(self, key: str) -> Any:
+        path = self._path(key)
+
+        try:
+            stored_at = os.path.getmtime(path)
+            if self._is_expired(stored_at):
+                os.remove(path)
+                return None
+
+            with open(path, "rb") as fr:
+                value = pickle.load(fr)
+            os.utime(path, (self.clock(), stored_at))
+            return value
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        tmp_path = "{}.{}.tmp".format(path, threading.get_ident())
+
+        with open(tmp_path, "wb") as fw:
+            pickle.dump(value, fw)
+        now = self.clock()
+        os.utime(tmp_path, (now, now))
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            self._evict()
+
+    def _evict(self) -> None:
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".pickle")]
+        if len(paths) <= self.max_entries:
+            return
+
+        # 마지막 사용 시각(atime)이 오래된 순으로 삭제한다
+        paths.sort(key=lambda path: os.stat(path).st_atime)
+        for path in paths[:len(paths) - self.max_entries]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(".pickle"):
+                os.remove(os.path.join(self.directory, name))
+
+    def __len__(self) -> int:
+        return len([name for name in os.listdir(self.directory) if name.endswith(".pickle")])
+
+
+class ResultCache:
+    """
+    backend를 감싸 hit/miss 횟수를 기록하는 캐시
+    """
+
+    def __init__(self, backend: Optional[CacheBackend]):
+        self.backend: Optional[CacheBackend] = backend
+        self.hits: int = 0
+        self.misses: int = 0
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def get(self, key: str) -> Any:
+        if not self.enabled:
+            return None
+
+        value = self.backend.get(key)
+        with self.lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if value is not None:
+            logger.info("cache hit : " + key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.enabled:
+            self.backend.set(key, value)
+
+    def clear(self) -> None:
+        if self.enabled:
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__ if self.enabled else None,
+            "size": len(self.backend) if self.enabled else 0,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+def create_cache_backend(backend: str, max_entries: int = 128, ttl: Optional[float] = None,
+                         directory: str = None) -> Optional[CacheBackend]:
+    """
+    설정값으로 캐시 backend를 생성한다
+    :param backend: memory, disk, none 중 하나
+    """
+    if backend == "memory":
+        return MemoryCacheBackend(max_entries=max_entries, ttl=ttl)
+    elif backend == "disk":
+        return DiskCacheBackend(directory, max_entries=max_entries, ttl=ttl)
+    elif backend == "none":
+        return None
+
+    raise ValueError("not supported cache backend")
@@ -0,0 +1,117 @@
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.logging_module import logger
+
+
+class CompactFrame:
+    """
+    DataFrame을 컬럼 단위의 compact한 형태로 보관한다.
+    float64 컬럼은 하나의 연속된 2차원 배열로, 나머지 컬럼(yr, stdg_nm, variable 등)은 category 코드로 저장하며
+    to_frame()은 매번 새 DataFrame을 만들어 반환하므로 꺼낸 쪽에서 수정해도 캐시된 값은 바뀌지 않는다.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.columns: List = df.columns.to_list()
+        self.dtypes: List = df.dtypes.to_list()
+        self.index: pd.Index = df.index
+        self.value_columns: List = [column for column, dtype in zip(self.columns, self.dtypes) if dtype == np.float64]
+        self.values: np.ndarray = np.ascontiguousarray(df[self.value_columns].to_numpy(dtype="float64"))
+        self.categoricals: dict = {
+            column: pd.Categorical(df[column])
+            for column, dtype in zip(self.columns, self.dtypes) if dtype != np.float64
+        }
+
+    @property
+    def nbytes(self) -> int:
+        categorical_bytes = sum(categorical.codes.nbytes + categorical.categories.memory_usage(deep=True)
+                                for categorical in self.categoricals.values())
+        return self.values.nbytes + categorical_bytes + self.index.memory_usage(deep=True)
+
+    def to_frame(self) -> pd.DataFrame:
+        data = {}
+        value_positions = {column: i for i, column in enumerate(self.value_columns)}
+        for column, dtype in zip(self.columns, self.dtypes):
+            if column in value_positions:
+                data[column] = self.values[:, value_positions[column]].copy()
+            else:
+                data[column] = np.asarray(self.categoricals[column]).astype(dtype)
+        return pd.DataFrame(data, index=self.index.copy(), columns=self.columns)
+
+
+class FrameCache:
+    """
+    조회한 DataFrame을 CompactFrame으로 보관하는 LRU 캐시 (max_bytes를 넘으면 오래 사용하지 않은 것부터 삭제)
+    항목마다 데이터 버전을 함께 저장해, 조회할 때의 버전과 다르면 원본 데이터가 바뀐 것으로 보고 버린다.
+    max_bytes가 0이면 캐시하지 않는다.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 ** 2):
+        self.max_bytes: int = max_bytes
+        self.entries: OrderedDict = OrderedDict()
+        self.total_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: str, version: str) -> Optional[Tuple[pd.DataFrame, Any]]:
+        """
+        :return: (DataFrame, 함께 저장한 값) 또는 None
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] != version:
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.entries.move_to_end(key)
+            _, frame, extra, _ = entry
+
+        logger.info("frame cache hit : " + key)
+        return frame.to_frame(), extra
+
+    def set(self, key: str, version: str, df: pd.DataFrame, extra: Any = None) -> None:
+        if self.max_bytes <= 0:
+            return
+
+        frame = CompactFrame(df)
+        nbytes = frame.nbytes
+        if nbytes > self.max_bytes:
+            return
+
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (version, frame, extra, nbytes)
+            self.total_bytes += nbytes
+
+            while self.total_bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+
+    def _remove(self, key: str) -> None:
+        _, _, _, nbytes = self.entries.pop(key)
+        self.total_bytes -= nbytes
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
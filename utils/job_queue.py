@@ -0,0 +1,110 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from utils.logging_module import logger
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_SUCCESS = "success"
+JOB_FAILURE = "failure"
+
+
+class JobNotFoundError(KeyError):
+    pass
+
+
+class Job:
+
+    def __init__(self, job_id: str, name: str, future: Future):
+        self.job_id: str = job_id
+        self.name: str = name
+        self.future: Future = future
+        self.created_at: float = time.time()
+
+    @property
+    def status(self) -> str:
+        if not self.future.done():
+            return JOB_RUNNING if self.future.running() else JOB_PENDING
+        if self.future.cancelled() or self.future.exception() is not None:
+            return JOB_FAILURE
+        return JOB_SUCCESS
+
+    @property
+    def error(self) -> Optional[str]:
+        if self.status != JOB_FAILURE:
+            return None
+        if self.future.cancelled():
+            return "cancelled"
+        return repr(self.future.exception())
+
+    def result(self) -> Any:
+        return self.future.result()
+
+
+class JobQueue:
+    """
+    오래 걸리는 분석을 worker pool에서 실행하고 job id로 상태와 결과를 조회하는 queue
+    backend가 process이면 별도 프로세스에서, thread이면 같은 프로세스의 thread에서 실행한다 (테스트용 local broker)
+    """
+
+    def __init__(self, backend: str = "process", max_workers: int = 2, max_retained_jobs: int = 1000,
+                 initializer: Callable = None):
+        self.backend: str = backend
+        self.max_workers: int = max_workers
+        self.max_retained_jobs: int = max_retained_jobs
+        self.initializer: Callable = initializer
+        self.jobs: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+
+    @property
+    def executor(self) -> Executor:
+        # worker는 첫 job이 들어올 때 생성한다
+        if self._executor is None:
+            if self.backend == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=self.initializer)
+            elif self.backend == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, initializer=self.initializer)
+            else:
+                raise ValueError("not supported job queue backend")
+        return self._executor
+
+    def submit(self, name: str, fn: Callable, *args, **kwargs) -> str:
+        job_id = str(uuid.uuid4())
+
+        with self.lock:
+            try:
+                future = self.executor.submit(fn, *args, **kwargs)
+            except BrokenProcessPool:
+                # worker가 비정상 종료되면 executor는 이후 모든 submit을 거부하므로 새로 만든다
+                logger.warning("job queue executor is broken, recreating workers")
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                future = self.executor.submit(fn, *args, **kwargs)
+            self.jobs[job_id] = Job(job_id, name, future)
+            self._evict_finished_jobs()
+
+        logger.info("job submitted : {} ({})".format(job_id, name))
+        return job_id
+
+    def get(self, job_id: str) -> Job:
+        with self.lock:
+            if job_id not in self.jobs:
+                raise JobNotFoundError(job_id)
+            return self.jobs[job_id]
+
+    def _evict_finished_jobs(self) -> None:
+        # 보관 개수를 넘으면 완료된 job부터 오래된 순으로 삭제한다
+        overflow = len(self.jobs) - self.max_retained_jobs
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.future.done()][:max(overflow, 0)]:
+            del self.jobs[job_id]
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -0,0 +1,239 @@
+import itertools
+import multiprocessing
+import multiprocessing.pool
+import os
+import signal
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.logging_module import logger
+
+_worker_process = False
+
+
+class TaskTimeoutError(TimeoutError):
+    pass
+
+
+class TaskQueueTimeoutError(TimeoutError):
+    """
+    모든 worker가 다른 작업을 실행 중이어서 queue_timeout(초) 안에 작업을 시작하지 못함
+    """
+    pass
+
+
+def mark_worker_process() -> None:
+    """
+    worker 프로세스의 initializer에서 호출한다 (thread backend처럼 같은 프로세스의 thread에서 호출되면 무시한다)
+    """
+    global _worker_process
+    if threading.current_thread() is threading.main_thread():
+        _worker_process = True
+
+
+def is_worker_process() -> bool:
+    return _worker_process
+
+
+class SharedFrame:
+    """
+    DataFrame의 float64 컬럼을 shared memory에 복사해 worker 프로세스로 넘긴다.
+    pickle 되는 것은 shared memory 이름과 컬럼 정보, 나머지 컬럼(yr, stdg_nm, variable 등)뿐이므로
+    데이터가 커져도 pipe로 보내는 양은 늘지 않는다. 만든 프로세스에서 release()로 해제한다.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.columns: List = df.columns.to_list()
+        self.value_columns: List = [column for column, dtype in df.dtypes.items() if dtype == np.float64]
+        self.other_df: pd.DataFrame = df.drop(columns=self.value_columns)
+
+        values = df[self.value_columns].to_numpy(dtype="float64")
+        self.shape: tuple = values.shape
+        self._shm: Optional[shared_memory.SharedMemory] = shared_memory.SharedMemory(create=True,
+                                                                                     size=max(values.nbytes, 1))
+        np.ndarray(self.shape, dtype="float64", buffer=self._shm.buf)[:] = values
+        self.name: str = self._shm.name
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_shm"] = None
+        return state
+
+    def to_frame(self) -> pd.DataFrame:
+        shm = shared_memory.SharedMemory(name=self.name)
+        try:
+            values = np.ndarray(self.shape, dtype="float64", buffer=shm.buf).copy()
+        finally:
+            shm.close()
+
+        value_df = pd.DataFrame(values, index=self.other_df.index, columns=self.value_columns)
+        return pd.concat([self.other_df, value_df], axis=1)[self.columns]
+
+    def release(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+_task_events = None
+
+
+def _init_worker(task_events, initializer: Optional[Callable]) -> None:
+    global _task_events
+    _task_events = task_events
+    if initializer is not None:
+        initializer()
+
+
+def _raise_timeout(signum, frame):
+    raise TaskTimeoutError("task timed out")
+
+
+def _run_task(task_id: int, fn: Callable, timeout: Optional[float], start_deadline: Optional[float], args: tuple,
+              kwargs: dict) -> Any:
+    """
+    worker에서 실행된다. SharedFrame 인자를 DataFrame으로 되돌리고, timeout(초)을 넘기면 작업을 중단한다.
+    작업의 시작과 끝을 pool에 알려, pool이 시작 시각부터 제한 시간을 재고 응답하지 않는 작업의 worker만 종료할 수 있게 한다.
+    start_deadline(time.time())이 지나서야 차례가 온 작업은 요청한 쪽이 이미 포기했으므로 실행하지 않는다.
+    """
+    if start_deadline is not None and time.time() > start_deadline:
+        raise TaskQueueTimeoutError("task did not start in time")
+
+    _task_events.put((task_id, os.getpid()))
+    try:
+        args = tuple(arg.to_frame() if isinstance(arg, SharedFrame) else arg for arg in args)
+
+        use_alarm = timeout is not None and hasattr(signal, "SIGALRM")
+        if use_alarm:
+            previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous_handler)
+    finally:
+        _task_events.put((task_id, None))
+
+
+class ProcessPool:
+    """
+    CPU를 많이 쓰는 작업을 미리 띄워 둔 worker 프로세스에서 실행하는 pool (multiprocessing.Pool)
+    initializer에서 라이브러리를 미리 불러오고, worker는 max_tasks_per_child개의 작업마다 새로 띄워 메모리를 정리한다.
+    작업이 시작된 뒤 timeout(초)을 넘기면 worker 안에서 중단하고, 그 뒤 grace(초) 안에도 응답이 없으면 그 작업을 실행 중인
+    worker만 종료한다. (pool이 새 worker를 띄우며, 다른 worker에서 실행 중인 작업은 영향을 받지 않는다)
+    worker가 모두 바빠 queue_timeout(초) 안에 시작하지 못한 작업은 TaskQueueTimeoutError로 실패한다. (기본값은 timeout)
+    """
+
+    def __init__(self, processes: int = None, max_tasks_per_child: int = 100, timeout: float = None,
+                 initializer: Callable = None, start_method: str = None, grace: float = 5.0,
+                 queue_timeout: float = None):
+        self.processes: Optional[int] = processes
+        self.max_tasks_per_child: int = max_tasks_per_child
+        self.timeout: Optional[float] = timeout
+        self.initializer: Callable = initializer
+        self.start_method: Optional[str] = start_method
+        self.grace: float = grace
+        self.queue_timeout: Optional[float] = queue_timeout
+        self.lock = threading.Lock()
+        self.task_condition = threading.Condition()
+        self._pool: Optional[multiprocessing.pool.Pool] = None
+        self._task_events = None
+        self._task_ids = itertools.count()
+        # 기다리는 작업 id별 (worker pid, 시작 시각). 시작 전이면 None, 끝나면 pid가 None
+        self._tasks: dict = {}
+
+    @property
+    def pool(self) -> multiprocessing.pool.Pool:
+        with self.lock:
+            if self._pool is None:
+                context = multiprocessing.get_context(self.start_method)
+                self._task_events = context.SimpleQueue()
+                self._pool = context.Pool(processes=self.processes, initializer=_init_worker,
+                                          initargs=(self._task_events, self.initializer),
+                                          maxtasksperchild=self.max_tasks_per_child)
+                threading.Thread(target=self._collect_task_events, args=(self._task_events,), daemon=True).start()
+                logger.info("process pool started : {} workers".format(self.processes or os.cpu_count()))
+            return self._pool
+
+    def start(self) -> None:
+        """
+        첫 요청 전에 worker를 띄워 initializer를 실행해 둔다
+        """
+        self.pool
+
+    def run(self, fn: Callable, *args, timeout: float = None, **kwargs) -> Any:
+        timeout = timeout or self.timeout
+        queue_timeout = self.queue_timeout or timeout
+        pool = self.pool
+        task_id = next(self._task_ids)
+        start_deadline = None if queue_timeout is None else time.time() + queue_timeout
+        with self.task_condition:
+            self._tasks[task_id] = None
+        async_result = pool.apply_async(_run_task, (task_id, fn, timeout, start_deadline, args, kwargs))
+        try:
+            if timeout is None:
+                return async_result.get()
+
+            with self.task_condition:
+                if not self.task_condition.wait_for(lambda: self._tasks[task_id] is not None, queue_timeout):
+                    raise TaskQueueTimeoutError("task did not start in time")
+                _, started_at = self._tasks[task_id]
+            try:
+                return async_result.get(max(started_at + timeout + self.grace - time.monotonic(), 0))
+            except multiprocessing.TimeoutError:
+                self._kill_task(task_id)
+                raise TaskTimeoutError("task timed out") from None
+        finally:
+            with self.task_condition:
+                self._tasks.pop(task_id, None)
+
+    def _collect_task_events(self, task_events) -> None:
+        """
+        worker가 보내는 작업 시작/종료 알림을 받아 기록한다 (pool마다 하나씩 도는 thread)
+        """
+        while True:
+            task_id, pid = task_events.get()
+            if task_id is None:
+                return
+            with self.task_condition:
+                # 이미 결과를 돌려준 작업의 늦은 알림은 무시한다
+                if task_id in self._tasks:
+                    # 같은 worker의 시작 알림은 항상 종료 알림보다 먼저 도착한다
+                    started_at = time.monotonic() if pid is not None else self._tasks[task_id][1]
+                    self._tasks[task_id] = (pid, started_at)
+                    self.task_condition.notify_all()
+
+    def _kill_task(self, task_id: int) -> None:
+        with self.task_condition:
+            pid, _ = self._tasks[task_id]
+        if pid is None:
+            # 제한 시간을 넘긴 직후에 끝난 작업이면 종료할 worker가 없다
+            return
+
+        logger.error("process pool task not responding, killing worker {}".format(pid))
+        try:
+            os.kill(pid, signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self.lock:
+            pool, self._pool = self._pool, None
+            task_events = self._task_events
+        if pool is None:
+            return
+        if wait:
+            pool.close()
+            pool.join()
+        else:
+            pool.terminate()
+        # 작업 알림을 받는 thread를 종료한다
+        task_events.put((None, None))